@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Ingesta desde el archivo de datos públicos de ORCID (``orcid.datafile``).
+
+Genera un tar.gz con la estructura del archivo de resúmenes de ORCID
+(``<nombre>/<3 dígitos>/<orcid>.xml``, esquema XML v3.0) a partir de las mismas
+respuestas sintéticas de ``mock_orcid``, con perfiles de relleno que no están
+en el listado. Luego:
+
+- verifica que los registros leídos del archivo son idénticos a los que
+  ``_create_work_record`` produce desde la respuesta JSON de la API;
+- mide miembros/s e investigadores/s con 1 y N procesos de parseo, y el pico
+  de RSS de cada modo en un subproceso independiente.
+
+Con ``--fixture`` solo escribe el archivo (y el input.csv correspondiente) para
+probar el programa a mano:
+
+    python benchmarks/bench_datafile.py --fixture /tmp/orcid_datos --researchers 20 --filler 200
+    ORCID_INPUT_FILE=/tmp/orcid_datos/input.csv python main.py --datafile /tmp/orcid_datos/summaries.tar.gz
+
+Uso:
+    python benchmarks/bench_datafile.py --researchers 2000 --filler 20000 --workers 4
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from xml.sax.saxutils import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_roster import orcid_with_checksum
+from mock_orcid import MockOrcidServer
+
+# Caracteres de control que XML 1.0 no admite (la API JSON sí los entrega)
+_XML_ILLEGAL = dict.fromkeys(i for i in range(32) if i not in (9, 10, 13))
+
+
+def _text(tag: str, value) -> str:
+    return f"<{tag}>{escape(str(value).translate(_XML_ILLEGAL))}</{tag}>"
+
+
+def _value(node) -> str:
+    return (node or {}).get("value") or ""
+
+
+def work_summary_xml(summary: dict) -> str:
+    parts = [f'<work:work-summary put-code="{summary["put-code"]}" visibility="public">']
+    parts.append(f"<work:title>{_text('common:title', _value(summary['title']['title']))}</work:title>")
+    parts.append("<common:external-ids>")
+    for external_id in summary["external-ids"]["external-id"]:
+        parts.append(f"<common:external-id>{_text('common:external-id-type', external_id['external-id-type'])}{_text('common:external-id-value', external_id['external-id-value'])}<common:external-id-relationship>self</common:external-id-relationship></common:external-id>")
+    parts.append("</common:external-ids>")
+    if summary.get("url"):
+        parts.append(_text("common:url", _value(summary["url"])))
+    parts.append("<work:type>journal-article</work:type>")
+    date = summary.get("publication-date")
+    if date:
+        parts.append("<common:publication-date>" + "".join(_text(f"common:{part}", _value(date[part])) for part in ("year", "month", "day") if date.get(part)) + "</common:publication-date>")
+    if summary.get("journal-title"):
+        parts.append(_text("work:journal-title", _value(summary["journal-title"])))
+    parts.append("</work:work-summary>")
+    return "".join(parts)
+
+
+def record_xml(orcid: str, works: dict) -> bytes:
+    """Resumen de registro XML v3.0 con los mismos trabajos que la respuesta JSON de /works."""
+    groups = "".join(
+        "<activities:group>" + "".join(work_summary_xml(summary) for summary in group["work-summary"]) + "</activities:group>"
+        for group in works["group"]
+    )
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<record:record path="/{orcid}" xmlns:record="http://www.orcid.org/ns/record" xmlns:activities="http://www.orcid.org/ns/activities" '
+        'xmlns:work="http://www.orcid.org/ns/work" xmlns:common="http://www.orcid.org/ns/common" xmlns:person="http://www.orcid.org/ns/person">'
+        f"<common:orcid-identifier><common:uri>https://orcid.org/{orcid}</common:uri><common:path>{orcid}</common:path><common:host>orcid.org</common:host></common:orcid-identifier>"
+        f'<person:person path="/{orcid}/person"/>'
+        f'<activities:activities-summary path="/{orcid}/activities">'
+        f'<activities:works path="/{orcid}/works"><common:last-modified-date>2024-01-01T00:00:00.000Z</common:last-modified-date>{groups}</activities:works>'
+        "</activities:activities-summary></record:record>"
+    )
+    return xml.encode("utf-8")
+
+
+def payload_source(works_mean: float) -> MockOrcidServer:
+    """Generador de respuestas de mock_orcid, sin atender peticiones HTTP."""
+    server = MockOrcidServer(works_mean=works_mean)
+    server._httpd.server_close()
+    return server
+
+
+def write_datafile(directory: str, researchers: int, filler: int, works_mean: float) -> tuple:
+    """Escribe summaries.tar.gz e input.csv; devuelve (ruta del archivo, ORCID del listado)."""
+    server = payload_source(works_mean)
+    roster = [orcid_with_checksum(10 ** 12 + i * 7) for i in range(researchers)]
+    in_roster = set(roster)
+    profiles = sorted(set(roster) | {orcid_with_checksum(2 * 10 ** 12 + i) for i in range(filler)})
+
+    path = os.path.join(directory, "summaries.tar.gz")
+    with tarfile.open(path, "w:gz") as archive:
+        for orcid in profiles:
+            data = record_xml(orcid, json.loads(server.payload(orcid)[0]))
+            info = tarfile.TarInfo(f"ORCID_2024_10_summaries/{orcid[-3:]}/{orcid}.xml")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    with open(os.path.join(directory, "input.csv"), "w", encoding="utf-8") as f:
+        f.write("cedula,nombre,orcid\n")
+        for i, orcid in enumerate(roster):
+            f.write(f"{10000000 + i},Investigador {i},{orcid}\n")
+    assert len(in_roster) == researchers
+    return path, roster
+
+
+def run_mode(path: str, roster: list, workers: int, works_mean: float) -> dict:
+    from orcid.datafile import iter_datafile
+    from orcid.records import Researcher
+    from orcid.utils import _create_work_record
+
+    server = payload_source(works_mean)
+    researchers = {orcid: Researcher(i, f"Investigador {i}", orcid) for i, orcid in enumerate(roster)}
+
+    start = time.perf_counter()
+    records = {}
+    for orcid, _, groups, error in iter_datafile([path], roster, workers):
+        assert error is None, error
+        records[orcid] = [dict(_create_work_record(researchers[orcid], summary)) for summary in groups if summary]
+    elapsed = time.perf_counter() - start
+
+    # Mismos registros que desde la respuesta JSON de la API
+    mismatches = 0
+    for orcid in roster:
+        expected = [dict(_create_work_record(researchers[orcid], group["work-summary"])) for group in json.loads(server.payload(orcid)[0])["group"]]
+        mismatches += records.get(orcid) != expected
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return {
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "researchers_per_s": round(len(records) / elapsed, 1),
+        "records": sum(len(r) for r in records.values()),
+        "found": len(records),
+        "mismatches": mismatches,
+        "peak_rss_mb": round(peak_mb, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--researchers", type=int, default=2000, help="Investigadores del listado (presentes en el archivo)")
+    parser.add_argument("--filler", type=int, default=20000, help="Perfiles del archivo que no están en el listado")
+    parser.add_argument("--works-mean", type=float, default=30)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--fixture", help="Solo escribir el archivo y el input.csv en esta carpeta")
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "WORKERS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        roster = [orcid_with_checksum(10 ** 12 + i * 7) for i in range(args.researchers)]
+        print(json.dumps(run_mode(args.child[0], roster, int(args.child[1]), args.works_mean)))
+        return
+
+    directory = args.fixture or tempfile.mkdtemp()
+    os.makedirs(directory, exist_ok=True)
+    start = time.perf_counter()
+    path, _ = write_datafile(directory, args.researchers, args.filler, args.works_mean)
+    if args.fixture:
+        print(json.dumps({"datafile": path, "input": os.path.join(directory, "input.csv"), "seconds": round(time.perf_counter() - start, 2)}))
+        return
+
+    results = {"archive_mb": round(os.path.getsize(path) / 1e6, 2), "members": args.researchers + args.filler, "modes": []}
+    for workers in sorted({1, args.workers}):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--researchers", str(args.researchers), "--works-mean", str(args.works_mean), "--child", path, str(workers)], check=True, capture_output=True, text=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        result["members_per_s"] = round(results["members"] / result["seconds"])
+        results["modes"].append(result)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Escalabilidad del índice de publicaciones (DOI + títulos casi idénticos).
+
+Genera registros sintéticos en los que cada publicación aparece en varios
+investigadores (coautores), a veces sin DOI y con variaciones de mayúsculas,
+puntuación o errores tipográficos en el título, y mide registros/s y memoria
+por publicación para tamaños crecientes. Un crecimiento casi lineal se ve como
+registros/s estables.
+
+Uso:
+    python benchmarks/bench_dedup.py --sizes 10000,100000,1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orcid.dedup import PublicationIndex
+
+STEMS = ("análisis", "modelo", "café", "suelos", "redes", "neuronal", "clima", "cuenca", "agua", "proteína", "síntesis", "evaluación", "sistema", "datos", "aprendizaje", "rendimiento", "impacto", "estudio", "región", "control")
+# Vocabulario de 2000 palabras: raíz + sufijo, para que los títulos compartan trigramas como los reales
+WORDS = [f"{stem}{suffix}" for stem in STEMS for suffix in range(100)]
+COAUTHORS = 3
+
+
+def synthetic_records(records: int, seed: int = 7):
+    """Genera (título, doi) con COAUTHORS apariciones por publicación en promedio."""
+    rng = random.Random(seed)
+    for i in range(records):
+        pub = rng.randrange(max(1, records // COAUTHORS))
+        words = random.Random(pub).choices(WORDS, k=8)
+        title = " ".join(words) + f" {pub}"
+        variant = rng.random()
+        if variant < 0.2:
+            title = title.upper()
+        elif variant < 0.4:
+            title = title.capitalize() + "."
+        elif variant < 0.5:
+            # Error tipográfico: una letra repetida
+            pos = rng.randrange(len(title) // 2)
+            title = title[:pos] + title[pos] + title[pos:]
+        doi = f"https://doi.org/10.1000/PUB{pub}" if rng.random() < 0.7 else ""
+        yield title, doi
+
+
+def measure(records: int) -> dict:
+    data = list(synthetic_records(records))
+    tracemalloc.start()
+    index = PublicationIndex()
+    start = time.perf_counter()
+    for title, doi in data:
+        index.assign(title, doi)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "records": records,
+        "publications": len(index),
+        "records_per_s": round(records / elapsed),
+        "bytes_per_publication": round(current / len(index)),
+        "matches": index.stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000", help="Tamaños separados por coma")
+    args = parser.parse_args()
+
+    print(json.dumps([measure(int(size)) for size in args.sizes.split(",")], indent=2))
+
+
+if __name__ == "__main__":
+    main()
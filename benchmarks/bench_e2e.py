@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extremo a extremo contra el servidor ORCID simulado.
+
+Levanta ``mock_orcid.MockOrcidServer`` en este proceso y ejecuta el flujo real
+(``get_credentials`` -> ``process_users`` -> exportación) en un subproceso,
+para que el pico de memoria (RSS) medido sea solo el del programa. Mide:
+
+- investigadores/s de extremo a extremo (descarga + parseo + deduplicación)
+- tiempo de parseo por trabajo (decodificación JSON + ``_create_work_record``)
+- tiempo de deduplicación por registro (``PublicationIndex``)
+- tiempo de exportación por formato (``save_results`` y escritores en streaming)
+- pico de RSS
+- con ``--details``: peticiones al endpoint masivo por cada 100 trabajos
+
+El resultado es un JSON (``--output``) con la versión del código y los
+parámetros; con ``--baseline`` se compara contra un resultado anterior y el
+proceso termina con código 1 si alguna métrica empeora más que ``--tolerance``.
+
+Uso:
+    python benchmarks/bench_e2e.py --researchers 300 --workers 8 --latency-ms 40 --jitter-ms 20 --output e2e.json
+    python benchmarks/bench_e2e.py --rate-429 0.02 --rate-5xx 0.01 --retry-after 0.2 --baseline e2e.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_orcid import DISTRIBUTIONS, MockOrcidServer
+
+# Métricas comparadas con --baseline y si "más alto es mejor"
+TRACKED_METRICS = {
+    "researchers_per_s": True,
+    "parse_us_per_work": False,
+    "dedup_us_per_record": False,
+    "export_s": False,
+    "peak_rss_mb": False,
+}
+
+# Investigadores cuyo /works se vuelve a descargar para medir el parseo aislado
+PARSE_SAMPLE = 50
+
+
+def synthetic_orcid(i: int) -> str:
+    return f"0000-0002-{i // 10000:04d}-{i % 10000:04d}"
+
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_child(args) -> dict:
+    """Flujo completo del programa; se ejecuta en el subproceso con el entorno apuntando al servidor."""
+    import pandas as pd
+    from rich.console import Console
+
+    from orcid.app import process_users, save_results
+    from orcid.client import OrcidClient
+    from orcid.dedup import PublicationIndex
+    from orcid.jsonlib import loads
+    from orcid.logger import setup_logging
+    from orcid.metrics import Metrics
+    from orcid.records import Researcher
+    from orcid.utils import ORCID_API_BASE_URL, REQUEST_TIMEOUT, _create_work_record, get_credentials
+    from orcid.writers import create_writer
+
+    # Mismo log que una ejecución real, en la carpeta temporal del subproceso
+    setup_logging(os.path.join(os.getcwd(), "orcid.log"), os.path.join(os.getcwd(), "logs"))
+    console = Console(file=open(os.devnull, "w"))
+    users_df = pd.DataFrame({
+        "orcid": [synthetic_orcid(i) for i in range(args.researchers)],
+        "nombre": [f"Investigador {i}" for i in range(args.researchers)],
+        "cedula": [10000000 + i for i in range(args.researchers)],
+    })
+    metrics = Metrics()
+    client = OrcidClient(pool_size=args.workers * 2 if args.details else args.workers, rate_limit=args.rate_limit, timeout=REQUEST_TIMEOUT, max_retries=args.max_retries, metrics=metrics)
+    result = {}
+
+    start = time.perf_counter()
+    token = get_credentials(client)
+    result["auth_s"] = round(time.perf_counter() - start, 4)
+
+    start = time.perf_counter()
+    output_data, summary = process_users(users_df, token, console, workers=args.workers, client=client, metrics=metrics, details=args.details)
+    elapsed = time.perf_counter() - start
+    result.update({
+        "fetch_process_s": round(elapsed, 3),
+        "researchers_per_s": round(args.researchers / elapsed, 2),
+        "records": summary["processed_records"],
+        "publications": summary["publications"],
+        "errors": summary["errors"],
+        "http": {key: value for key, value in client.stats().items() if key != "rate"},
+        "phases": metrics.snapshot()["phases"],
+        "latency_p95_s": metrics.latency_quantile(0.95),
+    })
+
+    # Parseo aislado: mismas respuestas, sin red
+    payloads = [client.get(f"{ORCID_API_BASE_URL}/{synthetic_orcid(i)}/works", token).content for i in range(min(PARSE_SAMPLE, args.researchers))]
+    researcher = Researcher("1", "Investigador", "0000-0000-0000-0000")
+    works = 0
+    start = time.perf_counter()
+    for payload in payloads:
+        for group in loads(payload).get("group", []):
+            _create_work_record(researcher, group.get("work-summary", []))
+            works += 1
+    result["parse_us_per_work"] = round((time.perf_counter() - start) / max(works, 1) * 1e6, 2)
+
+    start = time.perf_counter()
+    index = PublicationIndex()
+    for record in output_data:
+        index.assign(record.get("title", ""), record.get("doi", ""))
+    result["dedup_us_per_record"] = round((time.perf_counter() - start) / max(len(output_data), 1) * 1e6, 2)
+
+    # Exportación: DataFrame + to_excel (save_results) y escritores en streaming
+    tmp = tempfile.mkdtemp()
+    export = {}
+    start = time.perf_counter()
+    save_results(output_data, os.path.join(tmp, "dataframe.xlsx"), console)
+    export["xlsx_dataframe"] = round(time.perf_counter() - start, 3)
+    for fmt in args.formats.split(","):
+        writer = create_writer([fmt], os.path.join(tmp, "stream"))
+        start = time.perf_counter()
+        for record in output_data:
+            writer.write(record)
+        writer.close()
+        export[fmt] = round(time.perf_counter() - start, 3)
+    result["export"] = export
+    result["export_s"] = round(sum(export.values()), 3)
+
+    client.close()
+    result["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return result
+
+
+def git_version() -> str:
+    try:
+        out = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocida"
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """Métricas que empeoraron más que la tolerancia respecto a la línea base."""
+    regressions = []
+    for metric, higher_is_better in TRACKED_METRICS.items():
+        old, new = baseline.get("metrics", {}).get(metric), result["metrics"].get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append({"metric": metric, "baseline": old, "current": new, "change": round(change, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--researchers", type=int, default=200)
+    parser.add_argument("--works-mean", type=float, default=50)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--rate-429", type=float, default=0)
+    parser.add_argument("--rate-5xx", type=float, default=0)
+    parser.add_argument("--retry-after", type=float, default=1)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate-limit", type=float, default=0, help="Peticiones/s del cliente (0 = sin límite)")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--details", action="store_true", help="Completar los trabajos con /works/{put-codes}")
+    parser.add_argument("--formats", default="xlsx,jsonl,sqlite", help="Formatos exportados en streaming")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Guardar el resultado JSON en este archivo")
+    parser.add_argument("--baseline", help="Resultado JSON anterior con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Empeoramiento relativo tolerado (por defecto 0.15)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args)))
+        return
+
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "tolerance", "child")}
+    with MockOrcidServer(works_mean=args.works_mean, distribution=args.distribution, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_429=args.rate_429, rate_5xx=args.rate_5xx, retry_after=args.retry_after, seed=args.seed) as server:
+        env = dict(os.environ, ORCID_API_BASE_URL=server.base_url, ORCID_TOKEN_URL=server.token_url, ORCID_CLIENT_ID="bench", ORCID_CLIENT_SECRET="bench")
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"] + sys.argv[1:], env=env, cwd=tempfile.mkdtemp(), capture_output=True, text=True)
+        if out.returncode != 0:
+            sys.stderr.write(out.stderr)
+            sys.exit(out.returncode)
+        server_stats = dict(server.stats)
+
+    metrics = json.loads(out.stdout.strip().splitlines()[-1])
+    if server_stats["bulk_works"]:
+        metrics["bulk_requests_per_100_works"] = round(server_stats["bulk"] / server_stats["bulk_works"] * 100, 3)
+
+    result = {
+        "version": git_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": params,
+        "metrics": metrics,
+        "server": server_stats,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        result["regressions"] = regressions
+
+    print(json.dumps(result, indent=2))
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Rendimiento del enriquecimiento de DOI (``orcid.enrich``) en DOI/s.
+
+Genera la columna doi de ``--records`` registros: ``--distinct`` DOI
+distintos compartidos entre investigadores (coautorías), parte en forma de
+URL ``https://doi.org/...`` y una fracción ``--not-doi`` de otros
+identificadores (ISSN) que no se consultan. Los DOI se resuelven contra un
+servidor local con la forma de la API de Crossref (``/works?filter=doi:...``)
+con ``--latency-ms`` por petición. Compara:
+
+- ``unbatched``: un DOI por petición, sin caché (lo que haría una consulta por registro)
+- ``batched_cold``: lotes de CrossrefProvider.batch_size, ``--workers`` lotes en vuelo, caché vacía
+- ``batched_warm``: segunda ejecución, todo desde la caché SQLite
+- ``stub``: proveedor local sin red (modo de pruebas)
+
+Uso:
+    python benchmarks/bench_enrich.py --records 50000 --distinct 20000 --latency-ms 60 --workers 4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orcid.enrich import CrossrefProvider, DoiCache, DoiEnricher, StubProvider
+
+
+class MockCrossref:
+    """Servidor local que responde /works?filter=doi:a,doi:b como Crossref (encuentra el 90% de los DOI)."""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                time.sleep(server.latency)
+                query = parse_qs(urlparse(self.path).query)
+                dois = [part[4:] for part in query.get("filter", [""])[0].split(",") if part.startswith("doi:")]
+                items = [{"DOI": doi.upper(), "container-title": [f"Journal {hash(doi) % 300}"], "issued": {"date-parts": [[2000 + hash(doi) % 24, 5, 17]]}} for doi in dois if hash(doi) % 10]
+                body = json.dumps({"status": "ok", "message": {"items": items}}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def make_values(args, rng: random.Random) -> list:
+    """Columna doi de los registros: DOI repetidos entre investigadores, URL y otros identificadores."""
+    dois = [f"10.5555/bench.{i}" for i in range(args.distinct)]
+    values = []
+    for _ in range(args.records):
+        if rng.random() < args.not_doi:
+            values.append(f"{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}")
+            continue
+        doi = rng.choice(dois)
+        values.append(f"https://doi.org/{doi}" if rng.random() < 0.2 else doi)
+    return values
+
+
+def run(enricher: DoiEnricher, values: list, requests_before: int = 0, server: MockCrossref = None) -> dict:
+    enricher.resolve(values)
+    stats = {key: enricher.stats[key] for key in ("dois", "not_doi", "cached", "looked_up", "found", "failed", "batches", "seconds", "dois_per_s")}
+    if server:
+        stats["http_requests"] = server.requests - requests_before
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--distinct", type=int, default=20000, help="DOI distintos")
+    parser.add_argument("--not-doi", type=float, default=0.05, help="Fracción de valores que no son DOI")
+    parser.add_argument("--latency-ms", type=float, default=60, help="Latencia del servidor simulado por petición")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--unbatched-sample", type=int, default=300, help="DOI consultados en el modo unbatched (se extrapola)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    values = make_values(args, random.Random(args.seed))
+    directory = tempfile.mkdtemp()
+    server = MockCrossref(args.latency_ms)
+    results = {}
+    try:
+        # Referencia: una petición por DOI (muestra), sin deduplicar entre investigadores
+        provider = CrossrefProvider(args.workers, rate_limit=0, base_url=server.url)
+        provider.batch_size = 1
+        sample = [value for value in values if value.startswith("10.")][:args.unbatched_sample]
+        start = time.perf_counter()
+        for value in sample:
+            provider.lookup([value])
+        elapsed = time.perf_counter() - start
+        provider.close()
+        results["unbatched"] = {"dois": len(sample), "seconds": round(elapsed, 3), "dois_per_s": round(len(sample) / elapsed, 1), "estimated_total_s": round(elapsed / len(sample) * args.records, 1)}
+
+        cache_path = os.path.join(directory, "doi.sqlite")
+        for mode in ("batched_cold", "batched_warm"):
+            before = server.requests
+            enricher = DoiEnricher(CrossrefProvider(args.workers, rate_limit=0, base_url=server.url), DoiCache(cache_path))
+            results[mode] = run(enricher, values, before, server)
+            enricher.close()
+
+        enricher = DoiEnricher(StubProvider(args.workers))
+        results["stub"] = run(enricher, values)
+        enricher.close()
+    finally:
+        server.close()
+
+    print(json.dumps({"records": args.records, "distinct": args.distinct, "latency_ms": args.latency_ms, "workers": args.workers, "modes": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Costo del log en los hilos de descarga: FileHandler síncrono vs ``setup_logging``.
+
+Cada modo corre en un subproceso independiente: ``--threads`` hilos registran
+cada uno ``--messages`` mensajes con la misma mezcla que ``get_records``
+(una línea por investigador y ``--per-work`` errores por trabajo). Se mide el
+tiempo que los hilos pasan dentro de las llamadas a ``logging`` y el tiempo
+hasta que todo quedó escrito en disco. Con ``--flush-ms`` cada escritura al
+archivo tarda además ese tiempo, como en un disco lento o de red.
+
+- ``sync``: ``basicConfig(filename=...)`` como antes, texto plano
+- ``queue``: ``setup_logging`` (JSON, hilo escritor en segundo plano)
+- ``queue_sampled``: igual, con ``ORCID_LOG_SAMPLE=0.1`` para los mensajes por trabajo
+
+Uso:
+    python benchmarks/bench_logging.py --threads 8 --messages 5000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_mode(mode: str, directory: str, threads: int, messages: int, per_work: int, flush_ms: float) -> dict:
+    import logging
+
+    if flush_ms:
+        flush = logging.StreamHandler.flush
+
+        def slow_flush(self):
+            flush(self)
+            time.sleep(flush_ms / 1000)
+
+        logging.StreamHandler.flush = slow_flush
+
+    from orcid.logger import SAMPLED, setup_logging
+
+    log_file = os.path.join(directory, f"{mode}.log")
+    if mode == "sync":
+        logging.basicConfig(filename=log_file, filemode="w", format="[%(asctime)s - %(levelname)s] %(message)s", level=logging.INFO)
+    else:
+        if mode == "queue_sampled":
+            os.environ["ORCID_LOG_SAMPLE"] = "0.1"
+        setup_logging(log_file, os.path.join(directory, "archive"))
+
+    barrier = threading.Barrier(threads)
+    spent = [0.0] * threads
+    cpu = [0.0] * threads
+
+    def worker(n: int) -> None:
+        barrier.wait()
+        total, total_cpu = 0.0, 0.0
+        for i in range(messages):
+            orcid = f"0000-0002-{n:04d}-{i:04d}"
+            start, start_cpu = time.perf_counter(), time.thread_time()
+            logging.info(f"ORCID {orcid}: 30 trabajos encontrados", extra={"orcid": orcid, "phase": "fetch", "status": "ok", "latency_ms": 41.7, "works": 30})
+            for _ in range(per_work):
+                logging.error(f"Error extrayendo fecha: 'NoneType' object has no attribute 'get'", extra=SAMPLED)
+            total += time.perf_counter() - start
+            total_cpu += time.thread_time() - start_cpu
+        spent[n], cpu[n] = total, total_cpu
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    emit_elapsed = time.perf_counter() - start
+    if mode == "sync":
+        logging.shutdown()
+    else:
+        import atexit
+
+        atexit._run_exitfuncs()  # detiene el hilo escritor: todo queda en disco
+    flushed = time.perf_counter() - start
+
+    with open(log_file, "rb") as f:
+        lines = sum(1 for _ in f)
+    calls = threads * messages * (1 + per_work)
+    return {
+        "mode": mode,
+        "caller_us_per_call": round(sum(spent) / calls * 1e6, 2),
+        "caller_cpu_us_per_call": round(sum(cpu) / calls * 1e6, 2),
+        "emit_s": round(emit_elapsed, 3),
+        "flushed_s": round(flushed, 3),
+        "lines": lines,
+        "log_mb": round(os.path.getsize(log_file) / 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=5000, help="Mensajes por investigador por hilo")
+    parser.add_argument("--per-work", type=int, default=3, help="Errores por trabajo registrados por cada investigador")
+    parser.add_argument("--flush-ms", type=float, default=0, help="Demora simulada de cada escritura al archivo")
+    parser.add_argument("--mode", choices=["sync", "queue", "queue_sampled"], help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.dir, args.threads, args.messages, args.per_work, args.flush_ms)))
+        return
+
+    directory = tempfile.mkdtemp()
+    results = []
+    for mode in ("sync", "queue", "queue_sampled"):
+        out = subprocess.run([sys.executable, __file__, "--mode", mode, "--dir", directory, "--threads", str(args.threads), "--messages", str(args.messages), "--per-work", str(args.per_work), "--flush-ms", str(args.flush_ms)], check=True, capture_output=True, text=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(json.dumps({"threads": args.threads, "flush_ms": args.flush_ms, "modes": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark del parseo de trabajos ORCID.
+
+Compara las cinco funciones get_title/get_journal/get_date/get_doi/get_url_source
+contra ``parse_work_summary`` (una sola pasada por grupo), y el decodificador
+JSON estándar contra el de ``orcid.jsonlib`` (orjson si está instalado).
+
+Uso:
+    python benchmarks/bench_parse.py --works 200000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orcid import jsonlib
+from orcid.utils import get_date, get_doi, get_journal, get_title, get_url_source, parse_work_summary
+
+
+def synthetic_group(i: int) -> dict:
+    """Grupo /works con dos resúmenes; el DOI solo aparece en el segundo identificador."""
+    summary = {
+        "title": {"title": {"value": f"Publicación {i} sobre investigación\n en salud"}},
+        "journal-title": {"value": f"Revista {i % 300}"},
+        "publication-date": {"year": {"value": "2021"}, "month": {"value": "03"}, "day": {"value": "15"}},
+        "url": {"value": f"https://example.org/{i}"},
+        "external-ids": {"external-id": [
+            {"external-id-type": "issn", "external-id-value": "1234-5678"},
+            {"external-id-type": "doi", "external-id-value": f"10.1000/xyz{i}"},
+        ]},
+    }
+    return {"last-modified-date": {"value": 1700000000000}, "work-summary": [summary, dict(summary)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--works", type=int, default=200000)
+    args = parser.parse_args()
+
+    groups = [synthetic_group(i) for i in range(args.works)]
+    summaries = [group["work-summary"] for group in groups]
+
+    start = time.perf_counter()
+    for ws in summaries:
+        (get_title(ws), get_journal(ws), get_date(ws), get_doi(ws), get_url_source(ws))
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for ws in summaries:
+        parse_work_summary(ws)
+    single_pass = time.perf_counter() - start
+
+    # Decodificación de respuestas del tamaño de un perfil típico (150 trabajos)
+    payload = json.dumps({"group": groups[:150]}).encode("utf-8")
+    del groups, summaries
+    repeats = max(args.works // 150, 1)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        json.loads(payload)
+    stdlib_decode = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeats):
+        jsonlib.loads(payload)
+    fast_decode = time.perf_counter() - start
+
+    print(json.dumps({
+        "works": args.works,
+        "legacy_us_per_work": round(legacy / args.works * 1e6, 2),
+        "single_pass_us_per_work": round(single_pass / args.works * 1e6, 2),
+        "parse_speedup": round(legacy / single_pass, 2),
+        "payload_kb": round(len(payload) / 1e3, 1),
+        "json_decoder": jsonlib.JSON_DECODER,
+        "stdlib_ms_per_payload": round(stdlib_decode / repeats * 1e3, 3),
+        "decoder_ms_per_payload": round(fast_decode / repeats * 1e3, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Procesamiento normal frente al pipeline por etapas (``--pipeline``) contra ``mock_orcid``.
+
+Cada modo corre en un subproceso (con su log en una carpeta temporal) y
+procesa ``--researchers`` investigadores escribiendo en streaming los
+formatos ``--formats`` más un jsonl de control:
+
+- ``sequential``: _iter_user_results (descarga + parseo en los hilos, escritura al final de cada uno)
+- ``pipeline``: etapas fetch -> parse (un hilo) -> write con colas acotadas
+- ``pipeline_processes``: igual, con ``--parse-processes`` procesos de parseo
+
+Reporta investigadores/s, pico de RSS, la utilización de cada etapa y si el
+jsonl de control es idéntico al del modo secuencial.
+
+Uso:
+    python benchmarks/bench_pipeline.py --researchers 400 --workers 8 --latency-ms 40 --works-mean 120
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_e2e import peak_rss_mb, synthetic_orcid
+from mock_orcid import DISTRIBUTIONS, MockOrcidServer
+
+MODES = ("sequential", "pipeline", "pipeline_processes")
+
+
+def run_child(args) -> dict:
+    """Un modo del benchmark; se ejecuta en el subproceso con el entorno apuntando al servidor."""
+    import pandas as pd
+    from rich.console import Console
+
+    from orcid.app import process_users
+    from orcid.client import OrcidClient
+    from orcid.logger import setup_logging
+    from orcid.metrics import Metrics
+    from orcid.utils import REQUEST_TIMEOUT, get_credentials
+    from orcid.writers import create_writer
+
+    setup_logging(os.path.join(os.getcwd(), "orcid.log"), os.path.join(os.getcwd(), "logs"))
+    console = Console(file=open(os.devnull, "w"))
+    users_df = pd.DataFrame({
+        "orcid": [synthetic_orcid(i) for i in range(args.researchers)],
+        "nombre": [f"Investigador {i}" for i in range(args.researchers)],
+        "cedula": [10000000 + i for i in range(args.researchers)],
+    })
+    metrics = Metrics()
+    client = OrcidClient(pool_size=args.workers, rate_limit=args.rate_limit, timeout=REQUEST_TIMEOUT, max_retries=5, metrics=metrics)
+    token = get_credentials(client)
+    base = os.path.join(os.getcwd(), "publicaciones")
+    writer = create_writer(sorted(set(args.formats.split(",")) | {"jsonl"}), base)
+
+    start = time.perf_counter()
+    _, summary = process_users(users_df, token, console, workers=args.workers, client=client, writer=writer, metrics=metrics, pipeline=args.mode != "sequential", parse_processes=args.parse_processes if args.mode == "pipeline_processes" else 0)
+    writer.close()
+    elapsed = time.perf_counter() - start
+    client.close()
+
+    with open(f"{base}.jsonl", "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {
+        "mode": args.mode,
+        "elapsed_s": round(elapsed, 3),
+        "researchers_per_s": round(args.researchers / elapsed, 2),
+        "records": summary["processed_records"],
+        "errors": summary["errors"],
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "output_sha256": digest,
+        "pipeline": summary.get("pipeline"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--researchers", type=int, default=400)
+    parser.add_argument("--works-mean", type=float, default=120)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--parse-processes", type=int, default=2)
+    parser.add_argument("--rate-limit", type=float, default=0, help="Peticiones/s del cliente (0 = sin límite)")
+    parser.add_argument("--formats", default="xlsx", help="Formatos escritos en streaming además del jsonl de control")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", choices=MODES, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_child(args)))
+        return
+
+    results = []
+    with MockOrcidServer(works_mean=args.works_mean, distribution=args.distribution, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed) as server:
+        env = dict(os.environ, ORCID_API_BASE_URL=server.base_url, ORCID_TOKEN_URL=server.token_url, ORCID_CLIENT_ID="bench", ORCID_CLIENT_SECRET="bench")
+        for mode in MODES:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--mode", mode] + sys.argv[1:], env=env, cwd=tempfile.mkdtemp(), capture_output=True, text=True)
+            if out.returncode != 0:
+                sys.stderr.write(out.stderr)
+                sys.exit(out.returncode)
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    reference = results[0]["output_sha256"]
+    for result in results:
+        result["identical_output"] = result.pop("output_sha256") == reference
+    print(json.dumps({"researchers": args.researchers, "workers": args.workers, "latency_ms": args.latency_ms, "works_mean": args.works_mean, "modes": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Memoria por registro: diccionario de 10 claves vs ``WorkRecord`` compacto.
+
+Uso:
+    python benchmarks/bench_records.py --works 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orcid.records import Researcher, WorkRecord
+
+WORKS_PER_RESEARCHER = 50
+
+
+def build_dicts(works: int) -> list:
+    records = []
+    for i in range(works):
+        researcher = i // WORKS_PER_RESEARCHER
+        records.append({
+            "cedula": 10000000 + researcher,
+            "nombre_profesor": f"Investigador {researcher}",
+            "orcid_profesor": f"0000-0002-{researcher:04d}-0000",
+            "title": f"Publicación {i}",
+            "journal": f"Revista {i % 300}",
+            "date": "2020-01",
+            "doi": f"10.1000/xyz{i}",
+            "source": "ORCID",
+            "note": "",
+            "url_source": "",
+        })
+    return records
+
+
+def build_compact(works: int) -> list:
+    records = []
+    researcher = None
+    for i in range(works):
+        if i % WORKS_PER_RESEARCHER == 0:
+            r = i // WORKS_PER_RESEARCHER
+            researcher = Researcher(10000000 + r, f"Investigador {r}", f"0000-0002-{r:04d}-0000")
+        records.append(WorkRecord(researcher, title=f"Publicación {i}", journal=f"Revista {i % 300}", date="2020-01", doi=f"10.1000/xyz{i}"))
+    return records
+
+
+def measure(build, works: int) -> int:
+    tracemalloc.start()
+    records = build(works)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--works", type=int, default=100000)
+    args = parser.parse_args()
+
+    dict_bytes = measure(build_dicts, args.works)
+    compact_bytes = measure(build_compact, args.works)
+
+    print(json.dumps({
+        "works": args.works,
+        "dict_bytes_per_record": round(dict_bytes / args.works),
+        "compact_bytes_per_record": round(compact_bytes / args.works),
+        "reduction": round(1 - compact_bytes / dict_bytes, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
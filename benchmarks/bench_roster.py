@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Carga del listado de investigadores: lectura completa vs ``load_roster`` por bloques.
+
+Genera un CSV sintético con ORCID válidos, URLs, minúsculas, dígitos de control
+erróneos y repetidos, y mide filas/s y pico de RSS de cada modo en un
+subproceso independiente.
+
+Uso:
+    python benchmarks/bench_roster.py --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def orcid_with_checksum(base: int) -> str:
+    """ORCID válido a partir de 15 dígitos (ISO 7064 MOD 11-2)."""
+    digits = f"{base:015d}"
+    total = 0
+    for digit in digits:
+        total = (total + int(digit)) * 2
+    check = (12 - total % 11) % 11
+    code = digits + ("X" if check == 10 else str(check))
+    return "-".join(code[i:i + 4] for i in range(0, 16, 4))
+
+
+def write_roster(path: str, rows: int) -> None:
+    rng = random.Random(7)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("cedula,nombre,orcid\n")
+        for i in range(rows):
+            orcid = orcid_with_checksum(rng.randrange(rows) + 10 ** 12)  # ~37% repetidos
+            variant = rng.random()
+            if variant < 0.1:
+                orcid = f"https://orcid.org/{orcid}"
+            elif variant < 0.15:
+                orcid = orcid[:-1] + ("0" if orcid[-1] != "0" else "1")
+            elif variant < 0.2:
+                orcid = "-"
+            f.write(f"{10000000 + i},Investigador {i},{orcid.lower()}\n")
+
+
+def run_mode(mode: str, path: str) -> dict:
+    import pandas as pd
+
+    from orcid.roster import load_roster
+
+    start = time.perf_counter()
+    if mode == "read_csv":
+        data = pd.read_csv(path, usecols=["orcid", "nombre", "cedula"])
+        valid = data[data["orcid"].notna() & (data["orcid"] != "-") & (data["orcid"].astype(str) != "nan")]
+        counts = {"valid": len(valid)}
+    else:
+        valid, _, counts = load_roster(path)
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return {"mode": mode, "seconds": round(elapsed, 3), "peak_rss_mb": round(peak_mb, 1), "users_to_fetch": len(valid), "counts": counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--mode", choices=["read_csv", "roster"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.path)))
+        return
+
+    path = os.path.join(tempfile.mkdtemp(), "roster.csv")
+    write_roster(path, args.rows)
+
+    results = []
+    for mode in ("read_csv", "roster"):
+        out = subprocess.run([sys.executable, __file__, "--mode", mode, "--path", path], check=True, capture_output=True, text=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        result["rows_per_s"] = round(args.rows / result["seconds"])
+        results.append(result)
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
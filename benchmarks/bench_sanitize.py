@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de la limpieza de caracteres ilegales para Excel.
+
+Compara la versión anterior (``apply`` celda por celda con ``re.sub`` sin
+compilar) contra ``clean_illegal_series`` sobre un DataFrame sintético con la
+forma de los registros de salida.
+
+Uso:
+    python benchmarks/bench_sanitize.py --rows 500000
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from bench_writer import synthetic_records
+from orcid.app import clean_illegal_series
+
+
+def legacy_clean(value):
+    """Implementación original de ``clean_illegal_characters``."""
+    if isinstance(value, str):
+        return re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F]', '', value)
+    return value
+
+
+def measure(df: pd.DataFrame, clean) -> float:
+    start = time.perf_counter()
+    for col in df.columns:
+        clean(df[col])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000)
+    args = parser.parse_args()
+
+    df = pd.DataFrame(synthetic_records(args.rows))
+    cells = df.shape[0] * df.shape[1]
+
+    before = measure(df, lambda series: series.apply(legacy_clean))
+    after = measure(df, clean_illegal_series)
+
+    print(json.dumps({
+        "rows": args.rows,
+        "cells": cells,
+        "before": {"seconds": round(before, 3), "cells_per_second": round(cells / before)},
+        "after": {"seconds": round(after, 3), "cells_per_second": round(cells / after)},
+        "speedup": round(before / after, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Esquema tipado de salida (``orcid.schema``) frente al DataFrame de texto de ``save_results``.
+
+Con ``--rows`` registros sintéticos (fechas con precisión de año, mes o día)
+compara dos DataFrame:
+
+- ``object``: columnas object como las construía save_results
+- ``str``: la inferencia por defecto de la versión instalada de pandas
+- ``typed``: el mismo lote tras ``apply_schema`` (fecha por partes, categóricas)
+
+Reporta la memoria (``memory_usage(deep=True)``), el tiempo de aplicar el
+esquema y el de filtrar por año y agrupar por revista en cada uno. Con
+``--formats`` mide además la exportación con ``create_writer`` (esquema
+aplicado por lotes) para cada formato.
+
+Uso:
+    python benchmarks/bench_schema.py --rows 200000 --formats xlsx,jsonl,sqlite,parquet
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from bench_writer import synthetic_records
+from orcid.schema import apply_schema
+from orcid.writers import create_writer
+
+
+def records(rows: int) -> list:
+    """Registros de bench_writer con un tercio de fechas de cada precisión."""
+    result = []
+    for i, record in enumerate(synthetic_records(rows)):
+        record["publication_id"] = f"P{i:012x}"
+        if i % 3 == 0:
+            record["date"] = record["date"][:4]
+        elif i % 3 == 1:
+            record["date"] = f"{record['date']}-{1 + i % 28:02d}"
+        result.append(record)
+    return result
+
+
+def timed(function, repeat: int = 5) -> float:
+    """Mediana en milisegundos."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return round(statistics.median(times) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--formats", default="jsonl,sqlite,parquet", help="Formatos exportados con create_writer (vacío = omitir)")
+    args = parser.parse_args()
+
+    data = records(args.rows)
+    frames = {"object": pd.DataFrame(data, dtype=object), "str": pd.DataFrame(data)}
+    start = time.perf_counter()
+    frames["typed"] = apply_schema(frames["str"])
+    apply_s = time.perf_counter() - start
+
+    results = {}
+    for name, frame in frames.items():
+        if name == "typed":
+            by_year = lambda: frame[frame["year"] == 2010]
+        else:
+            by_year = lambda: frame[frame["date"].str[:4] == "2010"]
+        results[name] = {
+            "memory_mb": round(frame.memory_usage(deep=True).sum() / 1e6, 2),
+            "filter_year_ms": timed(by_year),
+            "group_journal_ms": timed(lambda: frame.groupby("journal", observed=True).size()),
+            "dtypes": {column: str(dtype) for column, dtype in frame.dtypes.items()} if name == "typed" else None,
+        }
+
+    export = {}
+    directory = tempfile.mkdtemp()
+    for fmt in [fmt for fmt in args.formats.split(",") if fmt]:
+        writer = create_writer([fmt], os.path.join(directory, "publicaciones"))
+        start = time.perf_counter()
+        for record in data:
+            writer.write(record)
+        writer.close()
+        elapsed = time.perf_counter() - start
+        export[fmt] = {"seconds": round(elapsed, 3), "rows_per_s": round(args.rows / elapsed), "file_mb": round(os.path.getsize(writer.writers[0].path) / 1e6, 2)}
+
+    print(json.dumps({
+        "rows": args.rows,
+        "pandas": pd.__version__,
+        "apply_schema_s": round(apply_s, 3),
+        "apply_schema_rows_per_s": round(args.rows / apply_s),
+        "frames": results,
+        "memory_ratio_object_to_typed": round(results["object"]["memory_mb"] / results["typed"]["memory_mb"], 2),
+        "export": export,
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga del servicio de consultas (``python main.py serve``) contra ``mock_orcid``.
+
+El servicio corre en un subproceso (con su log en una carpeta temporal) y
+``--clients`` hilos le envían ``--requests`` peticiones en total. Los ORCID
+se eligen entre ``--orcids`` perfiles con una distribución Zipf (unos pocos
+investigadores concentran la mayoría de las consultas, como en el uso real),
+y una fracción ``--bulk-fraction`` son POST masivos de ``--bulk-size`` ORCID.
+Se compara:
+
+- ``lru``: caché en memoria de ``--cache-size`` perfiles + SingleFlight
+- ``no_lru``: sin caché en memoria (``--cache-size 0``), solo SingleFlight
+
+Reporta peticiones/s, latencia p50/p90/p99 de los GET y de los POST, las
+descargas que llegaron al servidor ORCID simulado y las consultas agrupadas.
+
+Uso:
+    python benchmarks/bench_service.py --clients 32 --requests 4000 --latency-ms 80
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_roster import orcid_with_checksum
+from mock_orcid import MockOrcidServer
+
+
+def serve(cache_size: int, workers: int, rate_limit: float, log_dir: str) -> None:
+    """Subproceso: levanta el servicio en un puerto libre e imprime su URL."""
+    from orcid.logger import setup_logging
+    from orcid.service import LookupServer, create_service
+
+    setup_logging(os.path.join(log_dir, "orcid.log"), os.path.join(log_dir, "logs"))
+    service = create_service(workers=workers, rate_limit=rate_limit, cache_size=cache_size)
+    server = LookupServer(service, port=0)
+    print(server.url, flush=True)
+    server.serve_forever()
+
+
+def percentiles(values: list) -> dict:
+    if not values:
+        return {}
+    values = sorted(values)
+    pick = lambda q: values[min(int(q * len(values)), len(values) - 1)] * 1000
+    return {"count": len(values), "p50_ms": round(pick(0.5), 1), "p90_ms": round(pick(0.9), 1), "p99_ms": round(pick(0.99), 1), "mean_ms": round(statistics.mean(values) * 1000, 1)}
+
+
+def load(url: str, orcids: list, args: argparse.Namespace) -> dict:
+    """Envía la carga desde --clients hilos y mide la latencia de cada petición."""
+    weights = [1 / (rank + 1) ** args.zipf for rank in range(len(orcids))]
+    per_client = args.requests // args.clients
+    latencies = {"get": [], "bulk": []}
+    failures = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.clients)
+
+    def client(n: int) -> None:
+        rng = random.Random(args.seed * 1000 + n)
+        session = requests.Session()
+        local = {"get": [], "bulk": []}
+        errors = 0
+        barrier.wait()
+        for _ in range(per_client):
+            start = time.perf_counter()
+            if rng.random() < args.bulk_fraction:
+                kind = "bulk"
+                response = session.post(f"{url}/researchers/works", json={"orcids": rng.choices(orcids, weights, k=args.bulk_size)})
+            else:
+                kind = "get"
+                response = session.get(f"{url}/researchers/{rng.choices(orcids, weights)[0]}/works")
+            response.content
+            local[kind].append(time.perf_counter() - start)
+            errors += response.status_code != 200
+        with lock:
+            latencies["get"].extend(local["get"])
+            latencies["bulk"].extend(local["bulk"])
+            failures.append(errors)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = len(latencies["get"]) + len(latencies["bulk"])
+    return {"elapsed_s": round(elapsed, 2), "requests_per_s": round(total / elapsed, 1), "failed": sum(failures), "get": percentiles(latencies["get"]), "bulk": percentiles(latencies["bulk"])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=4000, help="Peticiones en total (repartidas entre los clientes)")
+    parser.add_argument("--orcids", type=int, default=500, help="Investigadores distintos consultados")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Exponente de la distribución de popularidad")
+    parser.add_argument("--bulk-fraction", type=float, default=0.02)
+    parser.add_argument("--bulk-size", type=int, default=50)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--workers", type=int, default=8, help="Workers del servicio")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Peticiones/s del servicio a ORCID (0 = sin límite)")
+    parser.add_argument("--latency-ms", type=float, default=80, help="Latencia del servidor ORCID simulado")
+    parser.add_argument("--works-mean", type=float, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--serve", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        serve(args.serve, args.workers, args.rate_limit, tempfile.mkdtemp())
+        return
+
+    orcids = [orcid_with_checksum(10 ** 12 + i) for i in range(args.orcids)]
+    results = []
+    with MockOrcidServer(works_mean=args.works_mean, latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 4) as mock:
+        env = dict(os.environ, ORCID_TOKEN_URL=mock.token_url, ORCID_API_BASE_URL=mock.base_url, ORCID_CLIENT_ID="bench", ORCID_CLIENT_SECRET="bench")
+        for mode, cache_size in (("lru", args.cache_size), ("no_lru", 0)):
+            process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", str(cache_size), "--workers", str(args.workers), "--rate-limit", str(args.rate_limit)], env=env, stdout=subprocess.PIPE, text=True)
+            try:
+                url = process.stdout.readline().strip()
+                before = requests.get(f"{mock.url}/__stats").json()
+                result = load(url, orcids, args)
+                after = requests.get(f"{mock.url}/__stats").json()
+                service = requests.get(f"{url}/stats").json()
+            finally:
+                process.terminate()
+                process.wait()
+            result.update({
+                "mode": mode,
+                "upstream_works_requests": after["works"] - before["works"],
+                "lookups": service["lookups"],
+                "fetched": service["fetched"],
+                "coalesced": service["coalesced"],
+                "cache_hits": service["cache"]["hits"],
+            })
+            results.append(result)
+
+    print(json.dumps({"clients": args.clients, "orcids": args.orcids, "latency_ms": args.latency_ms, "modes": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
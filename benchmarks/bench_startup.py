@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tiempo de arranque de cada comando de ``main.py``.
+
+Ejecuta cada comando en un proceso nuevo ``--repeat`` veces y reporta la
+mediana y el mínimo del tiempo de pared, de principio a fin del proceso:
+
+- ``import main``: lo que cuesta cargar el script (no debe importar pandas ni rich)
+- ``run --help``
+- ``validate-input`` sobre un listado de ``--rows`` filas
+- ``check-credentials`` contra ``mock_orcid.MockOrcidServer``
+- ``stats`` y ``stats --json`` sobre un archivo de métricas de ejemplo
+- ``import orcid.app`` como referencia del costo de la pila completa
+
+También verifica que ningún comando salvo run/merge cree o rote el log.
+
+Uso:
+    python benchmarks/bench_startup.py --repeat 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_roster import orcid_with_checksum
+from mock_orcid import MockOrcidServer
+
+MAIN = os.path.join(ROOT, "main.py")
+LOG_FILE = os.path.join(ROOT, "orcid", "orcid.log")
+
+
+def write_fixtures(directory: str, rows: int) -> str:
+    """Listado de investigadores y un archivo de métricas como los de una ejecución real."""
+    from orcid.metrics import Metrics
+
+    input_file = os.path.join(directory, "input.csv")
+    with open(input_file, "w", encoding="utf-8") as f:
+        f.write("cedula,nombre,orcid\n")
+        for i in range(rows):
+            f.write(f"{10000000 + i},Investigador {i},{orcid_with_checksum(10 ** 12 + i)}\n")
+
+    metrics = Metrics()
+    metrics.observe_request(0.12, 200, 4096)
+    summary = {"complete": True, "index": rows, "total_users": rows, "processed_records": rows * 30, "errors": 0}
+    metrics.write_json(os.path.join(directory, "metrics", "metrics_2024-10-01_083000.json"), {"summary": summary})
+    return input_file
+
+
+def measure(command: list, env: dict, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(command, env=env, cwd=ROOT, capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(command)} terminó con código {result.returncode}:\n{result.stdout}{result.stderr}")
+    return {"median_ms": round(statistics.median(times) * 1000, 1), "min_ms": round(min(times) * 1000, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=1000, help="Filas del listado para validate-input")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    input_file = write_fixtures(directory, args.rows)
+    log_before = os.stat(LOG_FILE).st_mtime_ns if os.path.exists(LOG_FILE) else None
+
+    with MockOrcidServer() as server:
+        env = dict(os.environ, ORCID_TOKEN_URL=server.token_url, ORCID_API_BASE_URL=server.base_url, ORCID_CLIENT_ID="bench", ORCID_CLIENT_SECRET="bench", ORCID_METRICS_DIR=os.path.join(directory, "metrics"))
+        commands = {
+            "import main": [sys.executable, "-c", "import main"],
+            "run --help": [sys.executable, MAIN, "run", "--help"],
+            "validate-input": [sys.executable, MAIN, "validate-input", "--input", input_file],
+            "check-credentials": [sys.executable, MAIN, "check-credentials"],
+            "stats": [sys.executable, MAIN, "stats"],
+            "stats --json": [sys.executable, MAIN, "stats", "--json"],
+            "import orcid.app (referencia)": [sys.executable, "-c", "import orcid.app"],
+        }
+        results = {name: measure(command, env, args.repeat) for name, command in commands.items()}
+
+    # import orcid.app importa orcid.utils, que no debe abrir el log por sí solo
+    log_after = os.stat(LOG_FILE).st_mtime_ns if os.path.exists(LOG_FILE) else None
+    print(json.dumps({"repeat": args.repeat, "rows": args.rows, "log_touched": log_before != log_after, "commands": results}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
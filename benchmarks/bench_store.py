@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Base de publicaciones (``orcid.database``): carga de ejecuciones y consultas sobre el histórico.
+
+Simula ``--runs`` ejecuciones (por ejemplo, trimestrales) sobre ``--researchers``
+investigadores con ``--works`` trabajos cada uno; en cada ejecución
+``--churn`` de los investigadores agrega publicaciones nuevas. Reporta:
+
+- filas/s del upsert en lotes de BATCH_SIZE (una transacción por lote)
+- tamaño de la base frente a guardar cada ejecución completa
+- latencia (mediana de ``--repeat``) de las consultas del comando ``query``
+- como referencia, la misma búsqueda por DOI con pandas sobre los xlsx de
+  las últimas ``--xlsx-runs`` ejecuciones (lo que había que hacer antes)
+
+Uso:
+    python benchmarks/bench_store.py --runs 12 --researchers 2000 --works 40
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orcid.database import PublicationDatabase
+from orcid.records import OUTPUT_COLUMNS
+from orcid.writers import StreamingXlsxWriter
+
+
+def make_profiles(researchers: int, works: int, rng: random.Random) -> dict:
+    """Trabajos iniciales de cada investigador: ORCID -> lista de registros."""
+    profiles = {}
+    for i in range(researchers):
+        orcid = f"0000-0002-{i // 10000:04d}-{i % 10000:04d}"
+        profiles[orcid] = [work(orcid, i, n, rng) for n in range(works)]
+    return profiles
+
+
+def work(orcid: str, i: int, n: int, rng: random.Random) -> dict:
+    year = rng.randint(1995, 2024)
+    return {
+        "cedula": 10000000 + i,
+        "nombre_profesor": f"Investigador {i}",
+        "orcid_profesor": orcid,
+        "title": f"Publicación {n} de {orcid}",
+        "journal": f"Revista {rng.randint(1, 300)}",
+        "date": f"{year}-{rng.randint(1, 12):02d}",
+        "doi": f"10.5555/{orcid}.{n}",
+        "source": "ORCID",
+        "note": "",
+        "url_source": f"https://doi.org/10.5555/{orcid}.{n}",
+        "publication_id": f"P{hash((orcid, n)) & 0xFFFFFFFFFFFF:012x}",
+    }
+
+
+def timed(function, repeat: int) -> float:
+    """Mediana en milisegundos."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return round(statistics.median(times) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=12)
+    parser.add_argument("--researchers", type=int, default=2000)
+    parser.add_argument("--works", type=int, default=40, help="Trabajos iniciales por investigador")
+    parser.add_argument("--churn", type=float, default=0.1, help="Fracción de investigadores con publicaciones nuevas en cada ejecución")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--xlsx-runs", type=int, default=2, help="Ejecuciones exportadas a xlsx para la referencia con pandas (0 = omitir)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    directory = tempfile.mkdtemp()
+    database = PublicationDatabase(os.path.join(directory, "publicaciones.sqlite"))
+    profiles = make_profiles(args.researchers, args.works, rng)
+
+    loads = []
+    total_rows = 0
+    for run in range(args.runs):
+        if run:
+            for orcid in rng.sample(list(profiles), int(len(profiles) * args.churn)):
+                i = int(orcid[-9:].replace("-", ""))
+                profiles[orcid].append(work(orcid, i, len(profiles[orcid]), rng))
+        writer = database.writer()
+        start = time.perf_counter()
+        for records in profiles.values():
+            for record in records:
+                writer.write(record)
+        writer.close()
+        loads.append(time.perf_counter() - start)
+        database.finish_run(writer.run_id, writer.rows)
+        total_rows += writer.rows
+
+    last_run = database.runs()[-1]
+    since = database.runs()[args.runs // 2]["started"][:10]
+    sample = rng.choice(list(profiles))
+    doi = profiles[sample][0]["doi"]
+    queries = {
+        "works_by_doi": timed(lambda: database.works_by_doi(doi), args.repeat),
+        "works_by_orcid": timed(lambda: database.works_by_orcid(sample), args.repeat),
+        "added_since": timed(lambda: database.added_since(since), args.repeat),
+        "count_by_year": timed(lambda: database.count_by_year(), args.repeat),
+        "snapshot (última ejecución)": timed(lambda: sum(1 for _ in database.snapshot(last_run["run_id"], OUTPUT_COLUMNS)), 3),
+    }
+
+    baseline = None
+    if args.xlsx_runs:
+        import pandas as pd
+
+        files = []
+        for run in database.runs()[-args.xlsx_runs:]:
+            path = os.path.join(directory, f"publicaciones_{run['run_id']}.xlsx")
+            xlsx = StreamingXlsxWriter(path, OUTPUT_COLUMNS)
+            database.export(run["run_id"], xlsx)
+            xlsx.close()
+            files.append(path)
+        start = time.perf_counter()
+        frame = pd.concat(pd.read_excel(path) for path in files)
+        matches = frame[frame["doi"] == doi]
+        baseline = {"xlsx_files": len(files), "pandas_doi_lookup_ms": round((time.perf_counter() - start) * 1000, 1), "matches": len(matches)}
+
+    database.close()
+    db_bytes = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory) if name.startswith("publicaciones.sqlite"))
+    print(json.dumps({
+        "runs": args.runs,
+        "researchers": args.researchers,
+        "rows_per_run_last": last_run["records"],
+        "rows_loaded": total_rows,
+        "upsert_rows_per_s": round(total_rows / sum(loads)),
+        "first_run_s": round(loads[0], 3),
+        "db_mb": round(db_bytes / 1e6, 2),
+        "query_median_ms": queries,
+        "baseline": baseline,
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark del guardado de resultados: DataFrame + to_excel vs escritor en streaming.
+
+Cada modo se ejecuta en un subproceso independiente para que el pico de
+memoria (RSS) de uno no contamine al otro.
+
+Uso:
+    python benchmarks/bench_writer.py --rows 100000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def synthetic_records(rows: int):
+    """Genera registros con la forma de ``_create_work_record``."""
+    for i in range(rows):
+        researcher = i // 50
+        yield {
+            "cedula": 10000000 + researcher,
+            "nombre_profesor": f"Investigador {researcher}",
+            "orcid_profesor": f"0000-0002-{researcher:04d}-0000",
+            "title": f"Publicación número {i} sobre un tema de investigación\x07",
+            "journal": f"Revista {i % 300}",
+            "date": f"{2000 + i % 25}-{1 + i % 12:02d}",
+            "doi": f"10.1000/xyz{i}",
+            "source": "ORCID",
+            "note": "",
+            "url_source": f"https://doi.org/10.1000/xyz{i}",
+        }
+
+
+def run_mode(mode: str, rows: int) -> dict:
+    from rich.console import Console
+
+    from orcid.app import save_results
+    from orcid.writers import StreamingXlsxWriter
+
+    console = Console(file=open(os.devnull, "w"))
+    output_file = os.path.join(tempfile.mkdtemp(), "bench.xlsx")
+
+    start = time.perf_counter()
+    if mode == "dataframe":
+        save_results(list(synthetic_records(rows)), output_file, console)
+    else:
+        writer = StreamingXlsxWriter(output_file)
+        for record in synthetic_records(rows):
+            writer.write(record)
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return {"mode": mode, "rows": rows, "seconds": round(elapsed, 3), "peak_rss_mb": round(peak_mb, 1), "file_mb": round(os.path.getsize(output_file) / 1e6, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--mode", choices=["dataframe", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.rows)))
+        return
+
+    results = []
+    for mode in ("dataframe", "streaming"):
+        out = subprocess.run([sys.executable, __file__, "--rows", str(args.rows), "--mode", mode], check=True, capture_output=True, text=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
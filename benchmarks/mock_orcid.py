@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Servidor ORCID simulado para pruebas y benchmarks sin tocar la API real.
+
+Sirve ``GET /v3.0/{orcid}/works`` con respuestas sintéticas deterministas
+(la misma respuesta para el mismo ORCID y semilla), el endpoint masivo
+``GET /v3.0/{orcid}/works/{put-codes}`` (hasta 100 por petición), ``POST /oauth/token`` con
+un token ficticio y ``GET /__stats`` con los contadores del servidor. Permite
+configurar la distribución del número de trabajos por perfil, la latencia y su
+jitter, y la inyección de respuestas 429 (con Retry-After) y 5xx. Responde 304
+a las peticiones condicionales con el ETag vigente.
+
+Para apuntar el programa al servidor:
+
+    python benchmarks/mock_orcid.py --port 8089 --latency-ms 80 --rate-429 0.02
+    ORCID_API_BASE_URL=http://127.0.0.1:8089/v3.0 ORCID_TOKEN_URL=http://127.0.0.1:8089/oauth/token python main.py
+
+También puede usarse desde Python (ver bench_e2e.py):
+
+    with MockOrcidServer(works_mean=80) as server:
+        ...  # server.base_url, server.token_url
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+DISTRIBUTIONS = ("fixed", "uniform", "lognormal", "pareto")
+
+# Títulos compartidos entre perfiles: simulan coautorías entre investigadores de la base
+SHARED_TITLES = 500
+
+# Put-codes por petición que admite el endpoint masivo /works/{put-codes}
+BULK_LIMIT = 100
+
+WORK_TYPES = ("journal-article", "conference-paper", "book-chapter", "dissertation-thesis", "report")
+
+WORDS = ("análisis", "modelo", "café", "suelos", "redes", "neuronales", "clima", "cuenca", "agua", "proteínas", "síntesis", "evaluación", "sistema", "datos", "aprendizaje", "rendimiento", "impacto", "región", "control", "salud")
+
+
+class MockOrcidServer:
+    """
+    Servidor HTTP local con la forma de la API pública de ORCID.
+
+    Args:
+        host: Interfaz de escucha
+        port: Puerto (0 = uno libre)
+        works_mean: Trabajos promedio por perfil
+        distribution: Distribución del número de trabajos (fixed, uniform, lognormal, pareto)
+        latency_ms: Latencia base por respuesta
+        jitter_ms: Variación aleatoria (uniforme, +/-) de la latencia
+        rate_429: Probabilidad de responder 429 a una petición /works
+        rate_5xx: Probabilidad de responder 503 a una petición /works
+        retry_after: Segundos enviados en Retry-After con cada 429
+        seed: Semilla de los datos sintéticos
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        works_mean: float = 50,
+        distribution: str = "lognormal",
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        rate_429: float = 0,
+        rate_5xx: float = 0,
+        retry_after: float = 1,
+        seed: int = 42,
+    ):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribución no soportada: {distribution}. Opciones: {', '.join(DISTRIBUTIONS)}")
+
+        self.works_mean = works_mean
+        self.distribution = distribution
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.seed = seed
+        self.stats = {"works": 0, "not_modified": 0, "throttled": 0, "errors": 0, "tokens": 0, "bytes": 0, "bulk": 0, "bulk_works": 0}
+        self._stats_lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}/v3.0"
+
+    @property
+    def token_url(self) -> str:
+        return f"{self.url}/oauth/token"
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _chance(self, probability: float) -> bool:
+        if probability <= 0:
+            return False
+        with self._random_lock:
+            return self._random.random() < probability
+
+    def _delay(self) -> None:
+        if self.latency_ms <= 0 and self.jitter_ms <= 0:
+            return
+        with self._random_lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(self.latency_ms + jitter, 0) / 1000)
+
+    def work_count(self, rng: random.Random) -> int:
+        """Número de trabajos de un perfil según la distribución configurada."""
+        mean = self.works_mean
+        if self.distribution == "fixed":
+            return int(mean)
+        if self.distribution == "uniform":
+            return rng.randint(0, int(2 * mean))
+        if self.distribution == "pareto":
+            # alpha = 2: media = 2 * xm, cola larga de perfiles muy productivos
+            return int(rng.paretovariate(2.0) * mean / 2)
+        # lognormal con sigma = 1: media = exp(mu + 1/2)
+        return int(rng.lognormvariate(math.log(max(mean, 1)) - 0.5, 1.0))
+
+    def payload(self, orcid: str) -> Tuple[bytes, str]:
+        """Respuesta /works determinista para un ORCID y su ETag."""
+        return _build_payload(self, orcid)
+
+    def bulk_payload(self, orcid: str, put_codes: list) -> bytes:
+        """Respuesta de /works/{put-codes}: trabajos completos deterministas (o un error por put-code desconocido)."""
+        summaries = _summaries_by_put_code(self, orcid)
+        bulk = []
+        for put_code in put_codes:
+            summary = summaries.get(put_code)
+            if summary is None:
+                bulk.append({"error": {"response-code": 404, "developer-message": f"Put-code {put_code} no encontrado"}})
+                continue
+            rng = random.Random(self.seed ^ zlib.crc32(f"{orcid}/{put_code}".encode()))
+            authors = [f"Autor {rng.randrange(1000)}" for _ in range(rng.randint(1, 6))]
+            work = dict(summary)
+            work.update({
+                "type": rng.choice(WORK_TYPES),
+                "contributors": {"contributor": [{"credit-name": {"value": name}, "contributor-attributes": {"contributor-sequence": "first" if i == 0 else "additional", "contributor-role": "author"}} for i, name in enumerate(authors)]},
+                "citation": {"citation-type": "bibtex", "citation-value": f"@article{{w{put_code},\n  title={{{summary['title']['title']['value']}}},\n  author={{{' and '.join(authors)}}}\n}}"},
+            })
+            bulk.append({"work": work})
+        return json.dumps({"bulk": bulk}, ensure_ascii=False).encode("utf-8")
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                if self.path.rstrip("/") != "/oauth/token":
+                    self._send(404)
+                    return
+                server._count("tokens")
+                body = json.dumps({"access_token": "mock-token", "token_type": "bearer", "expires_in": 631138518, "scope": "/read-public"}).encode()
+                self._send(200, body, {"Content-Type": "application/json"})
+
+            def do_GET(self):
+                if self.path == "/__stats":
+                    with server._stats_lock:
+                        body = json.dumps(server.stats).encode()
+                    self._send(200, body, {"Content-Type": "application/json"})
+                    return
+
+                parts = self.path.strip("/").split("/")
+                if len(parts) not in (3, 4) or parts[0] != "v3.0" or parts[2] != "works":
+                    self._send(404)
+                    return
+
+                server._delay()
+                if server._chance(server.rate_429):
+                    server._count("throttled")
+                    self._send(429, b"", {"Retry-After": f"{server.retry_after:g}"})
+                    return
+                if server._chance(server.rate_5xx):
+                    server._count("errors")
+                    self._send(503)
+                    return
+
+                if len(parts) == 4:
+                    put_codes = parts[3].split(",")
+                    if len(put_codes) > BULK_LIMIT:
+                        self._send(400, json.dumps({"developer-message": f"Máximo {BULK_LIMIT} put-codes por petición"}).encode(), {"Content-Type": "application/json"})
+                        return
+                    body = server.bulk_payload(parts[1], put_codes)
+                    server._count("bulk")
+                    server._count("bulk_works", len(put_codes))
+                    server._count("bytes", len(body))
+                    self._send(200, body, {"Content-Type": "application/json"})
+                    return
+
+                body, etag = server.payload(parts[1])
+                if self.headers.get("If-None-Match") == etag:
+                    server._count("not_modified")
+                    self._send(304, b"", {"ETag": etag})
+                    return
+
+                server._count("works")
+                server._count("bytes", len(body))
+                self._send(200, body, {"Content-Type": "application/json", "ETag": etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+        return Handler
+
+    def start(self) -> "MockOrcidServer":
+        """Atiende peticiones en un hilo de fondo."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-orcid", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Detiene el servidor."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockOrcidServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+@lru_cache(maxsize=4096)
+def _build_payload(server: MockOrcidServer, orcid: str) -> Tuple[bytes, str]:
+    rng = random.Random(server.seed ^ zlib.crc32(orcid.encode()))
+    groups = []
+    for i in range(server.work_count(rng)):
+        if rng.random() < 0.2:
+            shared = rng.randrange(SHARED_TITLES)
+            title = "Estudio compartido " + " ".join(random.Random(shared).choices(WORDS, k=6)) + f" {shared}"
+            doi = f"10.5555/shared.{shared}"
+        else:
+            title = " ".join(rng.choices(WORDS, k=8)).capitalize() + f" ({orcid[-4:]}-{i})"
+            doi = f"10.5555/{orcid}.{i}"
+        if rng.random() < 0.05:
+            title += "\x0b"  # Carácter de control ilegal en Excel, como llegan algunos títulos reales
+
+        date = {"year": {"value": str(rng.randint(1995, 2025))}}
+        if rng.random() < 0.7:
+            date["month"] = {"value": f"{rng.randint(1, 12):02d}"}
+            if rng.random() < 0.6:
+                date["day"] = {"value": f"{rng.randint(1, 28):02d}"}
+
+        ids = [{"external-id-type": "issn", "external-id-value": f"{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"}]
+        if rng.random() < 0.75:
+            ids.append({"external-id-type": "doi", "external-id-value": doi})
+
+        summary = {
+            "put-code": 100000 + i,
+            "title": {"title": {"value": title}},
+            "journal-title": {"value": f"Revista {rng.randrange(300)}"} if rng.random() < 0.85 else None,
+            "publication-date": date,
+            "url": {"value": f"https://doi.org/{doi}"} if rng.random() < 0.5 else None,
+            "external-ids": {"external-id": ids},
+        }
+        # Algunos trabajos llegan duplicados desde otra fuente dentro del mismo grupo
+        summaries = [summary, dict(summary, **{"put-code": 200000 + i})] if rng.random() < 0.3 else [summary]
+        groups.append({"last-modified-date": {"value": 1700000000000 + i}, "external-ids": {"external-id": ids}, "work-summary": summaries})
+
+    data = {"last-modified-date": {"value": 1700000000000 + len(groups)}, "group": groups, "path": f"/{orcid}/works"}
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    return body, '"' + hashlib.md5(body).hexdigest() + '"'
+
+
+@lru_cache(maxsize=256)
+def _summaries_by_put_code(server: MockOrcidServer, orcid: str) -> Dict[str, Dict]:
+    summaries = {}
+    for group in json.loads(server.payload(orcid)[0])["group"]:
+        for summary in group["work-summary"]:
+            summaries[str(summary["put-code"])] = summary
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--works-mean", type=float, default=50)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--rate-429", type=float, default=0)
+    parser.add_argument("--rate-5xx", type=float, default=0)
+    parser.add_argument("--retry-after", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = MockOrcidServer(args.host, args.port, args.works_mean, args.distribution, args.latency_ms, args.jitter_ms, args.rate_429, args.rate_5xx, args.retry_after, args.seed)
+    print(f"ORCID_API_BASE_URL={server.base_url}")
+    print(f"ORCID_TOKEN_URL={server.token_url}", flush=True)
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,31 +4,78 @@ Script principal para procesamiento de publicaciones académicas.
 
 Este script procesa datos de ORCID para obtener
 información de publicaciones de investigadores.
+
+Comandos:
+    run                 Procesar el listado y generar los archivos (por defecto)
+    merge               Combinar los resultados parciales de una ejecución con --shard
+    validate-input      Validar el listado de investigadores sin conectarse a ORCID
+    check-credentials   Verificar que las credenciales de ORCID permiten obtener un token
+    stats               Mostrar las métricas de la última ejecución
+    query               Consultar el histórico de la base de publicaciones
+    serve               Servicio HTTP local de consultas por investigador
+
+Cada comando importa solo los módulos que necesita (pandas, rich, el cliente
+HTTP, ...) y nada se escribe en disco al importar: el log se abre únicamente
+en run y merge. Así los comandos de verificación responden en una fracción del
+tiempo de una ejecución completa.
 """
 
+import argparse
 import os
 import sys
-from dotenv import load_dotenv
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich import box
+import time
+
+# Comandos disponibles; sin comando se ejecuta "run" (python main.py --workers 8)
+COMMANDS = ("run", "merge", "validate-input", "check-credentials", "stats", "query", "serve")
+DEFAULT_COMMAND = "run"
+
+# Carpeta raíz del proyecto (donde están .env, input.csv y los resultados)
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Variables de entorno necesarias para conectarse a la API
+REQUIRED_VARS = ["ORCID_CLIENT_ID", "ORCID_CLIENT_SECRET"]
+
+
+def get_console():
+    """Rich Console para output (se importa al usarse)."""
+    from rich.console import Console
+
+    return Console()
+
+
+def load_environment(console, warn: bool = True) -> None:
+    """
+    Carga las variables de entorno desde el archivo .env del proyecto.
+
+    Args:
+        console: Rich Console para output
+        warn: Avisar si no existe el archivo .env
+    """
+    from dotenv import load_dotenv
 
-from orcid.app import orcid
+    dotenv_path = os.path.join(ROOT, ".env")
+    if warn and not os.path.exists(dotenv_path):
+        console.print(f"[yellow]⚠ Advertencia:[/] No se encontró el archivo .env en {dotenv_path}")
+        console.print("[dim]Intentando usar variables de entorno del sistema...[/]\n")
 
-# Inicializar Rich Console
-console = Console()
+    load_dotenv(dotenv_path)
 
 
-def verify_environment() -> bool:
+def verify_environment(console) -> bool:
     """
     Verifica que las variables de entorno necesarias estén configuradas.
 
+    Args:
+        console: Rich Console para output
+
     Returns:
         True si todas las variables están configuradas, False en caso contrario
     """
-    required_vars = ["ORCID_CLIENT_ID", "ORCID_CLIENT_SECRET"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    from rich import box
+    from rich.panel import Panel
+    from rich.table import Table
+
+    missing_vars = [var for var in REQUIRED_VARS if not os.getenv(var)]
 
     if missing_vars:
         error_table = Table(show_header=False, box=box.SIMPLE)
@@ -42,46 +89,454 @@ def verify_environment() -> bool:
     return True
 
 
-def main():
+def print_banner(console) -> None:
+    """Banner de bienvenida de los comandos que procesan datos."""
+    from rich.panel import Panel
+
+    console.print(Panel.fit("[bold cyan]Procesamiento de Publicaciones Académicas[/]\n" "[dim]ORCID Data Extractor[/]", border_style="cyan", padding=(1, 2)))
+
+
+def shard_argument(value: str):
     """
-    Función principal del programa.
-    Carga variables de entorno y ejecuta el procesamiento de ORCID.
+    Tipo de argparse para --shard i/N.
+
+    Se interpreta aquí y no en orcid.shard: argparse corre antes de cargar el
+    .env, y importar el paquete fijaría las URL de ORCID del entorno sin él.
+
+    Args:
+        value: Texto ``i/N`` con 1 <= i <= N
+
+    Returns:
+        Tupla (i, N)
     """
-    # Mostrar banner de bienvenida
-    console.print(Panel.fit("[bold cyan]Procesamiento de Publicaciones Académicas[/]\n" "[dim]ORCID Data Extractor[/]", border_style="cyan", padding=(1, 2)))
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Fragmento inválido: {value!r} (formato esperado: i/N, por ejemplo 2/4)") from None
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"Fragmento inválido: {value!r} (i debe estar entre 1 y N)")
+    return index, count
 
-    # Cargar variables de entorno desde archivo .env
-    dotenv_path = os.path.join(os.path.dirname(__file__), ".env")
 
-    if not os.path.exists(dotenv_path):
-        console.print(f"[yellow]⚠ Advertencia:[/] No se encontró el archivo .env en {dotenv_path}")
-        console.print("[dim]Intentando usar variables de entorno del sistema...[/]\n")
+def parse_formats(value: str):
+    """Formatos de salida separados por coma."""
+    return [fmt.strip() for fmt in value.split(",") if fmt.strip()]
 
-    load_dotenv(dotenv_path)
 
-    # Verificar que las variables necesarias estén configuradas
-    if not verify_environment():
-        sys.exit(1)
+def run_command(args: argparse.Namespace) -> int:
+    """
+    Comando run: procesa el listado de investigadores y genera los archivos de salida.
+
+    Args:
+        args: Opciones del comando
+
+    Returns:
+        Código de salida
+    """
+    from rich.panel import Panel
+
+    from orcid.logger import setup_logging
+
+    console = get_console()
+    print_banner(console)
+    load_environment(console)
+    setup_logging()
+
+    # Verificar que las variables necesarias estén configuradas (sin red no se usan)
+    if not args.offline and not args.datafile and not verify_environment(console):
+        return 1
 
     console.print("[green]✓[/] Variables de entorno cargadas correctamente\n")
 
     try:
+        from orcid.app import orcid
+        from orcid.datafile import datafile_paths
+
         # Ejecutar procesamiento de ORCID
         console.rule("[bold blue]Iniciando Procesamiento ORCID[/]", style="blue")
-        orcid(console)
+        orcid(console, workers=args.workers, rate_limit=args.rate_limit, max_retries=args.max_retries, use_cache=not args.no_cache, offline=args.offline, incremental=args.incremental, resume=args.resume, profile=args.profile, details=args.details, datafile=datafile_paths(args.datafile) if args.datafile else None, shard=args.shard, formats=args.formats, pipeline=args.pipeline, parse_processes=args.parse_processes, enrich=args.enrich)
 
         console.rule("[bold green]Procesamiento Completado[/]", style="green")
         console.print(Panel("[bold green]✓ Procesamiento completado exitosamente[/]", border_style="green"))
+        return 0
 
     except KeyboardInterrupt:
         console.print("\n")
-        console.print(Panel("[bold yellow]⚠ Procesamiento interrumpido por el usuario[/]", border_style="yellow"))
-        sys.exit(1)
+        console.print(Panel("[bold yellow]⚠ Procesamiento interrumpido por el usuario[/]\n[dim]Ejecuta con --resume para continuar desde donde quedó[/]", border_style="yellow"))
+        return 1
 
     except Exception as e:
         console.print("\n")
         console.print(Panel(f"[bold red]❌ Error crítico durante el procesamiento:[/]\n\n{e}", title="Error", border_style="red"))
-        sys.exit(1)
+        return 1
+
+
+def merge_command(args: argparse.Namespace) -> int:
+    """
+    Comando merge: combina los resultados parciales de todos los fragmentos en los archivos finales.
+
+    Combinar fragmentos no requiere credenciales ni red.
+
+    Args:
+        args: Opciones del comando
+
+    Returns:
+        Código de salida
+    """
+    import glob
+
+    from rich.panel import Panel
+
+    from orcid.logger import setup_logging
+
+    console = get_console()
+    print_banner(console)
+    load_environment(console, warn=False)
+    setup_logging()
+
+    partials = [path for pattern in args.partials for path in (sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])]
+    try:
+        from orcid.app import merge
+
+        console.rule("[bold blue]Combinando fragmentos[/]", style="blue")
+        merge(partials, console, args.formats, args.enrich)
+        console.print(Panel("[bold green]✓ Fragmentos combinados exitosamente[/]", border_style="green"))
+        return 0
+    except Exception as e:
+        console.print(Panel(f"[bold red]❌ Error al combinar los fragmentos:[/]\n\n{e}", title="Error", border_style="red"))
+        return 1
+
+
+def validate_input_command(args: argparse.Namespace) -> int:
+    """
+    Comando validate-input: valida el listado de investigadores sin conectarse a ORCID.
+
+    Muestra cuántas filas son válidas y cuántas se rechazarían por cada motivo;
+    termina con error si el archivo no se puede leer o no tiene ningún ORCID válido.
+
+    Args:
+        args: Opciones del comando
+
+    Returns:
+        Código de salida
+    """
+    from rich import box
+    from rich.table import Table
+
+    from orcid.roster import REASON_CHECKSUM, REASON_DUPLICATE, REASON_FORMAT, REASON_MISSING, load_roster, resolve_input_file, save_rejects
+
+    console = get_console()
+    load_environment(console, warn=False)
+    input_file = args.input or resolve_input_file(ROOT)
+
+    try:
+        _, rejects, counts = load_roster(input_file)
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]❌ No se pudo leer {input_file}:[/] {e}")
+        return 1
+
+    table = Table(title=f"Validación de {os.path.basename(input_file)}", box=box.SIMPLE, show_header=False)
+    table.add_column("Stat", style="cyan")
+    table.add_column("Value", justify="right", style="bold green")
+    table.add_row("📄 Filas en el archivo", str(counts["total"]))
+    table.add_row("✓ ORCID válidos", str(counts["valid"]))
+    for reason, label in ((REASON_MISSING, "✗ Sin ORCID"), (REASON_FORMAT, "✗ Formato inválido"), (REASON_CHECKSUM, "✗ Dígito de control inválido"), (REASON_DUPLICATE, "⧉ Repetidos")):
+        table.add_row(label, str(counts[reason]), style="yellow" if counts[reason] and reason != REASON_MISSING else None)
+    console.print(table)
+
+    if args.rejects and len(rejects):
+        save_rejects(rejects, args.rejects)
+        console.print(f"[yellow]⚠[/] Filas rechazadas: [bold]{len(rejects)}[/] (detalle en [cyan]{args.rejects}[/])")
+
+    if not counts["valid"]:
+        console.print("[bold red]❌ El archivo no tiene ningún ORCID válido[/]")
+        return 1
+    return 0
+
+
+def check_credentials_command(args: argparse.Namespace) -> int:
+    """
+    Comando check-credentials: obtiene un token de ORCID con las credenciales configuradas.
+
+    Args:
+        args: Opciones del comando
+
+    Returns:
+        Código de salida (0 si se obtuvo el token)
+    """
+    console = get_console()
+    load_environment(console)
+    if not verify_environment(console):
+        return 1
+
+    from orcid.client import OrcidClient
+    from orcid.utils import ORCID_TOKEN_URL, REQUEST_TIMEOUT, get_credentials
+
+    client = OrcidClient(timeout=REQUEST_TIMEOUT, max_retries=args.max_retries)
+    start = time.perf_counter()
+    try:
+        get_credentials(client)
+    except Exception as e:
+        console.print(f"[bold red]❌ No se pudo obtener el token de {ORCID_TOKEN_URL}:[/] {e}")
+        return 1
+    finally:
+        client.close()
+
+    console.print(f"[green]✓[/] Credenciales válidas: token obtenido de [cyan]{ORCID_TOKEN_URL}[/] en {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+def stats_command(args: argparse.Namespace) -> int:
+    """
+    Comando stats: muestra el resumen de la última ejecución a partir de sus métricas.
+
+    Args:
+        args: Opciones del comando
+
+    Returns:
+        Código de salida (1 si no hay métricas o son más antiguas que --max-age)
+    """
+    import json
+
+    from orcid.metrics import latest_metrics, metrics_directory
+
+    console = get_console()
+    load_environment(console, warn=False)
+    path = latest_metrics(metrics_directory(ROOT))
+    if path is None:
+        console.print(f"[yellow]⚠[/] No hay métricas en {metrics_directory(ROOT)}")
+        return 1
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    age_hours = (time.time() - data["started"]) / 3600
+
+    if args.json:
+        print(json.dumps(dict(data, path=path, age_hours=round(age_hours, 2)), indent=2, ensure_ascii=False))
+    else:
+        from rich import box
+        from rich.table import Table
+
+        from utils import get_time
+
+        summary = data.get("summary") or {}
+        requests = data.get("requests") or {}
+        table = Table(title=f"📊 Última ejecución ({os.path.basename(path)})", box=box.ROUNDED, show_header=False)
+        table.add_column("Métrica", style="cyan", no_wrap=True)
+        table.add_column("Valor", justify="right", style="bold green")
+        table.add_row("🕒 Inicio", time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(data["started"])) + f" (hace {age_hours:.1f} h)")
+        table.add_row("⏱️  Duración", get_time(data["elapsed_s"]))
+        if summary:
+            table.add_row("✓ Completa", "sí" if summary.get("complete") else "no", style=None if summary.get("complete") else "bold yellow")
+            table.add_row("👥 Usuarios procesados", f"{summary.get('index', 0)}/{summary.get('total_users', 0)}")
+            table.add_row("📄 Registros obtenidos", str(summary.get("processed_records", 0)))
+            table.add_row("❌ Errores", str(summary.get("errors", 0)), style="bold yellow" if summary.get("errors") else None)
+        if requests.get("count"):
+            table.add_row("🌐 Peticiones HTTP", str(requests["count"]))
+            table.add_row("📶 Latencia p50 / p95", f"{requests['latency_p50_s'] * 1000:.0f} / {requests['latency_p95_s'] * 1000:.0f} ms")
+        console.print(table)
+
+    if args.max_age is not None and age_hours > args.max_age:
+        console.print(f"[bold yellow]⚠ La última ejecución tiene {age_hours:.1f} h (máximo {args.max_age:g} h)[/]")
+        return 1
+    return 0
+
+
+def query_command(args: argparse.Namespace) -> int:
+    """
+    Comando query: consulta el histórico de publicaciones en la base local (ORCID_DB_FILE).
+
+    Args:
+        args: Opciones del comando
+
+    Returns:
+        Código de salida (1 si la base no existe)
+    """
+    import json
+
+    from orcid.database import PublicationDatabase, database_path
+
+    console = get_console()
+    load_environment(console, warn=False)
+    path = database_path(ROOT)
+    if not os.path.exists(path):
+        console.print(f"[yellow]⚠[/] No existe la base de publicaciones {path}: se crea con la primera ejecución")
+        return 1
+
+    database = PublicationDatabase(path)
+    try:
+        start = time.perf_counter()
+        if args.doi:
+            title, rows = f"DOI {args.doi}", database.works_by_doi(args.doi)
+        elif args.orcid:
+            title, rows = f"Publicaciones de {args.orcid}", database.works_by_orcid(args.orcid)
+        elif args.added_since:
+            title, rows = f"Investigadores con publicaciones nuevas desde {args.added_since}", database.added_since(args.added_since)
+        elif args.by_year:
+            title, rows = "Publicaciones por año", database.count_by_year()
+        else:
+            title, rows = "Ejecuciones registradas", database.runs()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        database.close()
+
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return 0
+
+    from rich import box
+    from rich.table import Table
+
+    table = Table(title=f"🗄️  {title}", caption=f"{len(rows)} filas en {elapsed_ms:.1f} ms", box=box.ROUNDED)
+    for column in rows[0] if rows else ():
+        table.add_column(column, overflow="fold")
+    for row in rows:
+        table.add_row(*("" if value is None else str(value) for value in row.values()))
+    console.print(table)
+    return 0
+
+
+def serve_command(args: argparse.Namespace) -> int:
+    """
+    Comando serve: atiende consultas de publicaciones por investigador hasta que se interrumpa.
+
+    Args:
+        args: Opciones del comando
+
+    Returns:
+        Código de salida
+    """
+    from orcid.cache import build_cache
+    from orcid.client import DEFAULT_MAX_RETRIES
+    from orcid.logger import setup_logging
+    from orcid.service import LookupServer, create_service
+    from orcid.utils import ORCID_RATE_LIMIT
+
+    console = get_console()
+    print_banner(console)
+    load_environment(console)
+    setup_logging()
+    if not verify_environment(console):
+        return 1
+
+    rate_limit = args.rate_limit if args.rate_limit is not None else float(os.getenv("ORCID_RATE_LIMIT", ORCID_RATE_LIMIT))
+    max_retries = args.max_retries if args.max_retries is not None else int(os.getenv("ORCID_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+    try:
+        service = create_service(args.workers, rate_limit, max_retries, args.cache_size, args.cache_ttl, None if args.no_cache else build_cache(ROOT), args.details)
+    except Exception as e:
+        console.print(f"[red]✗[/] No se pudo iniciar el servicio: {e}")
+        return 1
+
+    server = LookupServer(service, args.host, args.port)
+    console.print(f"[green]✓[/] Servicio escuchando en [cyan]{server.url}[/] ({args.workers} workers, {rate_limit:g} peticiones/s, caché de {args.cache_size} perfiles por {args.cache_ttl:g} s)")
+    console.print(f"[dim]  GET {server.url}/researchers/0000-0002-1825-0097/works · POST {server.url}/researchers/works · GET {server.url}/stats[/]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]⚠[/] Servicio detenido")
+    finally:
+        server.stop()
+        service.close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Opciones de línea de comandos de cada comando.
+
+    Returns:
+        Parser con un subcomando por cada entrada de COMMANDS
+    """
+    parser = argparse.ArgumentParser(description="Extractor de publicaciones académicas desde ORCID")
+    commands = parser.add_subparsers(dest="command", metavar="COMANDO")
+
+    run = commands.add_parser("run", help="Procesar el listado y generar los archivos (comando por defecto)")
+    run.add_argument("--workers", type=int, default=None, help="Hilos de descarga concurrentes (por defecto ORCID_WORKERS o 1)")
+    run.add_argument("--rate-limit", type=float, default=None, help="Peticiones por segundo a la API (por defecto ORCID_RATE_LIMIT o 24)")
+    run.add_argument("--max-retries", type=int, default=None, help="Reintentos por petición ante 429, 5xx o errores de red (por defecto ORCID_MAX_RETRIES o 5)")
+    run.add_argument("--no-cache", action="store_true", help="No usar la caché en disco de respuestas /works")
+    run.add_argument("--offline", action="store_true", help="Generar el archivo solo con datos en caché, sin conectarse a ORCID")
+    run.add_argument("--formats", type=parse_formats, default=["xlsx"], help="Formatos de salida separados por coma: xlsx, parquet, arrow, jsonl, sqlite (por defecto xlsx)")
+    run.add_argument("--resume", action="store_true", help="Continuar una ejecución interrumpida sin volver a descargar los investigadores ya completados")
+    run.add_argument("--profile", action="store_true", help="Perfilar el procesamiento con cProfile (archivo .prof en la carpeta metrics/)")
+    run.add_argument("--details", action="store_true", help="Agregar tipo de trabajo, contribuidores y cita de cada publicación (una petición extra por cada 100 trabajos)")
+    run.add_argument("--datafile", default=None, help="Leer los trabajos del archivo de datos públicos de ORCID (tar.gz de resúmenes, separados por coma o una carpeta) en lugar de la API")
+    run.add_argument("--shard", type=shard_argument, default=None, metavar="i/N", help="Procesar solo el fragmento i de N del listado (reparto por ORCID); genera un resultado parcial para merge")
+    run.add_argument("--pipeline", action="store_true", help="Descargar, parsear y escribir en etapas concurrentes con colas acotadas; informa la utilización de cada etapa")
+    run.add_argument("--parse-processes", type=int, default=0, metavar="N", help="Con --pipeline, parsear las respuestas en N procesos (por defecto 0: un hilo)")
+    run.add_argument("--enrich", default=None, metavar="PROVEEDOR", help="Completar revista, fecha y DOI vacíos consultando los DOI en un proveedor de metadatos: crossref o stub (local, sin red)")
+    run.add_argument("--incremental", action="store_true", help="Reutilizar perfiles sin cambios y generar un archivo delta con las publicaciones agregadas/eliminadas")
+    run.set_defaults(handler=run_command)
+
+    merge = commands.add_parser("merge", help="Combinar los resultados parciales (.jsonl) de todos los fragmentos en los archivos finales")
+    merge.add_argument("partials", nargs="+", metavar="PARCIAL", help="Resultados parciales de cada fragmento (se admiten comodines)")
+    merge.add_argument("--formats", type=parse_formats, default=["xlsx"], help="Formatos de salida separados por coma (por defecto xlsx)")
+    merge.add_argument("--enrich", default=None, metavar="PROVEEDOR", help="Completar revista, fecha y DOI vacíos con un proveedor de metadatos (crossref o stub)")
+    merge.set_defaults(handler=merge_command)
+
+    validate = commands.add_parser("validate-input", help="Validar el listado de investigadores sin conectarse a ORCID")
+    validate.add_argument("--input", default=None, help="Archivo CSV o XLSX (por defecto ORCID_INPUT_FILE, input.csv o input.xlsx)")
+    validate.add_argument("--rejects", default=None, metavar="CSV", help="Guardar las filas rechazadas y su motivo en este CSV")
+    validate.set_defaults(handler=validate_input_command)
+
+    credentials = commands.add_parser("check-credentials", help="Verificar que ORCID_CLIENT_ID y ORCID_CLIENT_SECRET permiten obtener un token")
+    credentials.add_argument("--max-retries", type=int, default=0, help="Reintentos de la petición del token ante 429, 5xx o errores de red, con espera exponencial (por defecto 0)")
+    credentials.set_defaults(handler=check_credentials_command)
+
+    stats = commands.add_parser("stats", help="Mostrar las métricas de la última ejecución (ORCID_METRICS_DIR)")
+    stats.add_argument("--json", action="store_true", help="Imprimir el JSON completo de métricas")
+    stats.add_argument("--max-age", type=float, default=None, metavar="HORAS", help="Terminar con error si la última ejecución es más antigua")
+    stats.set_defaults(handler=stats_command)
+
+    query = commands.add_parser("query", help="Consultar el histórico de la base de publicaciones (ORCID_DB_FILE); sin opciones lista las ejecuciones")
+    search = query.add_mutually_exclusive_group()
+    search.add_argument("--doi", default=None, help="Investigadores con una publicación con este DOI")
+    search.add_argument("--orcid", default=None, help="Publicaciones de un investigador en todo el histórico")
+    search.add_argument("--added-since", default=None, metavar="YYYY-MM-DD", help="Investigadores con publicaciones que aparecieron por primera vez desde esa fecha")
+    search.add_argument("--by-year", action="store_true", help="Publicaciones distintas por año de publicación")
+    query.add_argument("--json", action="store_true", help="Imprimir el resultado como JSON")
+    query.set_defaults(handler=query_command)
+
+    serve = commands.add_parser("serve", help="Servicio HTTP local: GET /researchers/{orcid}/works y POST /researchers/works con una lista de ORCID")
+    serve.add_argument("--host", default="127.0.0.1", help="Interfaz de escucha (por defecto 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8080, help="Puerto (por defecto 8080)")
+    serve.add_argument("--workers", type=int, default=8, help="Conexiones simultáneas a ORCID e hilos de las consultas masivas (por defecto 8)")
+    serve.add_argument("--rate-limit", type=float, default=None, help="Peticiones por segundo a la API, compartidas por todas las consultas (por defecto ORCID_RATE_LIMIT o 24)")
+    serve.add_argument("--max-retries", type=int, default=None, help="Reintentos por petición ante 429, 5xx o errores de red (por defecto ORCID_MAX_RETRIES o 5)")
+    serve.add_argument("--cache-size", type=int, default=1024, help="Perfiles guardados en memoria (0 = sin caché; por defecto 1024)")
+    serve.add_argument("--cache-ttl", type=float, default=3600, metavar="SEGUNDOS", help="Tiempo que un perfil se sirve desde memoria sin consultar ORCID (por defecto 3600)")
+    serve.add_argument("--no-cache", action="store_true", help="No usar la caché en disco de respuestas /works")
+    serve.add_argument("--details", action="store_true", help="Agregar tipo de trabajo, contribuidores y cita de cada publicación")
+    serve.set_defaults(handler=serve_command)
+    return parser
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Lee el comando y sus opciones.
+
+    Sin comando se asume ``run``, de modo que ``python main.py --workers 8``
+    sigue funcionando como antes.
+
+    Args:
+        argv: Argumentos (por defecto sys.argv[1:])
+
+    Returns:
+        Namespace con el comando (handler) y sus opciones
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv.insert(0, DEFAULT_COMMAND)
+    return build_parser().parse_args(argv)
+
+
+def main():
+    """
+    Función principal del programa.
+    Ejecuta el comando indicado y termina con su código de salida.
+    """
+    args = parse_args()
+    sys.exit(args.handler(args))
 
 
 if __name__ == "__main__":
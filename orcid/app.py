@@ -1,7 +1,13 @@
+import cProfile
+import io
 import os
-import re
+import pstats
 import traceback
-from typing import List, Dict, Set, Tuple, Optional
+from collections import deque
+from contextlib import nullcontext
+from itertools import chain
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Set, Tuple, Optional, Iterator, Deque
 from datetime import datetime
 
 import pandas as pd
@@ -11,39 +17,109 @@ from rich.table import Table
 from rich.panel import Panel
 from rich import box
 
-from orcid.utils import get_credentials, get_records, logging
+from orcid.cache import WorksCache, build_cache
+from orcid.checkpoint import CheckpointJournal
+from orcid.client import DEFAULT_MAX_RETRIES, OrcidClient
+from orcid.database import PublicationDatabase, database_path
+from orcid.datafile import iter_datafile
+from orcid.dedup import PublicationIndex, dedupe_records
+from orcid.enrich import DoiEnricher, EnrichingWriter, build_enricher
+from orcid.incremental import IncrementalStore
+from orcid.metrics import DISABLED, Metrics, metrics_directory
+from orcid.pipeline import Pipeline
+from orcid.records import DETAIL_COLUMNS, OUTPUT_COLUMNS, RECORD_COLUMNS, Researcher
+from orcid.shard import assign_shards, merge_partials, shard_name, stats_path, validate_partials
+from orcid.roster import REASON_CHECKSUM, REASON_DUPLICATE, REASON_FORMAT, REASON_MISSING, load_roster, resolve_input_file, save_rejects
+from orcid.schema import apply_schema, typed_columns
+from orcid.utils import DEFAULT_WORKERS, ILLEGAL_CHARACTERS_PATTERN, ORCID_RATE_LIMIT, REQUEST_TIMEOUT, clean_illegal_characters, _create_error_record, _create_work_record, get_credentials, get_records, logging
+from orcid.writers import MultiWriter, ResultWriter, create_writer
+from utils import get_time
 
+# Líneas del perfil de cProfile que se escriben en el log (ordenadas por tiempo acumulado)
+PROFILE_TOP = 25
 
-def load_valid_users(input_file: str, console: Console) -> pd.DataFrame:
+
+def clean_illegal_series(series: pd.Series) -> pd.Series:
+    """
+    Versión vectorizada de ``clean_illegal_characters`` para una columna completa.
+
+    Las columnas de texto (dtype ``str``/``string``) se limpian con una sola
+    operación ``str.replace`` sobre toda la serie; las columnas ``object`` pueden
+    mezclar números y textos, así que se recorren con el patrón ya compilado.
+
+    Args:
+        series: Columna a limpiar
+
+    Returns:
+        Serie sin caracteres ilegales
+    """
+    if isinstance(series.dtype, pd.StringDtype):
+        return series.str.replace(ILLEGAL_CHARACTERS_PATTERN, "", regex=True)
+    if pd.api.types.is_object_dtype(series):
+        return series.map(clean_illegal_characters)
+    return series
+
+
+def write_excel(df: pd.DataFrame, output_file: str) -> None:
+    """
+    Guarda un DataFrame en XLSX; date_normalized queda como fecha de Excel (sin hora).
+
+    Args:
+        df: Datos a guardar
+        output_file: Ruta del archivo de salida
+    """
+    with pd.ExcelWriter(output_file, engine="openpyxl", date_format="YYYY-MM-DD", datetime_format="YYYY-MM-DD") as excel:
+        df.to_excel(excel, index=False)
+
+
+def load_valid_users(input_file: str, console: Console, metrics: Metrics = DISABLED, rejects_file: Optional[str] = None) -> pd.DataFrame:
     """
     Carga y filtra usuarios con ORCID válido de forma eficiente.
 
+    Los ORCID se normalizan (URLs, guiones, dígito de control en minúscula),
+    se valida su dígito de control y los investigadores repetidos se descartan
+    antes de hacer cualquier petición a la API.
+
     Args:
-        input_file: Ruta al archivo CSV de entrada
+        input_file: Ruta al archivo CSV o XLSX de entrada
         console: Rich Console para output
+        metrics: Métricas de la ejecución; mide las fases load y sanitize (opcional)
+        rejects_file: Ruta del CSV donde reportar las filas rechazadas (opcional)
 
     Returns:
         DataFrame con usuarios que tienen ORCID válido
     """
     try:
-        with console.status("[bold blue]Cargando usuarios del archivo CSV...", spinner="dots"):
-            # Leer solo las columnas necesarias
-            data = pd.read_csv(input_file, usecols=["orcid", "nombre", "cedula"])
+        with console.status("[bold blue]Cargando usuarios del archivo de entrada...", spinner="dots"):
+            with metrics.phase("load"):
+                # Lectura por bloques con normalización, validación y deduplicación vectorizadas
+                valid_users, rejects, counts = load_roster(input_file)
 
-            # Filtrar usuarios con ORCID válido usando pandas (más eficiente)
-            valid_users = data[data["orcid"].notna() & (data["orcid"] != "-") & (data["orcid"].astype(str) != "nan")].copy()  # No es NaN  # No es guión  # No es string "nan"
+            # Limpiar una sola vez los datos del investigador que se copian a cada registro
+            with metrics.phase("sanitize"):
+                for col in valid_users.columns:
+                    valid_users[col] = clean_illegal_series(valid_users[col])
 
         # Crear tabla de resumen
         summary_table = Table(show_header=False, box=box.SIMPLE)
         summary_table.add_column("Stat", style="cyan")
         summary_table.add_column("Value", style="bold green")
-        summary_table.add_row("📄 Total usuarios en archivo", str(len(data)))
-        summary_table.add_row("✓ Usuarios con ORCID válido", str(len(valid_users)))
-        summary_table.add_row("✗ Usuarios sin ORCID", str(len(data) - len(valid_users)))
+        summary_table.add_row("📄 Total usuarios en archivo", str(counts["total"]))
+        summary_table.add_row("✓ Usuarios con ORCID válido", str(counts["valid"]))
+        summary_table.add_row("✗ Usuarios sin ORCID", str(counts[REASON_MISSING]))
+        for reason, label in ((REASON_FORMAT, "✗ ORCID con formato inválido"), (REASON_CHECKSUM, "✗ ORCID con dígito de control inválido"), (REASON_DUPLICATE, "⧉ ORCID repetidos (omitidos)")):
+            if counts[reason]:
+                summary_table.add_row(label, str(counts[reason]))
 
         console.print(Panel(summary_table, title="[bold]Resumen de Carga[/]", border_style="blue"))
 
-        logging.info(f"Usuarios cargados: {len(data)}, con ORCID válido: {len(valid_users)}")
+        logging.info(f"Usuarios cargados: {counts['total']}, con ORCID válido: {counts['valid']}, rechazos: {len(rejects)}")
+
+        # Las filas sin ORCID ("-") son esperables: el archivo solo se genera si hay otros rechazos
+        if rejects_file and (rejects["motivo"] != REASON_MISSING).any():
+            save_rejects(rejects, rejects_file)
+            logging.info(f"Filas rechazadas guardadas en: {rejects_file}")
+            console.print(f"[yellow]⚠[/] Filas rechazadas: [bold]{len(rejects)}[/] (detalle en [cyan]{rejects_file}[/])\n")
 
         return valid_users
 
@@ -53,7 +129,7 @@ def load_valid_users(input_file: str, console: Console) -> pd.DataFrame:
         logging.error(f"{error_msg}")
         logging.error(f"Traceback:\n{tb_str}")
         console.print(f"\n[bold red]❌ {error_msg}[/]")
-        console.print(f"[yellow]Asegúrate de que el archivo input.csv existe en la carpeta del proyecto[/]")
+        console.print(f"[yellow]Asegúrate de que el archivo input.csv (o input.xlsx) existe en la carpeta del proyecto[/]")
         raise
     except pd.errors.EmptyDataError as e:
         tb_str = traceback.format_exc()
@@ -61,7 +137,7 @@ def load_valid_users(input_file: str, console: Console) -> pd.DataFrame:
         logging.error(f"{error_msg}")
         logging.error(f"Traceback:\n{tb_str}")
         console.print(f"\n[bold red]❌ {error_msg}[/]")
-        console.print(f"[yellow]El archivo input.csv no contiene datos[/]")
+        console.print(f"[yellow]El archivo de entrada no contiene datos[/]")
         raise
     except Exception as e:
         tb_str = traceback.format_exc()
@@ -75,7 +151,152 @@ def load_valid_users(input_file: str, console: Console) -> pd.DataFrame:
         raise
 
 
-def process_users(users_df: pd.DataFrame, credentials: str, console: Console) -> Tuple[List[Dict], Dict]:
+def _fetch_user_records(user: Dict, credentials: str, console: Console, fetch_options: Dict) -> List[Dict]:
+    """
+    Obtiene los registros de un único usuario (unidad de trabajo de cada worker).
+
+    Args:
+        user: Diccionario con datos del usuario
+        credentials: Token de acceso ORCID
+        console: Rich Console para output
+        fetch_options: Argumentos adicionales para get_records (client, cache, offline, store)
+
+    Returns:
+        Lista de registros del usuario
+    """
+    user_records: List[Dict] = []
+    get_records(user, credentials, user_records, console, **fetch_options)
+    return user_records
+
+
+def _iter_user_results(users: Iterator[Dict], credentials: str, console: Console, workers: int, fetch_options: Dict) -> Iterator[Tuple[Dict, Optional[List[Dict]], Optional[Exception]]]:
+    """
+    Genera los resultados por usuario en el mismo orden del archivo de entrada.
+
+    En modo concurrente se mantiene una ventana acotada de peticiones en vuelo
+    y los resultados se entregan en orden de envío, de modo que la deduplicación
+    y los contadores son idénticos a los del modo secuencial.
+
+    Args:
+        users: Iterador de diccionarios de usuario
+        credentials: Token de acceso ORCID
+        console: Rich Console para output
+        workers: Número de hilos de descarga
+        fetch_options: Argumentos adicionales para get_records
+
+    Yields:
+        Tuplas (usuario, registros, excepción); registros es None si hubo excepción
+    """
+    if workers <= 1:
+        for user in users:
+            try:
+                yield user, _fetch_user_records(user, credentials, console, fetch_options), None
+            except Exception as e:
+                yield user, None, e
+        return
+
+    window = workers * 4
+    pending: Deque[Tuple[Dict, Future]] = deque()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="orcid") as executor:
+        try:
+            for user in users:
+                pending.append((user, executor.submit(_fetch_user_records, user, credentials, console, fetch_options)))
+                if len(pending) >= window:
+                    yield _resolve(*pending.popleft())
+
+            while pending:
+                yield _resolve(*pending.popleft())
+        finally:
+            # Ante una interrupción, no iniciar las descargas que aún no empezaron
+            for _, future in pending:
+                future.cancel()
+
+
+def _iter_datafile_results(users: Iterator[Dict], paths: List[str], console: Console, workers: int, metrics: Metrics) -> Iterator[Tuple[Dict, Optional[List[Dict]], Optional[Exception]]]:
+    """
+    Genera los resultados por usuario a partir del archivo de datos públicos de ORCID, sin red.
+
+    Los investigadores se entregan en el orden en que aparecen en el archivo
+    de datos (no en el del archivo de entrada); los que no aparecen se
+    entregan al final con un registro de error.
+
+    Args:
+        users: Iterador de diccionarios de usuario
+        paths: Archivos tar.gz de resúmenes de registros
+        console: Rich Console para output
+        workers: Procesos de parseo XML
+        metrics: Métricas de la ejecución; la lectura del archivo se mide como fetch
+
+    Yields:
+        Tuplas (usuario, registros, None), igual que _iter_user_results
+    """
+    pending_users = {str(user["orcid"]): user for user in users}
+    results = iter_datafile(paths, list(pending_users), workers)
+
+    while True:
+        with metrics.phase("fetch"):
+            result = next(results, None)
+        if result is None:
+            break
+
+        orcid, _, groups, error = result
+        user = pending_users.pop(orcid)
+        researcher = Researcher.from_user(user)
+        if error:
+            logging.error(f"ORCID {orcid}: {error}")
+            yield user, [_create_error_record(researcher, f"ERROR: {error}")], None
+            continue
+
+        console.print(f"  [dim]→ {user['nombre']} ([cyan]{orcid}[/]): [green]{len(groups)}[/] trabajos[/]")
+        logging.info(f"ORCID {orcid}: {len(groups)} trabajos encontrados en el archivo de datos")
+        with metrics.phase("parse"):
+            user_records = [_create_work_record(researcher, work_summary) for work_summary in groups if work_summary]
+        if not groups:
+            user_records.append(_create_error_record(researcher, "NO WORKS FOUND"))
+        yield user, user_records, None
+
+    for orcid, user in pending_users.items():
+        logging.warning(f"ORCID {orcid} no está en el archivo de datos")
+        yield user, [_create_error_record(user, "ERROR: ORCID no encontrado en el archivo de datos")], None
+
+
+def _resolve(user: Dict, future: Future) -> Tuple[Dict, Optional[List[Dict]], Optional[Exception]]:
+    """
+    Espera el resultado de un future y lo traduce a la tupla de resultado.
+
+    Args:
+        user: Diccionario con datos del usuario
+        future: Future devuelto por el executor
+
+    Returns:
+        Tupla (usuario, registros, excepción)
+    """
+    try:
+        return user, future.result(), None
+    except Exception as e:
+        return user, None, e
+
+
+def process_users(
+    users_df: pd.DataFrame,
+    credentials: str,
+    console: Console,
+    workers: int = DEFAULT_WORKERS,
+    rate_limit: float = ORCID_RATE_LIMIT,
+    client: Optional[OrcidClient] = None,
+    cache: Optional[WorksCache] = None,
+    offline: bool = False,
+    store: Optional[IncrementalStore] = None,
+    journal: Optional[CheckpointJournal] = None,
+    writer: Optional[ResultWriter] = None,
+    publications: Optional[PublicationIndex] = None,
+    metrics: Metrics = DISABLED,
+    datafile: Optional[List[str]] = None,
+    details: bool = False,
+    pipeline: bool = False,
+    parse_processes: int = 0,
+) -> Tuple[List[Dict], Dict]:
     """
     Procesa usuarios y obtiene sus registros ORCID.
 
@@ -83,17 +304,57 @@ def process_users(users_df: pd.DataFrame, credentials: str, console: Console) ->
         users_df: DataFrame con usuarios válidos
         credentials: Token de acceso ORCID
         console: Rich Console para output
+        workers: Número de hilos de descarga concurrentes (1 = secuencial)
+        rate_limit: Peticiones por segundo compartidas por todos los workers
+        client: Cliente HTTP compartido (si no se provee se crea uno con pool = workers)
+        cache: Caché en disco de respuestas /works (opcional)
+        offline: Construir los registros solo desde la caché, sin red
+        store: Estado del modo incremental (opcional)
+        journal: Bitácora de avance; sus entradas se reproducen sin volver a descargar (opcional)
+        writer: Escritor en streaming; si se provee, los registros se escriben a medida que
+            llegan y no se acumulan en memoria (datos_procesados queda vacío)
+        publications: Índice de publicaciones compartido entre investigadores (si no se provee se crea uno)
+        metrics: Métricas de la ejecución; mide fetch, parse, dedup y export (opcional)
+        datafile: Archivos tar.gz del archivo de datos públicos de ORCID; si se proveen,
+            los trabajos se leen de ahí en lugar de la API (opcional)
+        details: Completar cada trabajo con tipo, contribuidores y cita (lotes de 100 put-codes por petición)
+        pipeline: Descargar, parsear y escribir en etapas concurrentes con colas acotadas (ver
+            orcid.pipeline); la utilización de cada etapa queda en resumen_progreso["pipeline"]
+        parse_processes: Procesos de parseo del pipeline (0 = un hilo)
 
     Returns:
         Tupla con (datos_procesados, resumen_progreso)
     """
     output_data = []
-    processed_pairs: Set[Tuple[str, str]] = set()  # Para evitar duplicados durante el procesamiento
+    processed_pairs: Set[Tuple[str, int]] = set()  # Para evitar duplicados durante el procesamiento
+    if publications is None:
+        publications = PublicationIndex()
 
     summary = {"complete": False, "index": 0, "total_users": len(users_df), "processed_records": 0, "errors": 0}
 
+    if client is None:
+        client = OrcidClient(pool_size=workers, rate_limit=rate_limit, timeout=REQUEST_TIMEOUT)
+    fetch_options = {"client": client, "cache": cache, "offline": offline, "store": store, "metrics": metrics, "details": details}
+    # Los lotes de detalle de cada perfil se reparten en un pool propio: los workers esperan sus lotes sin bloquearse entre sí
+    detail_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="orcid-detail") if details and not offline and not datafile else None
+    # index: posición del investigador en el listado completo (se conserva al filtrar un fragmento con --shard)
+    users = iter({"orcid": row["orcid"], "nombre": row["nombre"], "cedula": row["cedula"], "index": index} for index, row in users_df.iterrows())
+
+    def add_records(user_records: List[Dict]) -> None:
+        # Filtrar duplicados basados en orcid_profesor y la publicación (DOI o título normalizado)
+        with metrics.phase("dedup"):
+            new_records = dedupe_records(user_records, publications, processed_pairs)
+
+        if writer:
+            with metrics.phase("export"):
+                for record in new_records:
+                    writer.write(record)
+        else:
+            output_data.extend(new_records)
+        summary["processed_records"] += len(new_records)
+
     # Configurar barra de progreso con columnas personalizadas y compactas
-    with Progress(
+    with detail_executor or nullcontext(), Progress(
         SpinnerColumn(),
         TextColumn("[bold blue]{task.description}"),
         BarColumn(complete_style="green", finished_style="bold green"),
@@ -108,68 +369,88 @@ def process_users(users_df: pd.DataFrame, credentials: str, console: Console) ->
         expand=False,
     ) as progress:
 
+        fetch_options["detail_executor"] = detail_executor
         task = progress.add_task(f"[cyan]Procesando usuarios ORCID...", total=summary["total_users"])
 
-        for idx, row in users_df.iterrows():
-            user = {"orcid": row["orcid"], "nombre": row["nombre"], "cedula": row["cedula"]}
+        # Reanudar: reproducir los investigadores ya completados en la bitácora, en el mismo orden
+        if journal and journal.entries:
+            replayed = 0
+            for entry in journal.entries:
+                user = next(users, None)
+                if user is None or str(user["orcid"]) != entry["orcid"]:
+                    # El archivo de entrada cambió: se descarta el resto de la bitácora
+                    if user is not None:
+                        users = chain([user], users)
+                    break
 
-            try:
-                # Obtener registros del usuario
-                user_records = []
-                get_records(user, credentials, user_records, progress.console)
-
-                # Filtrar duplicados basados en orcid_profesor y title
-                for record in user_records:
-                    key = (record.get("orcid_profesor", ""), record.get("title", ""))
-                    if key not in processed_pairs:
-                        processed_pairs.add(key)
-                        output_data.append(record)
-                        summary["processed_records"] += 1
+                if entry["error"] is None:
+                    add_records(entry["records"])
+                    # Modo incremental: el estado solo se guarda al terminar, así que se reconstruye desde la bitácora
+                    if store is not None:
+                        store.restore(entry["orcid"], entry.get("last_modified"), entry["records"])
+                else:
+                    summary["errors"] += 1
+                summary["index"] += 1
+                replayed += 1
+
+            if replayed < len(journal.entries):
+                logging.warning(f"La bitácora no coincide con el archivo de entrada a partir de la posición {replayed}; se descartan {len(journal.entries) - replayed} entradas")
+                journal.truncate(replayed)
+
+            progress.update(task, advance=replayed)
+            progress.console.print(f"[green]↻[/] Reanudando: [bold]{replayed}[/] investigadores recuperados de la bitácora")
+            logging.info(f"Reanudando desde la bitácora: {replayed} investigadores recuperados")
+
+        runner = None
+        if datafile:
+            results = _iter_datafile_results(users, datafile, progress.console, workers, metrics)
+        elif pipeline:
+            runner = Pipeline(credentials, progress.console, workers, parse_processes, fetch_options=fetch_options)
+            results = runner.run(users)
+        else:
+            results = _iter_user_results(users, credentials, progress.console, workers, fetch_options)
+
+        for user, user_records, error in results:
+            if error is None:
+                add_records(user_records)
+                if journal:
+                    last_modified = store.last_modified(str(user["orcid"])) if store is not None else None
+                    journal.append(str(user["orcid"]), user_records, index=user["index"], last_modified=last_modified)
 
                 summary["index"] += 1
                 progress.update(task, advance=1)
 
-            except Exception as e:
+            else:
                 summary["errors"] += 1
                 # Capturar traceback completo
-                tb_str = traceback.format_exc()
+                tb_str = "".join(traceback.format_exception(type(error), error, error.__traceback__))
                 error_msg = f"Error procesando usuario {user['nombre']} ({user['orcid']})"
                 
                 # Log detallado del error con traceback
-                logging.error(f"{error_msg}: {e}")
+                logging.error(f"{error_msg}: {error}")
                 logging.error(f"Traceback completo:\n{tb_str}")
                 
                 # Mostrar en consola de forma más verbose
                 progress.console.print(f"\n[bold red]❌ {error_msg}[/]")
-                progress.console.print(f"[red]Tipo de error:[/] {type(e).__name__}")
-                progress.console.print(f"[red]Mensaje:[/] {str(e)}")
+                progress.console.print(f"[red]Tipo de error:[/] {type(error).__name__}")
+                progress.console.print(f"[red]Mensaje:[/] {str(error)}")
                 progress.console.print(f"[dim]Ver logs para traceback completo[/]\n")
+
+                if journal:
+                    journal.append(str(user["orcid"]), None, f"{type(error).__name__}: {error}", index=user["index"])
                 
                 summary["index"] += 1
                 progress.update(task, advance=1)
                 continue
 
+    if runner:
+        summary["pipeline"] = runner.stats()
+        logging.info(f"Pipeline: cuello de botella en la etapa {summary['pipeline']['bottleneck']}", extra={"phase": "pipeline", "pipeline": summary["pipeline"]})
+    summary["publications"] = len(publications)
     summary["complete"] = True
     return output_data, summary
 
 
-def clean_illegal_characters(value):
-    """
-    Elimina caracteres ilegales para Excel (caracteres de control ASCII 0-31 y 127).
-    
-    Args:
-        value: Valor a limpiar
-        
-    Returns:
-        String limpio o el valor original si no es string
-    """
-    if isinstance(value, str):
-        # Eliminar caracteres de control (ASCII 0-31 y 127)
-        # Excepto \t (tab=9), \n (newline=10), \r (carriage return=13)
-        return re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F]', '', value)
-    return value
-
-
 def save_results(output_data: List[Dict], output_file: str, console: Console) -> None:
     """
     Guarda los resultados en archivo XLSX.
@@ -185,27 +466,30 @@ def save_results(output_data: List[Dict], output_file: str, console: Console) ->
                 logging.warning("No hay datos para guardar")
                 console.print("[yellow]⚠ Advertencia:[/] No se encontraron datos para guardar")
                 # Crear archivo vacío con headers
-                empty_df = pd.DataFrame(columns=["cedula", "nombre_profesor", "orcid_profesor", "title", "journal", "date", "doi", "source", "note", "url_source"])
-                empty_df.to_excel(output_file, index=False, engine='openpyxl')
+                empty_df = pd.DataFrame(columns=typed_columns(OUTPUT_COLUMNS))
+                write_excel(empty_df, output_file)
                 return
 
-            df = pd.DataFrame(output_data)
+            # Verificación final de duplicados, con el mismo criterio de process_users (DOI o título normalizado)
+            initial_count = len(output_data)
+            records = dedupe_records([dict(record) for record in output_data], PublicationIndex(), set())
+            final_count = len(records)
 
-            # Verificación final de duplicados (por seguridad)
-            initial_count = len(df)
-            df = df.drop_duplicates(subset=["orcid_profesor", "title"], keep="first")
-            final_count = len(df)
+            df = pd.DataFrame(records)
+            # Las columnas de detalle solo se exportan si se pidieron (--details)
+            df = df.drop(columns=[col for col in DETAIL_COLUMNS if col in df.columns and not df[col].astype(bool).any()])
 
             if initial_count != final_count:
                 logging.info(f"Duplicados eliminados: {initial_count - final_count}")
                 console.print(f"[dim]🗑️  Duplicados eliminados: {initial_count - final_count}[/]")
 
-            # Limpiar caracteres ilegales de todas las columnas de tipo string
+            # Limpiar caracteres ilegales de todas las columnas de texto (vectorizado por columna)
             for col in df.columns:
-                if df[col].dtype == 'object':  # Columnas de texto
-                    df[col] = df[col].apply(clean_illegal_characters)
-            
-            df.to_excel(output_file, index=False, engine='openpyxl')
+                df[col] = clean_illegal_series(df[col])
+
+            # Esquema tipado, el mismo de los escritores en streaming: fecha por partes y columnas categóricas
+            df = apply_schema(df)
+            write_excel(df, output_file)
             logging.info(f"Resultados guardados en: {output_file} ({final_count} registros)")
 
         console.print(f"[green]✓[/] Resultados guardados: [bold]{final_count}[/] registros en [cyan]{output_file}[/]")
@@ -229,48 +513,357 @@ def save_results(output_data: List[Dict], output_file: str, console: Console) ->
         raise
 
 
-def orcid(console: Optional[Console] = None) -> None:
+def save_delta(store: IncrementalStore, output_file: str, console: Console) -> None:
+    """
+    Guarda el archivo de cambios (publicaciones agregadas y eliminadas) del modo incremental.
+
+    Args:
+        store: Estado del modo incremental ya actualizado
+        output_file: Ruta del archivo de salida
+        console: Rich Console para output
+    """
+    delta = store.delta_records()
+    columns = ["cambio", "cedula", "nombre_profesor", "orcid_profesor", "title", "journal", "date", "doi", "source", "note", "url_source"]
+    df = pd.DataFrame(delta, columns=columns)
+    for col in df.columns:
+        df[col] = clean_illegal_series(df[col])
+    write_excel(apply_schema(df), output_file)
+
+    added = len(store.added)
+    removed = len(store.removed)
+    logging.info(f"Cambios guardados en: {output_file} (+{added} / -{removed})")
+    console.print(f"[green]✓[/] Cambios desde la última ejecución: [bold green]+{added}[/] / [bold red]-{removed}[/] en [cyan]{output_file}[/]")
+
+
+def export_target(database: PublicationDatabase, run_id: int, output: ResultWriter, enricher: Optional[DoiEnricher], console: Console) -> ResultWriter:
+    """
+    Escritor para exportar una ejecución: el de salida, o uno que completa cada registro con los DOI resueltos.
+
+    Los DOI de todas las filas de la ejecución se deduplican y se resuelven
+    (caché y proveedor) antes de escribir el primer registro.
+
+    Args:
+        database: Base de publicaciones
+        run_id: Ejecución a exportar
+        output: Escritor de los archivos de resultados
+        enricher: Enriquecedor de DOI (opcional)
+        console: Rich Console para output
+
+    Returns:
+        Escritor de destino para PublicationDatabase.export
+    """
+    if not enricher:
+        return output
+    with console.status(f"[bold blue]Enriqueciendo DOI con {enricher.provider.name}...", spinner="dots"):
+        stats = enricher.stats
+        enricher.resolve(database.run_dois(run_id))
+    console.print(f"[green]✓[/] DOI resueltos con {stats['provider']}: [bold]{stats['found']}[/]/{stats['dois']} encontrados ({stats['cached']} en caché, {stats['looked_up']} consultados, {stats['dois_per_s']:.0f} DOI/s)")
+    if stats["failed"]:
+        console.print(f"[yellow]⚠[/] {stats['failed']} DOI sin resolver por errores del proveedor; se reintentarán en la próxima ejecución")
+    return EnrichingWriter(output, enricher)
+
+
+def add_enrichment_rows(table: Table, stats: Dict) -> None:
+    """
+    Agrega a la tabla de estadísticas el resultado del enriquecimiento de DOI.
+
+    Args:
+        table: Tabla de estadísticas
+        stats: DoiEnricher.stats
+    """
+    filled = stats["filled"]
+    table.add_row("🔎 DOI encontrados", f"{stats['found']}/{stats['dois']} ({stats['provider']})")
+    table.add_row("✍️  Completados (revista/fecha/DOI)", f"{filled['journal']}/{filled['date']}/{filled['doi']}")
+
+
+def phase_table(metrics: Metrics) -> Table:
+    """
+    Tabla con el tiempo de pared y de CPU de cada fase.
+
+    Args:
+        metrics: Métricas de la ejecución
+
+    Returns:
+        Tabla Rich lista para imprimir
+    """
+    table = Table(title="⏱️  Tiempo por fase", box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    table.add_column("Fase", style="cyan", no_wrap=True)
+    table.add_column("Pared", justify="right", style="bold green")
+    table.add_column("CPU", justify="right")
+    table.add_column("Llamadas", justify="right", style="dim")
+    for name, phase in metrics.phases.items():
+        if phase["calls"]:
+            table.add_row(name, get_time(phase["wall"]), get_time(phase["cpu"]), str(phase["calls"]))
+    return table
+
+
+def pipeline_table(stats: Dict) -> Table:
+    """
+    Tabla con la utilización de cada etapa del pipeline.
+
+    Args:
+        stats: Resultado de Pipeline.stats()
+
+    Returns:
+        Tabla Rich lista para imprimir
+    """
+    table = Table(title=f"🏭 Etapas del pipeline (cuello de botella: {stats['bottleneck']})", box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    table.add_column("Etapa", style="cyan", no_wrap=True)
+    table.add_column("Hilos", justify="right", style="dim")
+    table.add_column("Utilización", justify="right", style="bold green")
+    table.add_column("Trabajando", justify="right")
+    table.add_column("Esperando entrada", justify="right")
+    table.add_column("Bloqueada (cola llena)", justify="right")
+    for name, stage in stats["stages"].items():
+        table.add_row(name, str(stage["workers"]), f"{stage['utilization'] * 100:.0f}%", get_time(stage["busy_s"]), get_time(stage["starved_s"]), get_time(stage["blocked_s"]), style="bold yellow" if name == stats["bottleneck"] else None)
+    return table
+
+
+def save_metrics(metrics: Metrics, metrics_dir: str, run_stamp: str, extra: Dict, console: Console) -> None:
+    """
+    Guarda las métricas de la ejecución en JSON y en formato texto de Prometheus.
+
+    El JSON lleva la fecha de la ejecución en el nombre; el archivo ``orcid.prom``
+    se reemplaza en cada ejecución, como espera el textfile collector de node_exporter.
+
+    Args:
+        metrics: Métricas de la ejecución
+        metrics_dir: Carpeta de salida
+        run_stamp: Marca de fecha y hora de la ejecución
+        extra: Datos adicionales para el JSON (resumen, HTTP, caché)
+        console: Rich Console para output
+    """
+    json_path = os.path.join(metrics_dir, f"metrics_{run_stamp}.json")
+    try:
+        metrics.write_json(json_path, extra)
+        metrics.write_prometheus(os.path.join(metrics_dir, "orcid.prom"))
+    except OSError as e:
+        # Las métricas no deben hacer fallar una ejecución que ya guardó sus resultados
+        logging.warning(f"No se pudieron guardar las métricas: {e}")
+        return
+    logging.info(f"Métricas guardadas en: {json_path}")
+    console.print(f"[dim]📈 Métricas: {json_path}[/]")
+
+
+def save_profile(profiler: cProfile.Profile, path: str, console: Console) -> None:
+    """
+    Guarda el perfil de cProfile y escribe en el log las funciones más costosas.
+
+    cProfile solo mide el hilo que lo activa: con ``--workers 1`` cubre todo el
+    procesamiento; con varios workers, la descarga y el parseo ocurren en otros
+    hilos y conviene un perfilador por muestreo externo (``py-spy record``).
+
+    Args:
+        profiler: Perfilador ya detenido
+        path: Ruta del archivo .prof (legible con pstats o snakeviz)
+        console: Rich Console para output
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    profiler.dump_stats(path)
+
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_TOP)
+    logging.info(f"Perfil de cProfile guardado en {path}:\n{report.getvalue()}")
+    console.print(f"[dim]🔬 Perfil: {path} (python -m pstats {os.path.basename(path)})[/]")
+
+
+def orcid(
+    console: Optional[Console] = None,
+    workers: Optional[int] = None,
+    rate_limit: Optional[float] = None,
+    use_cache: bool = True,
+    offline: bool = False,
+    incremental: bool = False,
+    resume: bool = False,
+    formats: Optional[List[str]] = None,
+    max_retries: Optional[int] = None,
+    profile: bool = False,
+    datafile: Optional[List[str]] = None,
+    details: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+    pipeline: bool = False,
+    parse_processes: int = 0,
+    enrich: Optional[str] = None,
+) -> None:
     """
     Función principal optimizada para procesar registros ORCID.
 
     Args:
         console: Rich Console para output (opcional)
+        workers: Hilos de descarga concurrentes (por defecto ORCID_WORKERS o 1)
+        rate_limit: Peticiones por segundo (por defecto ORCID_RATE_LIMIT o 24)
+        use_cache: Usar la caché en disco con revalidación condicional
+        offline: Generar el archivo solo con datos en caché, sin conectarse a ORCID
+        incremental: Reutilizar los registros de perfiles sin cambios y generar un archivo de cambios
+        resume: Continuar una ejecución interrumpida desde la bitácora de avance
+        formats: Formatos de salida (xlsx, parquet, arrow, jsonl, sqlite); por defecto solo xlsx
+        max_retries: Reintentos por petición ante 429/5xx/errores de red (por defecto ORCID_MAX_RETRIES o 5)
+        profile: Perfilar el procesamiento de usuarios con cProfile (se guarda junto a las métricas)
+        datafile: Archivos tar.gz del archivo de datos públicos de ORCID; los trabajos se leen de
+            ahí, sin credenciales ni red (workers = procesos de parseo)
+        details: Agregar tipo de trabajo, contribuidores y cita (una petición extra por cada 100 trabajos)
+        shard: Procesar solo el fragmento (i, N) del listado; se genera un resultado parcial
+            para combinar con merge() en lugar de los archivos finales
+        pipeline: Descargar, parsear y escribir en etapas concurrentes; los archivos de resultados
+            se escriben durante la descarga en lugar de exportarse al final
+        parse_processes: Procesos para decodificar y parsear las respuestas en modo pipeline (0 = un hilo)
+        enrich: Proveedor de metadatos por DOI (crossref, stub) para completar revista, fecha y DOI
+            vacíos antes de exportar (ver orcid.enrich); None = sin enriquecimiento
     """
     if console is None:
         console = Console()
 
+    if workers is None:
+        workers = int(os.getenv("ORCID_WORKERS", DEFAULT_WORKERS))
+    if rate_limit is None:
+        rate_limit = float(os.getenv("ORCID_RATE_LIMIT", ORCID_RATE_LIMIT))
+    if max_retries is None:
+        max_retries = int(os.getenv("ORCID_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+
     # Configurar rutas
     root = os.path.dirname(os.path.dirname(__file__))
-    input_file = os.path.join(root, "input.csv")
+    input_file = resolve_input_file(root)
     
     # Generar nombre de archivo con fecha
     fecha_actual = datetime.now().strftime("%Y-%m-%d")
-    output_filename = f"publicaciones_orcid_{fecha_actual}.xlsx"
-    output_file = os.path.join(root, output_filename)
+    output_base = os.path.join(root, f"publicaciones_orcid_{fecha_actual}")
+    delta_file = os.path.join(root, f"delta_orcid_{fecha_actual}.xlsx")
+    rejects_file = os.path.join(root, f"rechazados_orcid_{fecha_actual}.csv")
+    metrics_dir = metrics_directory(root)
+    run_stamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    if shard:
+        if datafile:
+            raise ValueError("--shard no aplica con --datafile: el archivo de datos no se lee en el orden del listado")
+        # Archivos propios de cada fragmento, para que varios puedan correr en la misma carpeta
+        partial_file = f"{output_base}.{shard_name(shard)}.jsonl"
+        delta_file = os.path.join(root, f"delta_orcid_{fecha_actual}.{shard_name(shard)}.xlsx")
+
+    logging.info(f"Iniciando procesamiento ORCID (workers={workers}, rate_limit={rate_limit}/s, max_retries={max_retries})")
 
-    logging.info("Iniciando procesamiento ORCID")
+    metrics = Metrics()
+    # Cliente HTTP compartido: una sola sesión keep-alive para credenciales y trabajos
+    # (con --details los lotes de detalle usan conexiones propias, además de las de los workers)
+    client = OrcidClient(pool_size=workers * 2 if details else workers, rate_limit=rate_limit, timeout=REQUEST_TIMEOUT, max_retries=max_retries, metrics=metrics)
+    cache = build_cache(root) if (use_cache or offline) and not datafile else None
+    store_file = os.path.join(root, "state", f"incremental.{shard_name(shard)}.json" if shard else "incremental.json")
+    store = IncrementalStore(store_file) if incremental and not datafile else None
+    if incremental and datafile:
+        # Las fechas de modificación del archivo de datos no son comparables con las de la API
+        console.print("[yellow]⚠[/] El modo incremental no aplica con el archivo de datos; se genera el archivo completo")
+        logging.warning("Modo incremental ignorado con --datafile")
+    if pipeline and (datafile or details):
+        # El archivo de datos ya se parsea en procesos propios; el detalle hace más peticiones por investigador
+        console.print(f"[yellow]⚠[/] El modo pipeline no aplica con {'--datafile' if datafile else '--details'}; se usa el procesamiento normal")
+        logging.warning(f"Modo pipeline ignorado con {'--datafile' if datafile else '--details'}")
+        pipeline = False
+    if enrich and shard:
+        # Los DOI se deduplican entre todos los investigadores: se resuelven al combinar los fragmentos
+        console.print("[yellow]⚠[/] El enriquecimiento de DOI se aplica al combinar los fragmentos (merge --enrich)")
+        logging.warning("Enriquecimiento ignorado con --shard")
+        enrich = None
+    journal = None
+    database = None
+    enricher = None
 
     try:
+        if enrich:
+            enricher = build_enricher(root, enrich, workers, metrics)
+
         # 1. Cargar usuarios válidos
-        users_df = load_valid_users(input_file, console)
+        users_df = load_valid_users(input_file, console, metrics, rejects_file)
 
         if len(users_df) == 0:
             console.print("[yellow]⚠[/] No se encontraron usuarios con ORCID válido")
             logging.warning("No se encontraron usuarios con ORCID válido")
             return
 
-        # 2. Obtener credenciales
-        with console.status("[bold blue]Obteniendo credenciales ORCID...", spinner="dots"):
-            credentials = get_credentials()
-        console.print("[green]✓[/] Credenciales ORCID obtenidas exitosamente\n")
-        logging.info("Credenciales ORCID obtenidas exitosamente")
+        roster_size = len(users_df)
+        if shard:
+            # Se conserva el índice: es la posición de cada investigador en el listado completo
+            users_df = users_df[assign_shards(users_df["orcid"], shard[1]) == shard[0]]
+            console.print(f"[cyan]🧩 Fragmento {shard[0]}/{shard[1]}:[/] [bold]{len(users_df)}[/] de {roster_size} investigadores\n")
+            logging.info(f"Fragmento {shard[0]}/{shard[1]}: {len(users_df)} de {roster_size} investigadores")
+
+        # 2. Obtener credenciales (no se necesitan en modo offline ni con el archivo de datos)
+        if datafile:
+            credentials = ""
+            console.print(f"[yellow]🗄️  Archivo de datos:[/] leyendo trabajos de [cyan]{', '.join(datafile)}[/], sin conectarse a ORCID\n")
+            logging.info(f"Modo archivo de datos: {datafile}")
+        elif offline:
+            credentials = ""
+            console.print(f"[yellow]📦 Modo offline:[/] usando solo datos en caché ([cyan]{cache.directory}[/])\n")
+            logging.info("Modo offline: se omite la autenticación")
+        else:
+            with console.status("[bold blue]Obteniendo credenciales ORCID...", spinner="dots"), metrics.phase("auth"):
+                credentials = get_credentials(client)
+            console.print("[green]✓[/] Credenciales ORCID obtenidas exitosamente\n")
+            logging.info("Credenciales ORCID obtenidas exitosamente")
 
-        # 3. Procesar usuarios
-        output_data, summary = process_users(users_df, credentials, console)
+        # 3. Procesar usuarios: cada fila se escribe al XLSX en cuanto el investigador termina
+        # La bitácora reproduce en el orden de entrada: no aplica al archivo de datos, que se relee completo.
+        # En un fragmento, la bitácora es el resultado parcial y los archivos finales los genera merge()
+        if shard:
+            journal = CheckpointJournal(partial_file, resume=resume)
+            # Un resumen de una ejecución anterior haría pasar por terminado un parcial a medias
+            if os.path.exists(stats_path(partial_file)):
+                os.remove(stats_path(partial_file))
+            writer = MultiWriter([])
+        else:
+            journal = CheckpointJournal(os.path.join(root, "state", "checkpoint.jsonl"), resume=resume) if not datafile else None
+            # Los registros se guardan en la base de publicaciones; los archivos de resultados se
+            # generan al final desde la foto de esta ejecución (se crean antes para validar los formatos).
+            # En modo pipeline se escriben a la vez que la base, en la etapa write, mientras sigue la descarga
+            # (salvo con enriquecimiento, que necesita todos los DOI de la ejecución antes de escribir)
+            output = create_writer(formats or ["xlsx"], output_base, RECORD_COLUMNS if details else OUTPUT_COLUMNS)
+            database = PublicationDatabase(database_path(root))
+            database_writer = database.writer()
+            writer = MultiWriter([database_writer, output]) if pipeline and not enricher else database_writer
+        profiler = cProfile.Profile() if profile else None
+        if profiler:
+            profiler.enable()
+        try:
+            _, summary = process_users(users_df, credentials, console, workers=workers, client=client, cache=cache, offline=offline, store=store, journal=journal, writer=writer, metrics=metrics, datafile=datafile, details=details, pipeline=pipeline, parse_processes=parse_processes)
+        finally:
+            if profiler:
+                profiler.disable()
+                save_profile(profiler, os.path.join(metrics_dir, f"profile_{run_stamp}.prof"), console)
 
         # 4. Guardar resultados
         console.print()
-        save_results(output_data, output_file, console)
+        with console.status("[bold green]Guardando resultados...", spinner="dots"), metrics.phase("export"):
+            writer.close()
+            if database:
+                run_id = database_writer.run_id
+                database.finish_run(run_id, database_writer.rows, summary["complete"])
+        if database and writer is database_writer:
+            target = export_target(database, run_id, output, enricher, console)
+            with console.status("[bold green]Guardando resultados...", spinner="dots"), metrics.phase("export"):
+                database.export(run_id, target)
+                output.close()
+        if database:
+            logging.info(f"Ejecución {run_id} guardada en la base de publicaciones {database.path}")
+            writer = output
+        if shard:
+            journal.close()
+            journal = None
+            logging.info(f"Resultado parcial guardado en: {partial_file} ({summary['index']} investigadores)")
+            console.print(f"[green]✓[/] Resultado parcial: [bold]{summary['index']}[/] investigadores en [cyan]{partial_file}[/]")
+        elif writer.rows == 0:
+            logging.warning("No hay datos para guardar")
+            console.print("[yellow]⚠ Advertencia:[/] No se encontraron datos para guardar")
+        for format_writer in writer.writers:
+            logging.info(f"Resultados guardados en: {format_writer.path} ({writer.rows} registros)")
+            console.print(f"[green]✓[/] Resultados guardados: [bold]{writer.rows}[/] registros en [cyan]{format_writer.path}[/]")
+
+        # Resultados en disco: la bitácora ya no es necesaria
+        if journal:
+            journal.close(remove=True)
+            journal = None
+
+        if store:
+            store.save()
+            with metrics.phase("export"):
+                save_delta(store, delta_file, console)
 
         # Mostrar estadísticas finales en tabla
         stats_table = Table(title="📊 Estadísticas del Procesamiento", box=box.ROUNDED, show_header=True, header_style="bold magenta")
@@ -279,15 +872,57 @@ def orcid(console: Optional[Console] = None) -> None:
 
         stats_table.add_row("👥 Usuarios procesados", f"{summary['index']}/{summary['total_users']}")
         stats_table.add_row("📄 Registros obtenidos", str(summary["processed_records"]))
+        stats_table.add_row("📚 Publicaciones únicas", str(summary["publications"]))
         stats_table.add_row("❌ Errores", str(summary["errors"]), style="bold yellow" if summary["errors"] > 0 else "bold green")
 
         success_rate = ((summary["index"] - summary["errors"]) / summary["index"] * 100) if summary["index"] > 0 else 0
         stats_table.add_row("✓ Tasa de éxito", f"{success_rate:.1f}%")
 
+        http_stats = client.stats()
+        if http_stats["requests"]:
+            stats_table.add_row("🔌 Conexiones reutilizadas", f"{http_stats['reused']}/{http_stats['requests']} ({http_stats['reuse_ratio'] * 100:.1f}%)")
+        if http_stats["retries"]:
+            stats_table.add_row("🔁 Reintentos (429 recibidos)", f"{http_stats['retries']} ({http_stats['throttled']})")
+            stats_table.add_row("🚦 Tasa final", f"{http_stats['rate']:.1f}/s")
+        if http_stats["breaker_opened"]:
+            stats_table.add_row("⛔ Pausas por caída del servicio", str(http_stats["breaker_opened"]), style="bold yellow")
+        if metrics.requests:
+            stats_table.add_row("🌐 Latencia p50 / p95", f"{metrics.latency_quantile(0.5) * 1000:.0f} ms / {metrics.latency_quantile(0.95) * 1000:.0f} ms")
+            stats_table.add_row("📥 Datos recibidos", f"{metrics.bytes / 1e6:.1f} MB")
+
+        if cache:
+            # En modo offline no se desaloja nada: los datos no podrían recuperarse
+            if not offline:
+                cache.prune()
+            stats_table.add_row("📦 Caché (aciertos/descargas)", f"{cache.stats['hits']}/{cache.stats['misses']}")
+            logging.info(f"Estadísticas de caché: {cache.stats}")
+
+        if database:
+            stats_table.add_row("🗄️  Base de publicaciones", f"ejecución #{run_id}")
+
+        if enricher:
+            summary["enrichment"] = enricher.stats
+            add_enrichment_rows(stats_table, enricher.stats)
+
+        if store:
+            stats_table.add_row("♻️  Perfiles sin cambios", f"{store.stats['unchanged']}/{store.stats['unchanged'] + store.stats['changed']}")
+
+        stats_table.add_row("⏱️  Duración total", get_time(metrics.elapsed))
+
         console.print()
         console.print(stats_table)
+        console.print(phase_table(metrics))
+        if "pipeline" in summary:
+            console.print(pipeline_table(summary["pipeline"]))
+
+        save_metrics(metrics, metrics_dir, run_stamp, {"summary": summary, "http": http_stats, "cache": cache.stats if cache else None, "database": {"path": database.path, "run_id": run_id} if database else None}, console)
+        if shard:
+            # El resumen marca el fragmento como terminado: merge() no acepta parciales sin él
+            shard_info = {"index": shard[0], "count": shard[1], "users": len(users_df), "roster": roster_size}
+            metrics.write_json(stats_path(partial_file), {"shard": shard_info, "summary": summary, "http": http_stats, "details": details})
 
         logging.info(f"Procesamiento ORCID completado: {summary}")
+        logging.info(f"Estadísticas HTTP: {http_stats}")
 
     except Exception as e:
         # Capturar traceback completo
@@ -313,3 +948,97 @@ def orcid(console: Optional[Console] = None) -> None:
 
         # Re-lanzar la excepción para que el llamador pueda manejarla
         raise
+
+    finally:
+        client.close()
+        if journal:
+            journal.close()
+        if database:
+            database.close()
+        if enricher:
+            enricher.close()
+
+
+def merge(partials: List[str], console: Optional[Console] = None, formats: Optional[List[str]] = None, enrich: Optional[str] = None) -> None:
+    """
+    Combina los resultados parciales de una ejecución con --shard en los archivos finales.
+
+    La salida es idéntica a la de una ejecución en un solo proceso: los
+    registros se deduplican otra vez en el orden del listado completo y las
+    estadísticas de los fragmentos se suman.
+
+    Args:
+        partials: Resultados parciales (.jsonl), uno por fragmento
+        console: Rich Console para output (opcional)
+        formats: Formatos de salida (xlsx, parquet, arrow, jsonl, sqlite); por defecto solo xlsx
+        enrich: Proveedor de metadatos por DOI para completar los campos vacíos (opcional)
+    """
+    if console is None:
+        console = Console()
+
+    root = os.path.dirname(os.path.dirname(__file__))
+    output_base = os.path.join(root, f"publicaciones_orcid_{datetime.now().strftime('%Y-%m-%d')}")
+    logging.info(f"Combinando {len(partials)} fragmentos: {partials}")
+
+    database = None
+    enricher = None
+    try:
+        # Verificar los fragmentos antes de abrir los archivos de salida y la base: crearlos
+        # trunca los resultados del día, que no deben perderse si la combinación no procede
+        stats = validate_partials(partials)
+        if enrich:
+            enricher = build_enricher(root, enrich)
+        details = any(entry.get("details") for entry in stats)
+        writer = create_writer(formats or ["xlsx"], output_base, RECORD_COLUMNS if details else OUTPUT_COLUMNS)
+        database = PublicationDatabase(database_path(root))
+        with console.status("[bold green]Combinando fragmentos...", spinner="dots"):
+            # Igual que una ejecución normal: los registros van a la base y los archivos se generan desde ella
+            database_writer = database.writer()
+            summary = merge_partials(partials, database_writer, stats=stats)
+            database_writer.close()
+            database.finish_run(database_writer.run_id, database_writer.rows, summary["complete"])
+        target = export_target(database, database_writer.run_id, writer, enricher, console)
+        with console.status("[bold green]Guardando resultados...", spinner="dots"):
+            database.export(database_writer.run_id, target)
+            writer.close()
+
+        for format_writer in writer.writers:
+            logging.info(f"Resultados guardados en: {format_writer.path} ({writer.rows} registros)")
+            console.print(f"[green]✓[/] Resultados guardados: [bold]{writer.rows}[/] registros en [cyan]{format_writer.path}[/]")
+
+        stats_table = Table(title="📊 Estadísticas combinadas", box=box.ROUNDED, show_header=True, header_style="bold magenta")
+        stats_table.add_column("Métrica", style="cyan", no_wrap=True)
+        stats_table.add_column("Valor", justify="right", style="bold green")
+        stats_table.add_row("🧩 Fragmentos", str(summary["shards"]))
+        stats_table.add_row("👥 Usuarios procesados", f"{summary['index']}/{summary['total_users']}")
+        stats_table.add_row("📄 Registros obtenidos", str(summary["processed_records"]))
+        stats_table.add_row("📚 Publicaciones únicas", str(summary["publications"]))
+        stats_table.add_row("❌ Errores", str(summary["errors"]), style="bold yellow" if summary["errors"] > 0 else "bold green")
+        if summary["http"]["requests"]:
+            stats_table.add_row("🌐 Peticiones HTTP", str(summary["http"]["requests"]))
+        if summary["http"]["retries"]:
+            stats_table.add_row("🔁 Reintentos (429 recibidos)", f"{summary['http']['retries']} ({summary['http']['throttled']})")
+        stats_table.add_row("🗄️  Base de publicaciones", f"ejecución #{database_writer.run_id}")
+        if enricher:
+            summary["enrichment"] = enricher.stats
+            add_enrichment_rows(stats_table, enricher.stats)
+        stats_table.add_row("⏱️  Fragmento más lento", get_time(summary["elapsed_s"]))
+        console.print()
+        console.print(stats_table)
+
+        logging.info(f"Combinación completada: {summary}")
+
+    except Exception as e:
+        tb_str = traceback.format_exc()
+        logging.error(f"Error combinando fragmentos: {e}")
+        logging.error(f"Traceback completo:\n{tb_str}")
+        console.print(f"\n[bold red]❌ Error combinando fragmentos[/]")
+        console.print(f"[red]Tipo de error:[/] {type(e).__name__}")
+        console.print(f"[red]Mensaje:[/] {str(e)}")
+        raise
+
+    finally:
+        if database:
+            database.close()
+        if enricher:
+            enricher.close()
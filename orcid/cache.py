@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from orcid.jsonlib import loads
+
+
+class CacheMissError(LookupError):
+    """No existe entrada en caché para el ORCID solicitado (modo offline)."""
+
+
+class WorksCache:
+    """
+    Caché en disco de las respuestas crudas de ``/{orcid}/works``.
+
+    Cada ORCID se guarda en un archivo JSON con los datos de la respuesta y los
+    validadores HTTP (ETag / Last-Modified) necesarios para hacer peticiones
+    condicionales. La fecha de modificación del archivo marca la última vez que
+    la entrada fue validada con ORCID y se usa para la expiración (TTL) y para
+    el desalojo por tamaño (se eliminan primero las más antiguas).
+
+    Args:
+        directory: Carpeta donde se guardan las entradas
+        ttl: Segundos desde la última validación antes de desalojar una entrada
+        max_bytes: Tamaño máximo total de la caché en bytes
+    """
+
+    def __init__(self, directory: str, ttl: float = 30 * 24 * 3600, max_bytes: int = 500 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, orcid: str) -> str:
+        return os.path.join(self.directory, f"{orcid}.json")
+
+    def get(self, orcid: str) -> Optional[Dict[str, Any]]:
+        """
+        Lee la entrada de un ORCID.
+
+        Args:
+            orcid: Identificador ORCID
+
+        Returns:
+            Diccionario con ``data``, ``etag`` y ``last_modified``, o None si no existe
+        """
+        try:
+            with open(self._path(orcid), "rb") as f:
+                return loads(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Construye los encabezados de petición condicional para una entrada.
+
+        Args:
+            entry: Entrada devuelta por ``get``
+
+        Returns:
+            Encabezados If-None-Match / If-Modified-Since disponibles
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, orcid: str, data: Dict, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Guarda (o reemplaza) la respuesta de un ORCID de forma atómica.
+
+        Args:
+            orcid: Identificador ORCID
+            data: Respuesta JSON ya decodificada
+            etag: Encabezado ETag de la respuesta
+            last_modified: Encabezado Last-Modified de la respuesta
+        """
+        path = self._path(orcid)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "last_modified": last_modified, "data": data}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def put_raw(self, orcid: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Guarda la respuesta de un ORCID tal como llegó, sin decodificarla ni volver a codificarla.
+
+        Args:
+            orcid: Identificador ORCID
+            body: Cuerpo JSON de la respuesta
+            etag: Encabezado ETag de la respuesta
+            last_modified: Encabezado Last-Modified de la respuesta
+        """
+        path = self._path(orcid)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        header = json.dumps({"etag": etag, "last_modified": last_modified}, ensure_ascii=False, separators=(",", ":"))
+        with open(tmp_path, "wb") as f:
+            f.write(header[:-1].encode("utf-8") + b',"data":' + body + b"}")
+        os.replace(tmp_path, path)
+
+    def touch(self, orcid: str) -> None:
+        """
+        Marca una entrada como validada ahora (respuesta 304).
+
+        Args:
+            orcid: Identificador ORCID
+        """
+        try:
+            os.utime(self._path(orcid))
+        except FileNotFoundError:
+            pass
+
+    def record(self, event: str) -> None:
+        """
+        Incrementa un contador de estadísticas (``hits`` o ``misses``).
+
+        Args:
+            event: Nombre del contador
+        """
+        with self._lock:
+            self.stats[event] += 1
+
+    def prune(self) -> int:
+        """
+        Desaloja entradas expiradas y, si se supera el tamaño máximo, las más antiguas.
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for mtime, size, path in entries:
+            if now - mtime <= self.ttl and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+
+        self.stats["evicted"] += removed
+        return removed
+
+
+def build_cache(root: str) -> WorksCache:
+    """
+    Crea la caché de respuestas /works según las variables de entorno.
+
+    Args:
+        root: Carpeta raíz del proyecto
+
+    Returns:
+        Instancia de WorksCache
+    """
+    directory = os.getenv("ORCID_CACHE_DIR", os.path.join(root, "cache", "works"))
+    ttl_days = float(os.getenv("ORCID_CACHE_TTL_DAYS", "30"))
+    max_mb = float(os.getenv("ORCID_CACHE_MAX_MB", "500"))
+    return WorksCache(directory, ttl=ttl_days * 24 * 3600, max_bytes=int(max_mb * 1024 * 1024))
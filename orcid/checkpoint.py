@@ -0,0 +1,85 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+
+def _json_default(value):
+    """Serializa escalares de numpy/pandas que llegan desde el DataFrame de entrada."""
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class CheckpointJournal:
+    """
+    Bitácora de avance append-only para reanudar ejecuciones interrumpidas.
+
+    Cada investigador completado se escribe como una línea JSON con su ORCID,
+    sus registros (o el error) en el mismo orden en que ``process_users`` los
+    consume. Como el consumo es siempre en el orden de entrada, la bitácora es
+    un prefijo exacto de la lista de usuarios y puede reproducirse tal cual.
+
+    Args:
+        path: Ruta del archivo JSONL
+        resume: Cargar las entradas existentes y continuar agregando; si es False se reinicia
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self.entries: List[Dict] = []
+
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.entries.append(json.loads(line))
+                    except ValueError:
+                        # Última línea truncada por la interrupción
+                        break
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._rewrite(self.entries)
+
+    def _rewrite(self, entries: List[Dict]) -> None:
+        """Reescribe la bitácora con las entradas válidas y la deja abierta para agregar."""
+        with open(self.path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, default=_json_default) + "\n")
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def truncate(self, count: int) -> None:
+        """
+        Conserva solo las primeras ``count`` entradas (cuando el archivo de entrada cambió).
+
+        Args:
+            count: Número de entradas a conservar
+        """
+        self._file.close()
+        self.entries = self.entries[:count]
+        self._rewrite(self.entries)
+
+    def append(self, orcid: str, records: Optional[List[Dict]], error: Optional[str] = None, index: Optional[int] = None, last_modified: Optional[int] = None) -> None:
+        """
+        Registra un investigador completado.
+
+        Args:
+            orcid: Identificador ORCID
+            records: Registros obtenidos (None si hubo error)
+            error: Mensaje de error, si lo hubo
+            index: Posición del investigador en el listado completo (para combinar fragmentos)
+            last_modified: ``last-modified-date`` del perfil (modo incremental, para restaurar el estado al reanudar)
+        """
+        entry = {"orcid": orcid, "records": [dict(record) for record in records] if records is not None else None, "error": error, "last_modified": last_modified}
+        if index is not None:
+            entry["index"] = index
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=_json_default) + "\n")
+        self._file.flush()
+
+    def close(self, remove: bool = False) -> None:
+        """
+        Cierra la bitácora.
+
+        Args:
+            remove: Eliminar el archivo (ejecución completada y resultados guardados)
+        """
+        self._file.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
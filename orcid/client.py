@@ -0,0 +1,207 @@
+import logging
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from orcid.metrics import DISABLED, Metrics
+from orcid.ratelimit import AdaptiveTokenBucket, CircuitBreaker, backoff_delay, retry_after_seconds
+
+# Encabezados comunes a todas las peticiones
+BASE_HEADERS = {"Accept": "application/json", "Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+
+# Respuestas que se reintentan: límite de tasa y errores transitorios del servidor
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Reintentos por petición antes de dar el error por definitivo
+DEFAULT_MAX_RETRIES = 5
+
+
+class OrcidClient:
+    """
+    Cliente HTTP compartido para la API de ORCID.
+
+    Mantiene una sesión ``requests`` con pool de conexiones keep-alive del
+    tamaño del número de workers, negociación gzip/deflate y encabezados de
+    autorización pre-construidos, de modo que cada investigador reutiliza una
+    conexión TLS ya abierta en lugar de pagar un handshake nuevo.
+
+    Las peticiones (GET y POST) se reintentan ante 429, 5xx, timeouts y errores de conexión con
+    espera exponencial con jitter (o la indicada en Retry-After). La tasa se
+    adapta con AIMD y un circuit breaker pausa a todos los hilos si el servicio
+    cae; el error solo llega al llamador cuando se agotan los reintentos.
+
+    Args:
+        pool_size: Conexiones simultáneas por host (normalmente = workers)
+        rate_limit: Peticiones por segundo compartidas, y techo de la tasa adaptativa (<= 0 desactiva el límite)
+        timeout: Timeout por petición en segundos
+        max_retries: Reintentos por petición (0 = sin reintentos)
+        metrics: Métricas de la ejecución donde registrar latencia, bytes y reintentos (opcional)
+    """
+
+    def __init__(self, pool_size: int = 1, rate_limit: float = 0, timeout: float = 30, max_retries: int = DEFAULT_MAX_RETRIES, metrics: Optional[Metrics] = None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.metrics = metrics or DISABLED
+        self.rate_limiter = AdaptiveTokenBucket(rate_limit)
+        self.breaker = CircuitBreaker()
+        self.retries = 0
+
+        self.session = requests.Session()
+        self.session.headers.update(BASE_HEADERS)
+
+        # pool_block evita abrir conexiones extra (que luego se descartan) si hay más hilos que conexiones
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(pool_size, 1), pool_block=True)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        self._auth_headers: Dict[str, Dict[str, str]] = {}
+
+    def auth_headers(self, access_token: str) -> Dict[str, str]:
+        """
+        Devuelve los encabezados de autorización para un token, construidos una sola vez.
+
+        Args:
+            access_token: Token de acceso ORCID (vacío para APIs públicas sin autorización)
+
+        Returns:
+            Diccionario con el encabezado Authorization (vacío si no hay token)
+        """
+        if not access_token:
+            return {}
+        headers = self._auth_headers.get(access_token)
+        if headers is None:
+            headers = {"Authorization": f"Bearer {access_token}"}
+            self._auth_headers[access_token] = headers
+        return headers
+
+    def get(self, url: str, access_token: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Ejecuta un GET autenticado respetando el limitador de tasa, con reintentos.
+
+        Args:
+            url: URL a consultar
+            access_token: Token de acceso ORCID
+            headers: Encabezados adicionales (opcional)
+
+        Returns:
+            Respuesta HTTP (la última, con su código de error, si se agotaron los reintentos)
+
+        Raises:
+            requests.RequestException: Si la última tentativa falló sin respuesta
+        """
+        request_headers = self.auth_headers(access_token)
+        if headers:
+            request_headers = {**request_headers, **headers}
+        return self._request("GET", url, request_headers)
+
+    def post(self, url: str, data: Dict, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Ejecuta un POST de formulario sobre la sesión compartida, con los mismos reintentos que get.
+
+        Args:
+            url: URL destino
+            data: Datos del formulario
+            headers: Encabezados adicionales (opcional)
+
+        Returns:
+            Respuesta HTTP (la última, con su código de error, si se agotaron los reintentos)
+
+        Raises:
+            requests.RequestException: Si la última tentativa falló sin respuesta
+        """
+        return self._request("POST", url, headers, data=data)
+
+    def _request(self, method: str, url: str, headers: Optional[Dict[str, str]], **kwargs) -> requests.Response:
+        """
+        Ejecuta una petición respetando el limitador de tasa y el circuit breaker, con reintentos.
+
+        Args:
+            method: Método HTTP
+            url: URL destino
+            headers: Encabezados de la petición (opcional)
+            **kwargs: Argumentos adicionales de ``requests.Session.request`` (data, ...)
+
+        Returns:
+            Respuesta HTTP (la última, con su código de error, si se agotaron los reintentos)
+
+        Raises:
+            requests.RequestException: Si la última tentativa falló sin respuesta
+        """
+        attempt = 0
+        while True:
+            self.breaker.before_request()
+            self.rate_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, headers=headers, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self.metrics.observe_request(time.perf_counter() - start, None)
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+            except BaseException:
+                # No dejar una prueba del circuit breaker sin resolver
+                self.breaker.record_failure()
+                raise
+            else:
+                # raw.tell(): bytes leídos del socket, antes de descomprimir gzip
+                self.metrics.observe_request(time.perf_counter() - start, response.status_code, response.raw.tell() if response.raw is not None else len(response.content))
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    self.rate_limiter.on_success()
+                    return response
+
+                retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    # El servicio responde: es un límite de tasa, no una caída
+                    self.breaker.record_success()
+                    self.rate_limiter.on_throttle(retry_after)
+                else:
+                    self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    return response
+                response.close()
+                delay = max(retry_after or 0.0, backoff_delay(attempt))
+                logging.warning(f"HTTP {response.status_code} en {url}: reintento {attempt + 1} en {delay:.1f}s", extra={"phase": "http", "status": response.status_code, "latency_ms": round((time.perf_counter() - start) * 1000, 1), "attempt": attempt + 1})
+
+            attempt += 1
+            self.retries += 1
+            self.metrics.observe_retry()
+            time.sleep(delay)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Estadísticas de reintentos y de reutilización de conexiones del pool.
+
+        Returns:
+            Diccionario con reintentos, respuestas 429, aperturas del circuit breaker, tasa actual,
+            peticiones, conexiones abiertas, reutilizadas y tasa de reutilización
+        """
+        requests_count = 0
+        connections = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_count += pool.num_requests
+            connections += pool.num_connections
+
+        reused = max(requests_count - connections, 0)
+        return {
+            "retries": self.retries,
+            "throttled": self.rate_limiter.throttled,
+            "breaker_opened": self.breaker.opened,
+            "rate": self.rate_limiter.rate,
+            "requests": requests_count,
+            "connections": connections,
+            "reused": reused,
+            "reuse_ratio": (reused / requests_count) if requests_count else 0.0,
+        }
+
+    def close(self) -> None:
+        """Cierra la sesión y todas las conexiones del pool."""
+        self.session.close()
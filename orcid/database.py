@@ -0,0 +1,387 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from orcid.records import RECORD_COLUMNS
+from orcid.writers import BATCH_SIZE, ResultWriter, plain_value
+
+# Campos de cada publicación guardados en la tabla publications
+PUBLICATION_FIELDS = ("title", "journal", "date", "doi", "note", "url_source", "work_type", "contributors", "citation")
+
+# Campos del investigador (tabla researchers)
+RESEARCHER_FIELDS = ("cedula", "nombre_profesor", "source")
+
+# Campos de cada versión de una fila (tabla publication_versions): los valores que tenía en cada ejecución
+VERSION_FIELDS = RESEARCHER_FIELDS + PUBLICATION_FIELDS
+
+# Versión del esquema (PRAGMA user_version), para poder migrar bases creadas con esta si cambia
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started TEXT NOT NULL,
+    finished TEXT,
+    complete INTEGER NOT NULL DEFAULT 0,
+    records INTEGER NOT NULL DEFAULT 0
+);
+-- cedula sin tipo declarado: conserva números como números y textos como textos
+CREATE TABLE IF NOT EXISTS researchers (
+    orcid TEXT PRIMARY KEY,
+    cedula,
+    nombre_profesor TEXT,
+    source TEXT,
+    last_run INTEGER NOT NULL
+) WITHOUT ROWID;
+-- Una fila por (investigador, publicación); publication_id = '' es la fila de estado
+-- del investigador (sin trabajos, error), que no es una publicación
+CREATE TABLE IF NOT EXISTS publications (
+    orcid TEXT NOT NULL,
+    publication_id TEXT NOT NULL,
+    title TEXT, journal TEXT, date TEXT, year INTEGER, doi TEXT, note TEXT, url_source TEXT,
+    work_type TEXT, contributors TEXT, citation TEXT,
+    first_run INTEGER NOT NULL,
+    last_run INTEGER NOT NULL,
+    PRIMARY KEY (orcid, publication_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_publications_doi ON publications (doi COLLATE NOCASE) WHERE doi != '';
+CREATE INDEX IF NOT EXISTS idx_publications_year ON publications (year, publication_id);
+CREATE INDEX IF NOT EXISTS idx_publications_first_run ON publications (first_run, orcid);
+-- Valores de cada fila tal como estaban en cada ejecución: se agrega una versión solo
+-- cuando algún campo cambia (content_hash), así que crece con los cambios y no con las ejecuciones
+CREATE TABLE IF NOT EXISTS publication_versions (
+    version_id INTEGER PRIMARY KEY,
+    orcid TEXT NOT NULL,
+    publication_id TEXT NOT NULL,
+    cedula, nombre_profesor TEXT, source TEXT,
+    title TEXT, journal TEXT, date TEXT, doi TEXT, note TEXT, url_source TEXT,
+    work_type TEXT, contributors TEXT, citation TEXT,
+    content_hash TEXT NOT NULL,
+    first_run INTEGER NOT NULL,
+    UNIQUE (orcid, publication_id, content_hash)
+);
+-- Foto de cada ejecución: sus filas, en orden, como referencias a la versión vigente en esa ejecución
+CREATE TABLE IF NOT EXISTS snapshots (
+    run_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    orcid TEXT NOT NULL,
+    publication_id TEXT NOT NULL,
+    version_id INTEGER NOT NULL,
+    PRIMARY KEY (run_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_snapshots_orcid ON snapshots (orcid, run_id);
+-- Filas del archivo de resultados de cada ejecución (WHERE run_id = ? ORDER BY seq)
+CREATE VIEW IF NOT EXISTS snapshot_rows AS
+SELECT s.run_id, s.seq,
+       v.cedula, v.nombre_profesor, s.orcid AS orcid_profesor,
+       v.title, v.journal, v.date, v.doi, v.source, v.note,
+       v.url_source, s.publication_id, v.work_type, v.contributors, v.citation
+FROM snapshots s
+JOIN publication_versions v ON v.version_id = s.version_id;
+"""
+
+_UPSERT_PUBLICATION = (
+    f"INSERT INTO publications (orcid, publication_id, {', '.join(PUBLICATION_FIELDS)}, year, first_run, last_run) "
+    f"VALUES (?, ?, {', '.join('?' for _ in PUBLICATION_FIELDS)}, ?, ?, ?) "
+    f"ON CONFLICT (orcid, publication_id) DO UPDATE SET {', '.join(f'{field} = excluded.{field}' for field in PUBLICATION_FIELDS)}, "
+    "year = excluded.year, last_run = excluded.last_run"
+)
+_UPSERT_RESEARCHER = (
+    f"INSERT INTO researchers (orcid, {', '.join(RESEARCHER_FIELDS)}, last_run) VALUES (?, ?, ?, ?, ?) "
+    f"ON CONFLICT (orcid) DO UPDATE SET {', '.join(f'{field} = excluded.{field}' for field in RESEARCHER_FIELDS)}, last_run = excluded.last_run"
+)
+_INSERT_VERSION = (
+    f"INSERT INTO publication_versions (orcid, publication_id, {', '.join(VERSION_FIELDS)}, content_hash, first_run) "
+    f"VALUES (?, ?, {', '.join('?' for _ in VERSION_FIELDS)}, ?, ?) "
+    "ON CONFLICT (orcid, publication_id, content_hash) DO NOTHING"
+)
+# Claves de las filas del lote en curso: la foto se inserta en una sola sentencia, uniendo cada fila con su versión
+_BATCH_TABLE = "CREATE TEMP TABLE IF NOT EXISTS snapshot_batch (seq INTEGER PRIMARY KEY, orcid TEXT, publication_id TEXT, content_hash TEXT)"
+_INSERT_BATCH_KEY = "INSERT INTO temp.snapshot_batch (seq, orcid, publication_id, content_hash) VALUES (?, ?, ?, ?)"
+_INSERT_SNAPSHOTS = (
+    "INSERT INTO snapshots (run_id, seq, orcid, publication_id, version_id) "
+    "SELECT ?, b.seq, b.orcid, b.publication_id, v.version_id FROM temp.snapshot_batch b "
+    "JOIN publication_versions v ON v.orcid = b.orcid AND v.publication_id = b.publication_id AND v.content_hash = b.content_hash"
+)
+
+
+def database_path(root: str) -> str:
+    """Archivo de la base de publicaciones: ORCID_DB_FILE o ``state/publicaciones.sqlite``."""
+    configured = os.getenv("ORCID_DB_FILE")
+    if configured:
+        return configured if os.path.isabs(configured) else os.path.join(root, configured)
+    return os.path.join(root, "state", "publicaciones.sqlite")
+
+
+def _year(date: str) -> Optional[int]:
+    """Año de la fecha de publicación (``2021``, ``2021-05``, ``2021-05-03``)."""
+    return int(date[:4]) if date and date[:4].isdigit() else None
+
+
+def _content_hash(values: Sequence) -> str:
+    """Huella de los valores de una fila, para reconocer si cambió respecto a sus versiones anteriores."""
+    return hashlib.blake2b(json.dumps(values, ensure_ascii=False, default=str).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class PublicationDatabase:
+    """
+    Base SQLite local con todas las publicaciones de todas las ejecuciones.
+
+    Cada ejecución se registra en ``runs`` y sus registros se insertan o
+    actualizan (upsert) en ``publications`` por (ORCID, publication_id), de
+    modo que la tabla crece con las publicaciones nuevas y no con las
+    ejecuciones. Las filas de cada ejecución quedan en ``snapshots`` como
+    referencias a ``publication_versions``, que guarda los valores de cada
+    fila en cada ejecución (una versión nueva solo si algún campo cambió), y
+    los archivos de resultados (xlsx, parquet, ...) se generan desde la vista
+    ``snapshot_rows``: exportar una ejecución antigua muestra los títulos,
+    revistas y fechas que tenía entonces. Los índices por ORCID (clave primaria),
+    DOI, año y ejecución de primera aparición permiten consultar el
+    histórico sin cargar ningún archivo en pandas.
+
+    Args:
+        path: Ruta del archivo SQLite
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        with self._conn:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(_BATCH_TABLE)
+
+    def begin_run(self) -> int:
+        """
+        Registra una ejecución nueva.
+
+        Returns:
+            Identificador de la ejecución
+        """
+        with self._conn:
+            cursor = self._conn.execute("INSERT INTO runs (started) VALUES (?)", (time.strftime("%Y-%m-%d %H:%M:%S"),))
+        return cursor.lastrowid
+
+    def finish_run(self, run_id: int, records: int, complete: bool = True) -> None:
+        """
+        Marca una ejecución como terminada.
+
+        Args:
+            run_id: Identificador de la ejecución
+            records: Filas de la ejecución
+            complete: Si se procesó el listado completo
+        """
+        with self._conn:
+            self._conn.execute("UPDATE runs SET finished = ?, complete = ?, records = ? WHERE run_id = ?", (time.strftime("%Y-%m-%d %H:%M:%S"), int(complete), records, run_id))
+
+    def writer(self, columns: Optional[Sequence[str]] = None) -> "DatabaseWriter":
+        """
+        Escritor en streaming que guarda los registros de una ejecución nueva.
+
+        Args:
+            columns: Columnas del archivo de resultados (se guardan siempre todas)
+
+        Returns:
+            DatabaseWriter de la ejecución
+        """
+        return DatabaseWriter(self, self.begin_run(), columns)
+
+    def upsert(self, run_id: int, records: List[Dict], first_seq: int) -> None:
+        """
+        Inserta o actualiza un lote de registros en una sola transacción.
+
+        Cada fila se guarda como versión nueva solo si sus valores no coinciden
+        con una versión existente; la foto de la ejecución se inserta después
+        con una sola sentencia que une cada fila con su versión.
+
+        Args:
+            run_id: Ejecución a la que pertenecen
+            records: Registros ya deduplicados, en orden
+            first_seq: Posición del primer registro en la ejecución
+        """
+        researchers = {}
+        publications = []
+        versions = []
+        keys = []
+        for seq, record in enumerate(records, first_seq):
+            orcid = plain_value(record.get("orcid_profesor", ""))
+            pid = record.get("publication_id") or ""
+            researcher = tuple(plain_value(record.get(field, "")) for field in RESEARCHER_FIELDS)
+            values = tuple(plain_value(record.get(field, "")) for field in PUBLICATION_FIELDS)
+            content_hash = _content_hash(researcher + values)
+            researchers[orcid] = (orcid, *researcher, run_id)
+            publications.append((orcid, pid, *values, _year(record.get("date", "")), run_id, run_id))
+            versions.append((orcid, pid, *researcher, *values, content_hash, run_id))
+            keys.append((seq, orcid, pid, content_hash))
+
+        with self._conn:
+            self._conn.executemany(_UPSERT_RESEARCHER, researchers.values())
+            self._conn.executemany(_UPSERT_PUBLICATION, publications)
+            self._conn.executemany(_INSERT_VERSION, versions)
+            self._conn.execute("DELETE FROM temp.snapshot_batch")
+            self._conn.executemany(_INSERT_BATCH_KEY, keys)
+            self._conn.execute(_INSERT_SNAPSHOTS, (run_id,))
+
+    def snapshot(self, run_id: int, columns: Sequence[str] = RECORD_COLUMNS) -> Iterator[Dict]:
+        """
+        Filas de una ejecución, en el orden en que se procesaron.
+
+        Args:
+            run_id: Identificador de la ejecución
+            columns: Columnas a devolver
+
+        Yields:
+            Un diccionario por fila
+        """
+        cursor = self._conn.execute(f"SELECT {', '.join(columns)} FROM snapshot_rows WHERE run_id = ? ORDER BY seq", (run_id,))
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                return
+            for row in rows:
+                yield {column: "" if value is None else value for column, value in zip(columns, row)}
+
+    def export(self, run_id: int, writer: ResultWriter) -> int:
+        """
+        Escribe las filas de una ejecución con un escritor de resultados (xlsx, parquet, ...).
+
+        Args:
+            run_id: Identificador de la ejecución
+            writer: Escritor de destino (no se cierra)
+
+        Returns:
+            Filas escritas
+        """
+        rows = 0
+        for row in self.snapshot(run_id, writer.columns):
+            writer.write(row)
+            rows += 1
+        return rows
+
+    def run_dois(self, run_id: int) -> List[str]:
+        """
+        Valores distintos de la columna doi en las filas de una ejecución.
+
+        Args:
+            run_id: Identificador de la ejecución
+
+        Returns:
+            Lista de DOI (tal como vienen de ORCID, sin normalizar)
+        """
+        cursor = self._conn.execute(
+            "SELECT DISTINCT v.doi FROM snapshots s JOIN publication_versions v ON v.version_id = s.version_id "
+            "WHERE s.run_id = ? AND v.doi != ''",
+            (run_id,),
+        )
+        return [row[0] for row in cursor]
+
+    def runs(self) -> List[Dict]:
+        """Ejecuciones registradas, de la más antigua a la más reciente."""
+        cursor = self._conn.execute("SELECT run_id, started, finished, complete, records FROM runs ORDER BY run_id")
+        return [dict(zip(("run_id", "started", "finished", "complete", "records"), row)) for row in cursor]
+
+    def works_by_doi(self, doi: str) -> List[Dict]:
+        """
+        Investigadores que tienen una publicación con este DOI (tal como viene de ORCID, sin distinguir mayúsculas).
+
+        Args:
+            doi: DOI de la publicación
+
+        Returns:
+            Filas con el investigador y los datos de la publicación
+        """
+        return self._query(
+            "SELECT p.orcid, r.nombre_profesor, p.publication_id, p.title, p.journal, p.date, p.doi FROM publications p JOIN researchers r USING (orcid) WHERE p.doi = ? COLLATE NOCASE AND p.doi != ''",
+            (doi.strip(),),
+        )
+
+    def works_by_orcid(self, orcid: str) -> List[Dict]:
+        """
+        Publicaciones de un investigador en todo el histórico.
+
+        Args:
+            orcid: ORCID del investigador
+
+        Returns:
+            Filas con la publicación y las ejecuciones en que apareció por primera y última vez
+        """
+        return self._query(
+            "SELECT publication_id, title, journal, date, doi, first_run, last_run FROM publications WHERE orcid = ? AND publication_id != '' ORDER BY year DESC, title",
+            (orcid,),
+        )
+
+    def added_since(self, since: str) -> List[Dict]:
+        """
+        Investigadores con publicaciones que aparecieron por primera vez desde una fecha.
+
+        La primera ejecución registrada es la carga inicial: sus publicaciones no
+        cuentan como agregadas.
+
+        Args:
+            since: Fecha ``YYYY-MM-DD`` (inicio de la ejecución)
+
+        Returns:
+            Filas con el investigador y la cantidad de publicaciones nuevas
+        """
+        return self._query(
+            "SELECT p.orcid, r.nombre_profesor, COUNT(*) AS publicaciones FROM publications p JOIN researchers r USING (orcid) "
+            "WHERE p.first_run >= (SELECT MIN(run_id) FROM runs WHERE started >= ?) AND p.first_run > (SELECT MIN(run_id) FROM runs) "
+            "AND p.publication_id != '' GROUP BY p.orcid ORDER BY publicaciones DESC",
+            (since,),
+        )
+
+    def count_by_year(self) -> List[Dict]:
+        """Publicaciones distintas por año de publicación en todo el histórico."""
+        return self._query("SELECT year, COUNT(DISTINCT publication_id) AS publicaciones FROM publications WHERE publication_id != '' AND year IS NOT NULL GROUP BY year ORDER BY year", ())
+
+    def _query(self, sql: str, params: tuple) -> List[Dict]:
+        cursor = self._conn.execute(sql, params)
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def close(self) -> None:
+        """Cierra la conexión."""
+        self._conn.close()
+
+
+class DatabaseWriter(ResultWriter):
+    """
+    Escritor en streaming hacia la base de publicaciones.
+
+    Acumula BATCH_SIZE registros y los guarda en una transacción (upsert de
+    investigadores y publicaciones e inserción de la foto de la ejecución).
+
+    Args:
+        database: Base de publicaciones
+        run_id: Ejecución a la que pertenecen los registros
+        columns: Columnas del archivo de resultados
+    """
+
+    extension = "db"
+
+    def __init__(self, database: PublicationDatabase, run_id: int, columns: Optional[Sequence[str]] = None):
+        super().__init__(database.path, columns)
+        self.database = database
+        self.run_id = run_id
+        self._batch: List[Dict] = []
+
+    def write(self, record: Dict) -> None:
+        self._batch.append(record)
+        self.rows += 1
+        if len(self._batch) >= BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._batch:
+            self.database.upsert(self.run_id, self._batch, self.rows - len(self._batch))
+            self._batch = []
+
+    def close(self) -> None:
+        self._flush()
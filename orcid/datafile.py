@@ -0,0 +1,210 @@
+import os
+import re
+import tarfile
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Espacios de nombres del esquema XML v3.0 de ORCID
+NAMESPACES = {
+    "record": "http://www.orcid.org/ns/record",
+    "activities": "http://www.orcid.org/ns/activities",
+    "work": "http://www.orcid.org/ns/work",
+    "common": "http://www.orcid.org/ns/common",
+}
+
+# Miembros que cada proceso parsea por delante del lector del archivo
+WINDOW_PER_WORKER = 8
+
+# Nombre de los miembros del archivo de resúmenes: .../<3 dígitos>/<orcid>.xml
+_MEMBER_RE = re.compile(r"(\d{4}-\d{4}-\d{4}-\d{3}[\dX])\.xml$")
+
+
+def _tag(namespace: str, name: str) -> str:
+    return "{%s}%s" % (NAMESPACES[namespace], name)
+
+
+_WORKS = _tag("activities", "works")
+_ACTIVITIES = _tag("activities", "activities-summary")
+_GROUP = _tag("activities", "group")
+_SUMMARY = _tag("work", "work-summary")
+_WORK_TITLE = _tag("work", "title")
+_TITLE = _tag("common", "title")
+_JOURNAL = _tag("work", "journal-title")
+_URL = _tag("common", "url")
+_DATE = _tag("common", "publication-date")
+_DATE_PARTS = tuple((part, _tag("common", part)) for part in ("year", "month", "day"))
+_EXTERNAL_IDS = _tag("common", "external-ids")
+_ID_TYPE = _tag("common", "external-id-type")
+_ID_VALUE = _tag("common", "external-id-value")
+_LAST_MODIFIED = _tag("common", "last-modified-date")
+
+# Resultado de un miembro: (orcid, fecha de última modificación de los trabajos, grupos de work-summary, error)
+MemberResult = Tuple[str, Optional[str], List[List[Dict]], Optional[str]]
+
+
+def member_orcid(name: str) -> Optional[str]:
+    """
+    ORCID al que corresponde un miembro del archivo, según su nombre.
+
+    Args:
+        name: Ruta del miembro dentro del tar (``ORCID_2024_10_summaries/097/0000-0002-1825-0097.xml``)
+
+    Returns:
+        ORCID del registro, o None si el miembro no es un resumen de registro
+    """
+    match = _MEMBER_RE.search(name)
+    return match.group(1) if match else None
+
+
+def _value(element: Optional[ET.Element]) -> Optional[Dict]:
+    """Nodo ``{"value": ...}`` como en la API JSON, o None si el elemento no existe."""
+    if element is None:
+        return None
+    return {"value": element.text}
+
+
+def _work_summary(element: ET.Element) -> Dict:
+    """Convierte un ``work:work-summary`` XML al diccionario que entrega la API JSON."""
+    summary = {"put-code": element.get("put-code"), "title": None, "journal-title": None, "publication-date": None, "url": None, "external-ids": None}
+    # Una pasada por los hijos directos: find() con rutas compuestas es mucho más lento
+    for child in element:
+        tag = child.tag
+        if tag == _WORK_TITLE:
+            summary["title"] = {"title": _value(child.find(_TITLE))}
+        elif tag == _JOURNAL:
+            summary["journal-title"] = _value(child)
+        elif tag == _URL:
+            summary["url"] = _value(child)
+        elif tag == _DATE:
+            summary["publication-date"] = {part: _value(child.find(part_tag)) for part, part_tag in _DATE_PARTS}
+        elif tag == _EXTERNAL_IDS:
+            summary["external-ids"] = {"external-id": [{"external-id-type": external_id.findtext(_ID_TYPE), "external-id-value": external_id.findtext(_ID_VALUE)} for external_id in child]}
+    return summary
+
+
+def parse_record(data: bytes) -> Tuple[Optional[str], List[List[Dict]]]:
+    """
+    Extrae los trabajos de un resumen de registro XML del archivo de datos públicos.
+
+    Cada ``activities:group`` se convierte en la lista de ``work-summary`` con la
+    misma forma que la respuesta JSON de ``/works``, de modo que los registros
+    se crean con ``_create_work_record`` igual que en el modo por API.
+
+    Args:
+        data: Contenido XML de un registro
+
+    Returns:
+        Tupla (fecha de última modificación de los trabajos, grupos de work-summary)
+    """
+    activities = ET.fromstring(data).find(_ACTIVITIES)
+    works = activities.find(_WORKS) if activities is not None else None
+    if works is None:
+        return None, []
+    groups = [[_work_summary(summary) for summary in group.findall(_SUMMARY)] for group in works.findall(_GROUP)]
+    return works.findtext(_LAST_MODIFIED), groups
+
+
+def _parse_member(orcid: str, data: bytes) -> MemberResult:
+    """Unidad de trabajo de cada proceso: parsea un miembro ya leído del tar."""
+    try:
+        last_modified, groups = parse_record(data)
+    except ET.ParseError as e:
+        # Un registro dañado no debe detener la lectura del resto del archivo
+        return orcid, None, [], f"XML inválido: {e}"
+    return orcid, last_modified, groups, None
+
+
+def _iter_members(paths: Iterable[str], wanted: Set[str]) -> Iterator[Tuple[str, bytes]]:
+    """
+    Recorre los archivos tar.gz en modo streaming y entrega solo los miembros de ORCID buscados.
+
+    El tar se lee secuencialmente (``r|*``), sin índice ni acceso aleatorio: los
+    miembros que no interesan se saltan sin leer su contenido, y la lista de
+    miembros que ``TarFile`` acumula se vacía en cada paso para que la memoria
+    no crezca con el tamaño del archivo. La lectura termina en cuanto se
+    encontraron todos los ORCID buscados.
+
+    Args:
+        paths: Archivos tar.gz del archivo de datos públicos
+        wanted: ORCID a extraer (se consume: cada ORCID encontrado se retira)
+
+    Yields:
+        Tuplas (orcid, contenido XML del miembro)
+    """
+    for path in paths:
+        with tarfile.open(path, mode="r|*") as archive:
+            for member in archive:
+                archive.members = []
+                if not wanted:
+                    return
+                if not member.isfile():
+                    continue
+                orcid = member_orcid(member.name)
+                if orcid is None or orcid not in wanted:
+                    continue
+                wanted.discard(orcid)
+                yield orcid, archive.extractfile(member).read()
+
+
+def iter_datafile(paths: Iterable[str], orcids: Iterable[str], workers: int = 1) -> Iterator[MemberResult]:
+    """
+    Extrae los trabajos de los ORCID indicados desde el archivo de datos públicos de ORCID.
+
+    No hace peticiones de red. Un único lector descomprime el tar y filtra por
+    nombre de miembro contra un conjunto de ORCID (búsqueda O(1)); el parseo
+    XML de los miembros seleccionados se reparte entre ``workers`` procesos con
+    una ventana acotada de miembros en vuelo, así que la memoria no depende del
+    tamaño del archivo sino de la ventana. Los resultados se entregan en el
+    orden del archivo.
+
+    Args:
+        paths: Archivos tar.gz de resúmenes (``ORCID_<año>_<mes>_summaries.tar.gz``)
+        orcids: ORCID a extraer
+        workers: Procesos de parseo (1 = en este proceso)
+
+    Yields:
+        Tuplas (orcid, fecha de última modificación, grupos de work-summary, error o None)
+    """
+    members = _iter_members(paths, set(orcids))
+    if workers <= 1:
+        for orcid, data in members:
+            yield _parse_member(orcid, data)
+        return
+
+    window = workers * WINDOW_PER_WORKER
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for orcid, data in members:
+                pending.append(executor.submit(_parse_member, orcid, data))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def datafile_paths(value: str) -> List[str]:
+    """
+    Archivos tar.gz indicados en la opción --datafile.
+
+    Args:
+        value: Rutas separadas por coma; una carpeta equivale a todos sus .tar.gz
+
+    Returns:
+        Lista de rutas de archivos, en orden
+    """
+    paths = []
+    for item in (part.strip() for part in value.split(",")):
+        if not item:
+            continue
+        if os.path.isdir(item):
+            paths.extend(os.path.join(item, name) for name in sorted(os.listdir(item)) if name.endswith((".tar.gz", ".tgz")))
+        else:
+            paths.append(item)
+    return paths
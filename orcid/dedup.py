@@ -0,0 +1,246 @@
+import hashlib
+import re
+import unicodedata
+import zlib
+from array import array
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+# Prefijos con los que suelen venir los DOI en ORCID
+_DOI_PREFIX_RE = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+# Marcas diacríticas combinantes (tras NFKD): "Publicación" -> "Publicacion"
+_COMBINING_RE = re.compile(r"[\u0300-\u036f]")
+# Todo lo que no sea letra o dígito (en cualquier alfabeto)
+_NON_WORD_RE = re.compile(r"[\W_]+")
+# Números del título ("Part 2", "COVID-19", años): si difieren, no es la misma publicación
+_NUMBER_RE = re.compile(r"\d+")
+
+# Primo de Mersenne 2^31 - 1 para las permutaciones (a*x + b) mod p de MinHash
+_MERSENNE_PRIME = (1 << 31) - 1
+
+# Títulos más cortos que esto solo se comparan de forma exacta
+MIN_FUZZY_TITLE_LENGTH = 12
+
+# Máximo de publicaciones por bucket LSH. Un bucket que se llena corresponde a
+# una banda demasiado común (títulos genéricos); seguir llenándolo haría que
+# cada inserción revisara más candidatos y el índice dejaría de ser lineal.
+MAX_BUCKET_SIZE = 32
+
+# Diferencia relativa máxima de longitud entre dos títulos casi idénticos
+MAX_LENGTH_DIFFERENCE = 0.1
+
+
+def normalize_doi(value: str) -> str:
+    """
+    Normaliza un DOI: minúsculas y sin prefijos ``https://doi.org/`` ni ``doi:``.
+
+    Args:
+        value: Identificador tal como viene de ORCID
+
+    Returns:
+        DOI normalizado, o cadena vacía si el valor no es un DOI (ISSN, ISBN, ...)
+    """
+    if not value:
+        return ""
+    doi = _DOI_PREFIX_RE.sub("", value.strip().lower())
+    return doi if doi.startswith("10.") else ""
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normaliza un título para compararlo: sin mayúsculas, tildes ni puntuación.
+
+    Args:
+        title: Título original
+
+    Returns:
+        Título normalizado con las palabras separadas por un espacio
+    """
+    if not title:
+        return ""
+    text = _COMBINING_RE.sub("", unicodedata.normalize("NFKD", title.casefold()))
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+def _fingerprint(text: str) -> int:
+    """Huella de 64 bits estable entre ejecuciones (a diferencia de ``hash``)."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class PublicationIndex:
+    """
+    Índice de deduplicación de publicaciones entre todos los investigadores.
+
+    Cada registro se asocia a una publicación buscando, en orden:
+
+    1. El DOI normalizado.
+    2. La huella exacta del título normalizado.
+    3. Títulos casi idénticos mediante MinHash sobre trigramas de caracteres,
+       con LSH por bandas para obtener candidatos en tiempo constante, y
+       verificación por la similitud estimada entre firmas, la longitud y los
+       números del título.
+
+    Dos publicaciones con DOI distintos nunca se unen. En memoria solo se
+    guardan huellas de 64 bits y firmas MinHash de ``num_perm`` enteros de 32
+    bits en un ``array`` contiguo, no los títulos. El identificador público es
+    estable entre ejecuciones: se deriva del DOI (o del título) del primer
+    registro de la publicación.
+
+    Args:
+        num_perm: Permutaciones MinHash por firma
+        bands: Bandas LSH (num_perm debe ser múltiplo de bands)
+        threshold: Similitud de Jaccard estimada mínima para unir títulos
+    """
+
+    def __init__(self, num_perm: int = 16, bands: int = 4, threshold: float = 0.85):
+        if num_perm % bands:
+            raise ValueError("num_perm debe ser múltiplo de bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+
+        rng = np.random.default_rng(20240601)  # Semilla fija: firmas reproducibles
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+        self.ids: List[str] = []
+        self._doi_index: Dict[int, int] = {}
+        self._title_index: Dict[int, int] = {}
+        self._buckets: Dict[int, List[int]] = {}
+        self._dois = array("Q")  # Huella del DOI de cada publicación (0 = sin DOI)
+        self._signatures = array("I")
+        self._lengths = array("I")  # Longitud del título normalizado
+        self._numbers = array("I")  # Huella de los números del título
+        self.stats = {"doi": 0, "title": 0, "fuzzy": 0, "new": 0}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _signature(self, title: str) -> np.ndarray:
+        """Firma MinHash de los trigramas de caracteres del título normalizado."""
+        shingles = {title[i:i + 3] for i in range(len(title) - 2)} or {title}
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        return ((self._a * hashes + self._b) % _MERSENNE_PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        # hash() de una tupla de enteros es determinista (no depende de PYTHONHASHSEED)
+        values = signature.tolist()
+        return [hash((band, *values[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+    def _compatible(self, pid: int, doi_fp: int) -> bool:
+        """Dos publicaciones con DOI conocidos y distintos no son la misma."""
+        existing = self._dois[pid]
+        return not (doi_fp and existing and existing != doi_fp)
+
+    def _link_doi(self, pid: int, doi_fp: int) -> None:
+        if doi_fp and not self._dois[pid]:
+            self._dois[pid] = doi_fp
+            self._doi_index.setdefault(doi_fp, pid)
+
+    def assign(self, title: str, doi: str) -> Tuple[int, str]:
+        """
+        Asocia un registro a una publicación, creándola si no existe.
+
+        Args:
+            title: Título del registro
+            doi: Identificador del registro (se usa solo si es un DOI)
+
+        Returns:
+            Tupla (id interno, id público); (-1, "") si el registro no tiene título ni DOI
+        """
+        norm_doi = normalize_doi(doi)
+        norm_title = normalize_title(title)
+        if not norm_doi and not norm_title:
+            return -1, ""
+
+        doi_fp = _fingerprint(norm_doi) if norm_doi else 0
+
+        # 1. DOI
+        if doi_fp:
+            pid = self._doi_index.get(doi_fp)
+            if pid is not None:
+                self.stats["doi"] += 1
+                return pid, self.ids[pid]
+
+        # 2. Título exacto
+        title_fp = _fingerprint(norm_title) if norm_title else 0
+        if title_fp:
+            pid = self._title_index.get(title_fp)
+            if pid is not None and self._compatible(pid, doi_fp):
+                self._link_doi(pid, doi_fp)
+                self.stats["title"] += 1
+                return pid, self.ids[pid]
+
+        # 3. Título casi idéntico (MinHash + LSH)
+        signature = None
+        band_keys: List[int] = []
+        length = len(norm_title)
+        numbers = zlib.crc32(" ".join(_NUMBER_RE.findall(norm_title)).encode("ascii"))
+        if length >= MIN_FUZZY_TITLE_LENGTH:
+            signature = self._signature(norm_title)
+            band_keys = self._band_keys(signature)
+            seen = set()
+            for key in band_keys:
+                for pid in self._buckets.get(key, ()):
+                    if pid in seen:
+                        continue
+                    seen.add(pid)
+                    if self._numbers[pid] != numbers or abs(self._lengths[pid] - length) > MAX_LENGTH_DIFFERENCE * max(length, self._lengths[pid]):
+                        continue
+                    # Copia de la firma: una vista directa impediría ampliar el array después
+                    start = pid * self.num_perm
+                    stored = np.frombuffer(self._signatures[start:start + self.num_perm], dtype=np.uint32)
+                    if (stored == signature).mean() >= self.threshold and self._compatible(pid, doi_fp):
+                        self._link_doi(pid, doi_fp)
+                        self._title_index.setdefault(title_fp, pid)
+                        self.stats["fuzzy"] += 1
+                        return pid, self.ids[pid]
+
+        # 4. Publicación nueva
+        pid = len(self.ids)
+        self.ids.append("P" + hashlib.blake2b(f"doi:{norm_doi}".encode("utf-8") if norm_doi else f"title:{norm_title}".encode("utf-8"), digest_size=6).hexdigest())
+        self._dois.append(doi_fp)
+        self._lengths.append(length)
+        self._numbers.append(numbers)
+        if doi_fp:
+            self._doi_index[doi_fp] = pid
+        if title_fp:
+            self._title_index.setdefault(title_fp, pid)
+        # Firma vacía (ceros) para los títulos cortos: nunca entran en los buckets
+        self._signatures.extend(signature.tolist() if signature is not None else [0] * self.num_perm)
+        for key in band_keys:
+            bucket = self._buckets.setdefault(key, [])
+            if len(bucket) < MAX_BUCKET_SIZE:
+                bucket.append(pid)
+
+        self.stats["new"] += 1
+        return pid, self.ids[pid]
+
+
+def dedupe_records(records: List[Dict], publications: PublicationIndex, seen: Set[Tuple[str, int]]) -> List[Dict]:
+    """
+    Asigna el publication_id de cada registro y descarta las publicaciones repetidas de un mismo investigador.
+
+    El resultado depende del orden en que llegan los registros (el primero de
+    cada publicación fija su identificador), así que para obtener la misma
+    salida los registros deben procesarse en el orden del archivo de entrada.
+
+    Args:
+        records: Registros de un investigador (se les asigna publication_id)
+        publications: Índice de publicaciones compartido
+        seen: Pares (ORCID, publicación) ya emitidos; se actualiza
+
+    Returns:
+        Registros nuevos, en su orden original
+    """
+    new_records = []
+    for record in records:
+        pid, record["publication_id"] = publications.assign(record.get("title", ""), record.get("doi", ""))
+        key = (record.get("orcid_profesor", ""), pid)
+        if key not in seen:
+            seen.add(key)
+            new_records.append(record)
+    return new_records
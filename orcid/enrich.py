@@ -0,0 +1,438 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Optional, Sequence
+from urllib.parse import urlencode
+
+from orcid.client import OrcidClient
+from orcid.dedup import normalize_doi
+from orcid.jsonlib import loads
+from orcid.metrics import DISABLED, Metrics
+from orcid.utils import REQUEST_TIMEOUT, clean_illegal_characters
+from orcid.writers import ResultWriter
+
+# DOI que se consulta al proveedor: prefijo 10.<registrante>/<sufijo>, sin espacios
+DOI_PATTERN = re.compile(r"^10\.\d{4,9}/\S+$")
+
+# Campos que el enriquecimiento completa cuando vienen vacíos (o menos precisos) desde ORCID
+ENRICHED_FIELDS = ("journal", "date", "doi")
+
+# Días antes de volver a consultar un DOI que el proveedor no encontró
+DEFAULT_NEGATIVE_TTL_DAYS = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS doi_metadata (
+    provider TEXT NOT NULL,
+    doi TEXT NOT NULL,
+    found INTEGER NOT NULL,
+    canonical_doi TEXT,
+    journal TEXT,
+    date TEXT,
+    resolved REAL NOT NULL,
+    PRIMARY KEY (provider, doi)
+) WITHOUT ROWID;
+"""
+
+
+def is_valid_doi(doi: str) -> bool:
+    """
+    Indica si un DOI ya normalizado (orcid.dedup.normalize_doi) tiene la forma completa ``10.<registrante>/<sufijo>``.
+
+    Args:
+        doi: DOI normalizado (cadena vacía si el valor no era un DOI)
+
+    Returns:
+        True si vale la pena consultarlo al proveedor
+    """
+    return bool(DOI_PATTERN.match(doi))
+
+
+def _format_date(parts: Sequence) -> str:
+    """Fecha ``YYYY[-MM[-DD]]`` desde ``date-parts`` de Crossref, como las fechas de ORCID."""
+    values = [int(part) for part in parts[:3] if isinstance(part, int) or str(part).isdigit()]
+    if not values:
+        return ""
+    return "-".join([f"{values[0]:04d}"] + [f"{value:02d}" for value in values[1:]])
+
+
+class DoiProvider(ABC):
+    """
+    Interfaz de los proveedores de metadatos por DOI.
+
+    Cada proveedor resuelve un lote de DOI normalizados en una llamada; los
+    DOI que no encuentra simplemente no aparecen en el resultado. Un error
+    (red, 5xx agotados los reintentos) se lanza como excepción: el lote no se
+    guarda en la caché y se vuelve a consultar en la siguiente ejecución.
+
+    Args:
+        workers: Consultas simultáneas que hará el enriquecedor
+    """
+
+    name = ""
+    batch_size = 20
+
+    def __init__(self, workers: int = 1):
+        self.workers = max(workers, 1)
+
+    @abstractmethod
+    def lookup(self, dois: Sequence[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Resuelve un lote de DOI.
+
+        Args:
+            dois: DOI normalizados (como máximo batch_size)
+
+        Returns:
+            DOI normalizado -> {"doi", "journal", "date"} de los encontrados
+        """
+
+    def close(self) -> None:
+        """Libera las conexiones del proveedor."""
+
+
+class CrossrefProvider(DoiProvider):
+    """
+    Metadatos de Crossref (``/works?filter=doi:...``), un lote por petición.
+
+    Usa su propio OrcidClient (sin token): reintentos, espera ante 429 y
+    límite de tasa independientes de los de ORCID. Con ``ORCID_ENRICH_MAILTO``
+    las peticiones se identifican para el "polite pool" de Crossref.
+
+    Args:
+        workers: Conexiones simultáneas
+        rate_limit: Peticiones por segundo (por defecto ORCID_ENRICH_RATE_LIMIT o 10)
+        base_url: URL de la API (por defecto CROSSREF_API_URL o https://api.crossref.org)
+    """
+
+    name = "crossref"
+    batch_size = 20
+
+    def __init__(self, workers: int = 1, rate_limit: Optional[float] = None, base_url: Optional[str] = None):
+        super().__init__(workers)
+        self.base_url = (base_url or os.getenv("CROSSREF_API_URL", "https://api.crossref.org")).rstrip("/")
+        if rate_limit is None:
+            rate_limit = float(os.getenv("ORCID_ENRICH_RATE_LIMIT", "10"))
+        self.client = OrcidClient(pool_size=self.workers, rate_limit=rate_limit, timeout=REQUEST_TIMEOUT)
+        mailto = os.getenv("ORCID_ENRICH_MAILTO")
+        self.headers = {"User-Agent": f"orcid-publicaciones (mailto:{mailto})"} if mailto else None
+
+    def lookup(self, dois: Sequence[str]) -> Dict[str, Dict[str, str]]:
+        query = urlencode({"filter": ",".join(f"doi:{doi}" for doi in dois), "rows": len(dois), "select": "DOI,container-title,issued"})
+        response = self.client.get(f"{self.base_url}/works?{query}", "", self.headers)
+        response.raise_for_status()
+        found = {}
+        for item in (loads(response.content).get("message") or {}).get("items") or ():
+            doi = normalize_doi(item.get("DOI", ""))
+            if not doi:
+                continue
+            titles = item.get("container-title") or [""]
+            date_parts = ((item.get("issued") or {}).get("date-parts") or [[]])[0] or []
+            found[doi] = {"doi": item["DOI"], "journal": clean_illegal_characters(titles[0] or "").strip(), "date": _format_date(date_parts)}
+        return found
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class StubProvider(DoiProvider):
+    """
+    Proveedor local para pruebas sin red.
+
+    Con ``path`` (o ``ORCID_ENRICH_STUB_FILE``) lee un JSON ``{doi: {"journal", "date"}}``
+    y solo encuentra esos DOI. Sin archivo, genera metadatos deterministas a
+    partir del DOI (revista y fecha dependen solo de su hash), útil para medir
+    el rendimiento del enriquecimiento.
+
+    Args:
+        workers: Consultas simultáneas
+        path: Archivo JSON con los metadatos (opcional)
+        latency_ms: Demora simulada por lote (por defecto ORCID_ENRICH_STUB_LATENCY_MS o 0)
+    """
+
+    name = "stub"
+    batch_size = 50
+
+    def __init__(self, workers: int = 1, path: Optional[str] = None, latency_ms: Optional[float] = None):
+        super().__init__(workers)
+        self.path = path or os.getenv("ORCID_ENRICH_STUB_FILE")
+        self.latency = (latency_ms if latency_ms is not None else float(os.getenv("ORCID_ENRICH_STUB_LATENCY_MS", "0"))) / 1000
+        self.records: Optional[Dict[str, Dict[str, str]]] = None
+        if self.path:
+            with open(self.path, "rb") as f:
+                self.records = {normalize_doi(doi) or doi: metadata for doi, metadata in loads(f.read()).items()}
+        self.calls = 0
+
+    def lookup(self, dois: Sequence[str]) -> Dict[str, Dict[str, str]]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.records is not None:
+            return {doi: {"doi": doi, "journal": self.records[doi].get("journal", ""), "date": self.records[doi].get("date", "")} for doi in dois if doi in self.records}
+
+        found = {}
+        for doi in dois:
+            digest = int(hashlib.sha1(doi.encode("utf-8")).hexdigest()[:8], 16)
+            found[doi] = {"doi": doi, "journal": f"Revista {digest % 500}", "date": f"{1990 + digest % 35}-{digest % 12 + 1:02d}-{digest % 28 + 1:02d}"}
+        return found
+
+
+# Proveedores de metadatos disponibles (--enrich)
+PROVIDERS = {
+    CrossrefProvider.name: CrossrefProvider,
+    StubProvider.name: StubProvider,
+}
+
+
+def create_provider(name: str, workers: int = 1) -> DoiProvider:
+    """
+    Crea un proveedor de metadatos por nombre.
+
+    Args:
+        name: Nombre del proveedor (clave de PROVIDERS)
+        workers: Consultas simultáneas
+
+    Returns:
+        Proveedor configurado
+
+    Raises:
+        ValueError: Si el proveedor no existe
+    """
+    if name not in PROVIDERS:
+        raise ValueError(f"Proveedor de enriquecimiento no soportado: {name}. Opciones: {', '.join(PROVIDERS)}")
+    return PROVIDERS[name](workers)
+
+
+class DoiCache:
+    """
+    Caché SQLite de los DOI ya resueltos, compartida entre ejecuciones.
+
+    Guarda tanto los DOI encontrados como los no encontrados (para no volver a
+    preguntar por ellos en cada ejecución); estos últimos se consultan de
+    nuevo pasados ``negative_ttl`` segundos. Las entradas son por proveedor.
+
+    Args:
+        path: Archivo SQLite
+        negative_ttl: Segundos de vigencia de un "no encontrado"
+    """
+
+    def __init__(self, path: str, negative_ttl: float = DEFAULT_NEGATIVE_TTL_DAYS * 24 * 3600):
+        self.path = path
+        self.negative_ttl = negative_ttl
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get_many(self, provider: str, dois: Sequence[str]) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Entradas vigentes de la caché.
+
+        Args:
+            provider: Nombre del proveedor
+            dois: DOI normalizados
+
+        Returns:
+            DOI -> metadatos (None si el proveedor no lo encontró); los DOI sin entrada vigente no aparecen
+        """
+        cached: Dict[str, Optional[Dict[str, str]]] = {}
+        expired = time.time() - self.negative_ttl
+        # Lotes por debajo del límite de parámetros de SQLite
+        for start in range(0, len(dois), 500):
+            chunk = dois[start:start + 500]
+            rows = self._conn.execute(f"SELECT doi, found, canonical_doi, journal, date, resolved FROM doi_metadata WHERE provider = ? AND doi IN ({', '.join('?' for _ in chunk)})", (provider, *chunk))
+            for doi, found, canonical, journal, date, resolved in rows:
+                if found:
+                    cached[doi] = {"doi": canonical, "journal": journal, "date": date}
+                elif resolved >= expired:
+                    cached[doi] = None
+        return cached
+
+    def put_many(self, provider: str, results: Dict[str, Optional[Dict[str, str]]]) -> None:
+        """
+        Guarda el resultado de un lote en una transacción.
+
+        Args:
+            provider: Nombre del proveedor
+            results: DOI -> metadatos, o None si no se encontró
+        """
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO doi_metadata (provider, doi, found, canonical_doi, journal, date, resolved) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(provider, doi, 1 if metadata else 0, (metadata or {}).get("doi"), (metadata or {}).get("journal"), (metadata or {}).get("date"), now) for doi, metadata in results.items()],
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def doi_cache_path(root: str) -> str:
+    """Archivo de la caché de DOI: ORCID_DOI_CACHE_FILE o ``cache/doi.sqlite``."""
+    configured = os.getenv("ORCID_DOI_CACHE_FILE")
+    if configured:
+        return configured if os.path.isabs(configured) else os.path.join(root, configured)
+    return os.path.join(root, "cache", "doi.sqlite")
+
+
+class DoiEnricher:
+    """
+    Resuelve los DOI de una ejecución y completa los campos vacíos de sus registros.
+
+    ``resolve`` recibe los DOI de todos los investigadores, los normaliza y
+    deduplica antes de consultar nada, toma de la caché los ya resueltos y
+    envía el resto al proveedor en lotes de ``provider.batch_size``, con
+    ``provider.workers`` lotes en vuelo. Un lote que falla se registra en el
+    log y sus DOI quedan sin enriquecer.
+
+    Args:
+        provider: Proveedor de metadatos
+        cache: Caché de DOI resueltos (opcional)
+        metrics: Métricas de la ejecución; el tiempo se mide en la fase enrich
+    """
+
+    def __init__(self, provider: DoiProvider, cache: Optional[DoiCache] = None, metrics: Metrics = DISABLED):
+        self.provider = provider
+        self.cache = cache
+        self.metrics = metrics
+        self.resolved: Dict[str, Optional[Dict[str, str]]] = {}
+        self.stats = {"provider": provider.name, "values": 0, "dois": 0, "not_doi": 0, "cached": 0, "looked_up": 0, "found": 0, "failed": 0, "batches": 0, "seconds": 0.0, "dois_per_s": 0.0, "filled": {field: 0 for field in ENRICHED_FIELDS}}
+
+    def resolve(self, values: Iterable[str]) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Resuelve los DOI de una ejecución.
+
+        Args:
+            values: Valores de la columna doi (con repeticiones y otros identificadores)
+
+        Returns:
+            DOI normalizado -> metadatos, o None si no se encontró
+        """
+        with self.metrics.phase("enrich"):
+            start = time.perf_counter()
+            dois = set()
+            for value in values:
+                self.stats["values"] += 1
+                doi = normalize_doi(value)
+                if is_valid_doi(doi):
+                    dois.add(doi)
+                else:
+                    self.stats["not_doi"] += 1
+            dois = sorted(dois)
+            self.stats["dois"] = len(dois)
+
+            if self.cache:
+                self.resolved.update(self.cache.get_many(self.provider.name, dois))
+            self.stats["cached"] = len(self.resolved)
+            pending = [doi for doi in dois if doi not in self.resolved]
+            batches = [pending[i:i + self.provider.batch_size] for i in range(0, len(pending), self.provider.batch_size)]
+
+            # Las consultas van en hilos; la caché se escribe desde este hilo (una conexión SQLite)
+            with ThreadPoolExecutor(max_workers=self.provider.workers, thread_name_prefix="orcid-enrich") as executor:
+                futures = {executor.submit(self.provider.lookup, batch): batch for batch in batches}
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    self.stats["batches"] += 1
+                    try:
+                        found = future.result()
+                    except Exception as e:
+                        self.stats["failed"] += len(batch)
+                        logging.warning(f"Enriquecimiento: falló un lote de {len(batch)} DOI en {self.provider.name}: {type(e).__name__}: {e}", extra={"phase": "enrich", "status": "error"})
+                        continue
+                    results = {doi: found.get(doi) for doi in batch}
+                    self.resolved.update(results)
+                    self.stats["looked_up"] += len(batch)
+                    if self.cache:
+                        self.cache.put_many(self.provider.name, results)
+
+            elapsed = time.perf_counter() - start
+            self.stats["found"] = sum(1 for metadata in self.resolved.values() if metadata)
+            self.stats["seconds"] = round(elapsed, 3)
+            self.stats["dois_per_s"] = round(len(dois) / elapsed, 1) if elapsed > 0 else 0.0
+        logging.info(f"Enriquecimiento ({self.provider.name}): {self.stats['dois']} DOI distintos, {self.stats['cached']} en caché, {self.stats['looked_up']} consultados en {self.stats['batches']} lotes, {self.stats['found']} encontrados", extra={"phase": "enrich", "enrich": self.stats})
+        return self.resolved
+
+    def enrich(self, record: Dict) -> Dict:
+        """
+        Completa los campos vacíos de un registro con los metadatos de su DOI.
+
+        - journal: si viene vacío
+        - date: si viene vacía o es un prefijo menos preciso de la del proveedor (``2021`` -> ``2021-05-03``)
+        - doi: se reemplaza por la forma canónica cuando venía como URL o con prefijo
+
+        Args:
+            record: Registro de salida
+
+        Returns:
+            El mismo registro, o una copia con los campos completados
+        """
+        doi = normalize_doi(record.get("doi", ""))
+        metadata = self.resolved.get(doi) if doi else None
+        if not metadata:
+            return record
+
+        record = dict(record)
+        filled = self.stats["filled"]
+        if not record.get("journal") and metadata.get("journal"):
+            record["journal"] = metadata["journal"]
+            filled["journal"] += 1
+        date, found_date = str(record.get("date") or ""), metadata.get("date") or ""
+        if found_date and len(found_date) > len(date) and found_date.startswith(date):
+            record["date"] = found_date
+            filled["date"] += 1
+        if metadata.get("doi") and record["doi"] != metadata["doi"] and record["doi"].strip().lower() != metadata["doi"].lower():
+            record["doi"] = metadata["doi"]
+            filled["doi"] += 1
+        return record
+
+    def close(self) -> None:
+        self.provider.close()
+        if self.cache:
+            self.cache.close()
+
+
+class EnrichingWriter(ResultWriter):
+    """
+    Escritor que completa cada registro con DoiEnricher antes de pasarlo a otro escritor.
+
+    Args:
+        writer: Escritor de destino
+        enricher: Enriquecedor con los DOI de la ejecución ya resueltos
+    """
+
+    def __init__(self, writer: ResultWriter, enricher: DoiEnricher):
+        super().__init__(writer.path, writer.columns)
+        self.writer = writer
+        self.enricher = enricher
+
+    def write(self, record: Dict) -> None:
+        self.writer.write(self.enricher.enrich(record))
+        self.rows += 1
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def build_enricher(root: str, provider: str, workers: int = 1, metrics: Metrics = DISABLED) -> DoiEnricher:
+    """
+    Crea el enriquecedor con la caché de DOI según las variables de entorno.
+
+    Args:
+        root: Carpeta raíz del proyecto
+        provider: Nombre del proveedor (clave de PROVIDERS)
+        workers: Consultas simultáneas al proveedor
+        metrics: Métricas de la ejecución
+
+    Returns:
+        Instancia de DoiEnricher
+
+    Raises:
+        ValueError: Si el proveedor no existe
+    """
+    ttl_days = float(os.getenv("ORCID_DOI_NEGATIVE_TTL_DAYS", str(DEFAULT_NEGATIVE_TTL_DAYS)))
+    return DoiEnricher(create_provider(provider, workers), DoiCache(doi_cache_path(root), ttl_days * 24 * 3600), metrics)
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from orcid.records import WORK_FIELDS, Researcher, WorkRecord
+
+
+class IncrementalStore:
+    """
+    Estado persistente entre ejecuciones para el modo incremental.
+
+    Guarda, por ORCID, el ``last-modified-date`` de la respuesta /works y los
+    registros extraídos en la ejecución anterior. Si el perfil no cambió, los
+    registros se sirven desde aquí sin volver a procesar los trabajos; los
+    datos del investigador (cédula, nombre) se toman siempre del archivo de
+    entrada actual. Al actualizar un perfil se calculan las publicaciones
+    agregadas y eliminadas.
+
+    Args:
+        path: Ruta del archivo JSON de estado
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.added: List[Dict] = []
+        self.removed: List[Dict] = []
+        self.stats = {"unchanged": 0, "changed": 0}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def lookup(self, orcid: str, last_modified: Optional[int], researcher: Researcher) -> Optional[List[WorkRecord]]:
+        """
+        Devuelve los registros guardados si el perfil no cambió desde la última ejecución.
+
+        Args:
+            orcid: Identificador ORCID
+            last_modified: ``last-modified-date`` de la respuesta actual
+            researcher: Investigador actual, al que se asocian los registros guardados
+
+        Returns:
+            Lista de registros o None si el perfil cambió o no existe
+        """
+        entry = self.entries.get(orcid)
+        if entry is None or last_modified is None or entry.get("last_modified") != last_modified:
+            return None
+
+        with self._lock:
+            self.stats["unchanged"] += 1
+        return [WorkRecord(researcher, **{field: work.get(field, "") for field in WORK_FIELDS}) for work in entry["works"]]
+
+    def update(self, orcid: str, last_modified: Optional[int], records: List[Dict]) -> None:
+        """
+        Reemplaza el estado de un ORCID y registra las diferencias con el anterior.
+
+        Args:
+            orcid: Identificador ORCID
+            last_modified: ``last-modified-date`` de la respuesta actual
+            records: Registros extraídos en esta ejecución
+        """
+        with self._lock:
+            previous = self.entries.get(orcid, {}).get("works", [])
+            previous_titles = {work.get("title", "") for work in previous}
+            current_titles = {record.get("title", "") for record in records}
+
+            # Los registros de error (sin título) no son publicaciones
+            self.added.extend(r for r in records if r.get("title") and r["title"] not in previous_titles)
+            self.removed.extend(w for w in previous if w.get("title") and w["title"] not in current_titles)
+
+            self.entries[orcid] = {"last_modified": last_modified, "works": [dict(record) for record in records]}
+            self.stats["changed"] += 1
+
+    def last_modified(self, orcid: str) -> Optional[int]:
+        """
+        ``last-modified-date`` guardado para un ORCID (el de esta ejecución si ya se actualizó).
+
+        Args:
+            orcid: Identificador ORCID
+
+        Returns:
+            Valor guardado o None si el ORCID no está en el estado
+        """
+        with self._lock:
+            return self.entries.get(orcid, {}).get("last_modified")
+
+    def restore(self, orcid: str, last_modified: Optional[int], records: List[Dict]) -> None:
+        """
+        Aplica al estado un investigador recuperado de la bitácora al reanudar.
+
+        Si el perfil no cambió respecto al estado guardado solo se cuenta como
+        sin cambios (igual que en lookup); si cambió se actualiza con update.
+
+        Args:
+            orcid: Identificador ORCID
+            last_modified: ``last-modified-date`` registrado en la bitácora
+            records: Registros registrados en la bitácora
+        """
+        if last_modified is not None and self.last_modified(orcid) == last_modified:
+            with self._lock:
+                self.stats["unchanged"] += 1
+            return
+        self.update(orcid, last_modified, records)
+
+    def save(self) -> None:
+        """Escribe el estado en disco de forma atómica."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # default: escalares de numpy/pandas que llegan desde el DataFrame de entrada
+            json.dump(self.entries, f, ensure_ascii=False, separators=(",", ":"), default=lambda o: o.item() if hasattr(o, "item") else str(o))
+        os.replace(tmp_path, self.path)
+
+    def delta_records(self) -> List[Dict]:
+        """
+        Publicaciones agregadas y eliminadas desde la ejecución anterior.
+
+        Returns:
+            Lista de registros con la columna ``cambio`` ("agregada" / "eliminada")
+        """
+        return [{"cambio": "agregada", **r} for r in self.added] + [{"cambio": "eliminada", **r} for r in self.removed]
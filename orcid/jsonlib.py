@@ -0,0 +1,24 @@
+"""
+Decodificador JSON usado para las respuestas de ORCID.
+
+Si ``orjson`` está instalado se usa por ser varias veces más rápido que el
+módulo estándar en payloads grandes; si no, se usa ``json`` sin cambios.
+"""
+
+try:
+    import orjson
+
+    JSON_DECODER = "orjson"
+
+    def loads(data):
+        """Decodifica JSON desde bytes o str."""
+        return orjson.loads(data)
+
+except ImportError:
+    import json
+
+    JSON_DECODER = "json"
+
+    def loads(data):
+        """Decodifica JSON desde bytes o str."""
+        return json.loads(data)
@@ -0,0 +1,226 @@
+import atexit
+import gzip
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import time
+from datetime import datetime
+from typing import Optional
+
+# Log de la ejecución actual y carpeta donde se archivan los anteriores (comprimidos)
+LOG_FILE = os.path.join(os.path.dirname(__file__), "orcid.log")
+LOG_FOLDER = os.path.join(os.path.dirname(__file__), "logs")
+
+# Rotación por defecto: tamaño máximo del log, antigüedad máxima y archivos conservados
+DEFAULT_MAX_MB = 50
+DEFAULT_ROTATE_HOURS = 24
+DEFAULT_BACKUPS = 30
+
+# Marca de los mensajes de alto volumen (uno por trabajo) sujetos a muestreo:
+# logging.error(..., extra=SAMPLED)
+SAMPLED = {"sampled": True}
+
+# Atributos propios de LogRecord; todo lo demás viene de ``extra`` y va como campo del JSON
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sampled", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Una línea JSON por mensaje: fecha, nivel, hilo, texto y los campos de ``extra``.
+
+    Los campos estructurados (``orcid``, ``phase``, ``latency_ms``, ``status``,
+    ``works``, ...) se pasan con ``extra`` y permiten filtrar el log con jq o
+    cargarlo en pandas sin analizar el texto de cada mensaje.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Deja pasar uno de cada ``1 / rate`` mensajes marcados con SAMPLED; el resto pasa siempre.
+
+    El muestreo es por conteo (no aleatorio): con rate=0.1 se conserva el 1.º,
+    11.º, 21.º... mensaje de alto volumen. Los conservados llevan el campo
+    ``sample_rate`` para poder escalar los conteos al analizar el log.
+
+    Args:
+        rate: Fracción de mensajes muestreados que se conserva (0 < rate <= 1)
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self.rate = rate
+        self._counter = itertools.count()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False) or self.every == 1:
+            return True
+        if self.every and next(self._counter) % self.every == 0:
+            record.sample_rate = self.rate
+            return True
+        self.dropped += 1
+        return False
+
+
+class ArchivingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Log en archivo que se rota por tamaño o por antigüedad, archivando el anterior comprimido.
+
+    Al rotar, el archivo actual se comprime con gzip en ``archive_dir`` con la
+    fecha y hora en el nombre (``orcid_20241001_083000.log.gz``) y se conservan
+    solo los ``backups`` archivos más recientes. Corre en el hilo escritor del
+    QueueListener, así que la compresión no bloquea a los workers.
+
+    Args:
+        filename: Ruta del log activo
+        archive_dir: Carpeta de los logs archivados
+        max_bytes: Tamaño a partir del cual se rota (0 = sin límite)
+        interval: Segundos tras los cuales se rota (0 = sin límite)
+        backups: Archivos comprimidos que se conservan
+    """
+
+    def __init__(self, filename: str, archive_dir: str, max_bytes: int, interval: float, backups: int):
+        super().__init__(filename, mode="a", maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+        self.archive_dir = archive_dir
+        self.interval = interval
+        self.opened_at = time.time()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.interval and time.time() - self.opened_at >= self.interval:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        archive_log(self.baseFilename, self.archive_dir, self.backupCount)
+        self.opened_at = time.time()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que encola el registro tal cual: el texto, el JSON y la traza se arman en el hilo escritor.
+
+    El ``prepare`` estándar formatea y copia cada registro en el hilo que lo
+    emite, para poder enviarlo a otro proceso; aquí la cola es del mismo
+    proceso y ningún otro handler usa el registro, así que el hilo que llama
+    a ``logging`` solo paga el filtro y el ``put`` en la cola.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def archive_log(path: str, archive_dir: str, backups: int = DEFAULT_BACKUPS) -> Optional[str]:
+    """
+    Comprime un log en la carpeta de archivo y elimina los archivados más antiguos.
+
+    Args:
+        path: Log a archivar (se elimina tras comprimirlo)
+        archive_dir: Carpeta de los logs archivados
+        backups: Archivos comprimidos que se conservan
+
+    Returns:
+        Ruta del archivo comprimido, o None si no había nada que archivar
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    os.makedirs(archive_dir, exist_ok=True)
+    stem = f"{os.path.splitext(os.path.basename(path))[0]}_{time.strftime('%Y%m%d_%H%M%S')}"
+    target = os.path.join(archive_dir, f"{stem}.log.gz")
+    for suffix in itertools.count(1):
+        if not os.path.exists(target):
+            break
+        target = os.path.join(archive_dir, f"{stem}_{suffix}.log.gz")
+
+    with open(path, "rb") as source, gzip.open(target, "wb") as compressed:
+        shutil.copyfileobj(source, compressed)
+    os.remove(path)
+
+    # Por fecha de modificación: los sufijos _1, _2... de un mismo segundo no ordenan bien por nombre
+    archived = sorted((entry for entry in os.scandir(archive_dir) if entry.name.endswith(".log.gz")), key=lambda entry: entry.stat().st_mtime_ns)
+    for entry in archived[:max(len(archived) - backups, 0)]:
+        os.remove(entry.path)
+    return target
+
+
+def setup_logging(log_file: str = LOG_FILE, archive_dir: str = LOG_FOLDER, level: int = logging.INFO) -> None:
+    """
+    Configura el log de la ejecución: JSON por línea, escrito por un hilo en segundo plano.
+
+    Los hilos que registran mensajes solo encolan el registro (``QueueHandler``);
+    un único hilo escritor (``QueueListener``) lo formatea, lo escribe y rota
+    el archivo, así que los workers nunca compiten por el archivo ni esperan
+    la escritura a disco. El log de la ejecución anterior se archiva
+    comprimido al iniciar. Los mensajes marcados con SAMPLED se muestrean
+    antes de encolarse según ORCID_LOG_SAMPLE.
+
+    Configuración (variables de entorno): ORCID_LOG_MAX_MB, ORCID_LOG_ROTATE_HOURS,
+    ORCID_LOG_BACKUPS y ORCID_LOG_SAMPLE (fracción de mensajes por trabajo que se
+    conserva, 1 = todos).
+
+    No se hace al importar ningún módulo: solo los comandos que procesan datos
+    (run, merge) lo llaman. Llamarlo de nuevo no tiene efecto.
+
+    Args:
+        log_file: Ruta del log activo
+        archive_dir: Carpeta de los logs archivados
+        level: Nivel mínimo de los mensajes
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    backups = int(os.getenv("ORCID_LOG_BACKUPS", DEFAULT_BACKUPS))
+    archive_log(log_file, archive_dir, backups)
+
+    max_bytes = int(float(os.getenv("ORCID_LOG_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+    interval = float(os.getenv("ORCID_LOG_ROTATE_HOURS", DEFAULT_ROTATE_HOURS)) * 3600
+    file_handler = ArchivingFileHandler(log_file, archive_dir, max_bytes, interval, backups)
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    sampler = SamplingFilter(float(os.getenv("ORCID_LOG_SAMPLE", "1")))
+    queue_handler.addFilter(sampler)
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _listener.start()
+
+    def stop() -> None:
+        global _listener
+        if sampler.dropped:
+            logging.info(f"Mensajes por trabajo omitidos por muestreo: {sampler.dropped}", extra={"dropped": sampler.dropped, "sample_rate": sampler.rate})
+        # Vacía la cola y detiene el hilo escritor antes de cerrar el archivo
+        _listener.stop()
+        root.removeHandler(queue_handler)
+        file_handler.close()
+        _listener = None
+
+    atexit.register(stop)
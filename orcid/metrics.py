@@ -0,0 +1,226 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional
+
+# Fases del procesamiento, en el orden en que se muestran
+PHASES = ("load", "auth", "fetch", "parse", "dedup", "sanitize", "enrich", "export")
+
+# Límites superiores (segundos) del histograma de latencia de peticiones, como en Prometheus
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_NULL_CONTEXT = nullcontext()
+
+
+class Metrics:
+    """
+    Métricas de una ejecución: tiempos por fase y latencia de las peticiones HTTP.
+
+    Cada fase acumula tiempo de pared y de CPU del hilo que la ejecuta
+    (``time.thread_time``). Las fases que corren en los workers (fetch, parse)
+    suman el tiempo de todos los hilos, así que con varios workers pueden
+    superar la duración total de la ejecución. Las peticiones se agregan en un
+    histograma de buckets fijos, junto con los bytes recibidos y los códigos de
+    estado. Es seguro para múltiples hilos.
+
+    Args:
+        enabled: Si es False todas las operaciones son no-ops (ver DISABLED)
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.phases: Dict[str, Dict[str, float]] = {name: {"wall": 0.0, "cpu": 0.0, "calls": 0} for name in PHASES}
+        self.latency_counts: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.requests = 0
+        self.bytes = 0
+        self.statuses: Dict[str, int] = {}
+        self.retries = 0
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            with self._lock:
+                phase = self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+                phase["wall"] += wall
+                phase["cpu"] += cpu
+                phase["calls"] += 1
+
+    def phase(self, name: str):
+        """
+        Context manager que mide una fase.
+
+        Args:
+            name: Nombre de la fase (ver PHASES)
+        """
+        return self._timed(name) if self.enabled else _NULL_CONTEXT
+
+    def observe_request(self, seconds: float, status: Optional[int], received: int = 0) -> None:
+        """
+        Registra una petición HTTP (cada intento, incluidos los reintentos).
+
+        Args:
+            seconds: Latencia de la petición
+            status: Código de estado, o None si falló sin respuesta
+            received: Bytes recibidos del servidor (comprimidos)
+        """
+        if not self.enabled:
+            return
+        status_key = str(status) if status is not None else "error"
+        with self._lock:
+            self.latency_counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.latency_sum += seconds
+            self.requests += 1
+            self.bytes += received
+            self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+
+    def observe_retry(self) -> None:
+        """Registra un reintento."""
+        if self.enabled:
+            with self._lock:
+                self.retries += 1
+
+    def latency_quantile(self, q: float) -> float:
+        """
+        Cuantil aproximado de latencia, interpolando dentro del bucket (como histogram_quantile).
+
+        Args:
+            q: Cuantil entre 0 y 1
+
+        Returns:
+            Latencia estimada en segundos (0 si no hubo peticiones)
+        """
+        with self._lock:
+            counts = list(self.latency_counts)
+        total = sum(counts)
+        if not total:
+            return 0.0
+
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                lower = LATENCY_BUCKETS[i - 1] if i > 0 else 0.0
+                if i == len(LATENCY_BUCKETS):
+                    return lower  # Bucket +Inf: no hay límite superior
+                return lower + (LATENCY_BUCKETS[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return LATENCY_BUCKETS[-1]
+
+    @property
+    def elapsed(self) -> float:
+        """Segundos desde el inicio de la ejecución."""
+        return time.perf_counter() - self._start
+
+    def snapshot(self) -> Dict:
+        """Todas las métricas como diccionario serializable."""
+        with self._lock:
+            phases = {name: {"wall_s": round(v["wall"], 4), "cpu_s": round(v["cpu"], 4), "calls": v["calls"]} for name, v in self.phases.items()}
+            cumulative, buckets = 0, {}
+            for bound, count in zip(list(LATENCY_BUCKETS) + ["+Inf"], self.latency_counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            requests = {"count": self.requests, "latency_sum_s": round(self.latency_sum, 4), "latency_buckets": buckets, "bytes_received": self.bytes, "statuses": dict(self.statuses), "retries": self.retries}
+
+        requests["latency_p50_s"] = round(self.latency_quantile(0.5), 4)
+        requests["latency_p95_s"] = round(self.latency_quantile(0.95), 4)
+        return {"started": self.started, "elapsed_s": round(self.elapsed, 3), "phases": phases, "requests": requests}
+
+    def write_json(self, path: str, extra: Optional[Dict] = None) -> None:
+        """
+        Guarda las métricas en JSON.
+
+        Args:
+            path: Ruta del archivo
+            extra: Datos adicionales de la ejecución (resumen, caché, ...)
+        """
+        data = self.snapshot()
+        if extra:
+            data.update(extra)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Guarda las métricas en formato texto de Prometheus (para el textfile collector de node_exporter).
+
+        Se escribe en un archivo temporal y se renombra, para que el collector
+        nunca lea un archivo a medio escribir.
+
+        Args:
+            path: Ruta del archivo .prom
+        """
+        data = self.snapshot()
+        lines = [
+            "# HELP orcid_run_duration_seconds Duración de la ejecución",
+            "# TYPE orcid_run_duration_seconds gauge",
+            f"orcid_run_duration_seconds {data['elapsed_s']}",
+            "# HELP orcid_run_timestamp_seconds Inicio de la ejecución",
+            "# TYPE orcid_run_timestamp_seconds gauge",
+            f"orcid_run_timestamp_seconds {data['started']:.0f}",
+            "# HELP orcid_phase_wall_seconds Tiempo de pared acumulado por fase",
+            "# TYPE orcid_phase_wall_seconds gauge",
+        ]
+        lines += [f'orcid_phase_wall_seconds{{phase="{name}"}} {v["wall_s"]}' for name, v in data["phases"].items()]
+        lines += ["# HELP orcid_phase_cpu_seconds Tiempo de CPU acumulado por fase", "# TYPE orcid_phase_cpu_seconds gauge"]
+        lines += [f'orcid_phase_cpu_seconds{{phase="{name}"}} {v["cpu_s"]}' for name, v in data["phases"].items()]
+
+        requests = data["requests"]
+        lines += ["# HELP orcid_request_duration_seconds Latencia de las peticiones a ORCID", "# TYPE orcid_request_duration_seconds histogram"]
+        lines += [f'orcid_request_duration_seconds_bucket{{le="{bound}"}} {count}' for bound, count in requests["latency_buckets"].items()]
+        lines += [f"orcid_request_duration_seconds_sum {requests['latency_sum_s']}", f"orcid_request_duration_seconds_count {requests['count']}"]
+        lines += ["# HELP orcid_requests_total Peticiones por código de estado", "# TYPE orcid_requests_total counter"]
+        lines += [f'orcid_requests_total{{status="{status}"}} {count}' for status, count in sorted(requests["statuses"].items())]
+        lines += [
+            "# HELP orcid_received_bytes_total Bytes recibidos de ORCID",
+            "# TYPE orcid_received_bytes_total counter",
+            f"orcid_received_bytes_total {requests['bytes_received']}",
+            "# HELP orcid_retries_total Reintentos de peticiones",
+            "# TYPE orcid_retries_total counter",
+            f"orcid_retries_total {requests['retries']}",
+        ]
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+
+# Instancia no-op para cuando no se piden métricas
+DISABLED = Metrics(enabled=False)
+
+
+def metrics_directory(root: str) -> str:
+    """Carpeta de métricas: ORCID_METRICS_DIR o ``metrics/`` en la raíz del proyecto."""
+    return os.getenv("ORCID_METRICS_DIR", os.path.join(root, "metrics"))
+
+
+def latest_metrics(directory: str) -> Optional[str]:
+    """
+    Archivo de métricas de la ejecución más reciente.
+
+    Los nombres llevan la fecha y hora (``metrics_2024-10-01_083000.json``), así
+    que el más reciente es el último en orden alfabético.
+
+    Args:
+        directory: Carpeta de métricas
+
+    Returns:
+        Ruta del JSON, o None si no hay ninguno
+    """
+    if not os.path.isdir(directory):
+        return None
+    names = sorted(name for name in os.listdir(directory) if name.startswith("metrics_") and name.endswith(".json"))
+    return os.path.join(directory, names[-1]) if names else None
@@ -0,0 +1,316 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from rich.console import Console
+
+from orcid.metrics import DISABLED
+from orcid.records import Researcher
+from orcid.utils import build_user_records, fetch_error_record, fetch_works, get_client, summarize_works
+
+# Etapas del pipeline, en orden
+STAGES = ("fetch", "parse", "write")
+
+# Perfiles que admite cada cola entre etapas, por cada hilo de descarga
+QUEUE_SIZE_PER_WORKER = 4
+
+# Intervalo con que los hilos bloqueados en una cola revisan si el pipeline se detuvo
+_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+def _timed_summary(payload: Any) -> Tuple[Tuple, float]:
+    """summarize_works y el tiempo que tomó (se ejecuta en los procesos de parseo)."""
+    start = time.perf_counter()
+    summary = summarize_works(payload)
+    return summary, time.perf_counter() - start
+
+
+class StageStats:
+    """
+    Tiempos acumulados de una etapa del pipeline, sumando todos sus hilos o procesos.
+
+    - busy: trabajando (descarga, parseo o escritura)
+    - starved: esperando entrada de la etapa anterior
+    - blocked: esperando lugar en la cola de la etapa siguiente (backpressure)
+
+    Args:
+        name: Nombre de la etapa
+        workers: Hilos o procesos de la etapa
+    """
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.busy = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+        self.items = 0
+        self._lock = threading.Lock()
+
+    def add(self, busy: float = 0.0, starved: float = 0.0, blocked: float = 0.0, items: int = 0) -> None:
+        with self._lock:
+            self.busy += busy
+            self.starved += starved
+            self.blocked += blocked
+            self.items += items
+
+    def to_dict(self, elapsed: float) -> Dict[str, float]:
+        """
+        Resumen de la etapa.
+
+        Args:
+            elapsed: Duración del pipeline en segundos
+
+        Returns:
+            Diccionario con workers, items, tiempos y utilización (busy / (workers * elapsed))
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "items": self.items,
+                "busy_s": round(self.busy, 3),
+                "starved_s": round(self.starved, 3),
+                "blocked_s": round(self.blocked, 3),
+                "utilization": round(self.busy / (self.workers * elapsed), 3) if elapsed > 0 else 0.0,
+            }
+
+
+class Pipeline:
+    """
+    Procesa los investigadores en tres etapas concurrentes unidas por colas acotadas.
+
+    - fetch: ``workers`` hilos descargan /works (red o caché en disco) sin decodificar el cuerpo
+    - parse: decodifica el JSON y extrae los trabajos (summarize_works) en un hilo, o en
+      ``processes`` procesos para no competir por el GIL con perfiles grandes
+    - write: quien consume los resultados (process_users: registros, deduplicación y escritura)
+
+    Cada cola admite ``queue_size`` perfiles; si una etapa se atrasa, la anterior
+    se detiene al llenarla (backpressure), así la memoria queda acotada y el
+    tiempo de espera muestra cuál es el cuello de botella. Los resultados se
+    entregan en el orden del listado, como con _iter_user_results, de modo que
+    la deduplicación y el archivo de salida no cambian.
+
+    Args:
+        credentials: Token de acceso ORCID
+        console: Rich Console para output
+        workers: Hilos de descarga
+        processes: Procesos de parseo (0 = un hilo)
+        queue_size: Perfiles por cola (por defecto QUEUE_SIZE_PER_WORKER por hilo de descarga)
+        fetch_options: client, cache, offline, store y metrics, como en get_records
+    """
+
+    def __init__(self, credentials: str, console: Console, workers: int, processes: int = 0, queue_size: Optional[int] = None, fetch_options: Optional[Dict] = None):
+        options = fetch_options or {}
+        self.credentials = credentials
+        self.console = console
+        self.workers = max(workers, 1)
+        self.processes = max(processes, 0)
+        self.queue_size = queue_size or self.workers * QUEUE_SIZE_PER_WORKER
+        self.client = options.get("client") or get_client()
+        self.cache = options.get("cache")
+        self.offline = options.get("offline", False)
+        self.store = options.get("store")
+        self.metrics = options.get("metrics") or DISABLED
+        self.stages = {"fetch": StageStats("fetch", self.workers), "parse": StageStats("parse", self.processes or 1), "write": StageStats("write", 1)}
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+
+    def _put(self, target: queue.Queue, item: Any, stage: StageStats) -> bool:
+        """Encola esperando lugar (backpressure); False si el pipeline se detuvo."""
+        start = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    target.put(item, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            stage.add(blocked=time.perf_counter() - start)
+
+    def _get(self, source: queue.Queue, stage: StageStats) -> Any:
+        """Desencola esperando entrada; _DONE si el pipeline se detuvo."""
+        start = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    return source.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+            return _DONE
+        finally:
+            stage.add(starved=time.perf_counter() - start)
+
+    def _fetch(self, user: Dict) -> Tuple[Any, Optional[Exception], float]:
+        """Etapa fetch: cuerpo de /works de un investigador (o la excepción de la descarga)."""
+        orcid = user.get("orcid")
+        if not orcid:
+            return None, None, 0.0
+
+        start = time.perf_counter()
+        try:
+            with self.metrics.phase("fetch"):
+                payload, error = fetch_works(orcid, self.credentials, self.client, self.cache, self.offline, decode=False), None
+        except Exception as e:
+            payload, error = None, e
+        elapsed = time.perf_counter() - start
+        self.stages["fetch"].add(busy=elapsed, items=1)
+        return payload, error, elapsed
+
+    def _dispatch(self, users: Iterator[Dict], executor: ThreadPoolExecutor, fetched: queue.Queue) -> None:
+        """Envía las descargas en orden; se detiene cuando la cola de la etapa parse está llena."""
+        try:
+            for user in users:
+                if self._stop.is_set():
+                    return
+                try:
+                    future = executor.submit(self._fetch, user)
+                except RuntimeError:
+                    return  # El executor ya se cerró: el consumidor se detuvo
+                if not self._put(fetched, (user, future), self.stages["fetch"]):
+                    return
+        finally:
+            self._put(fetched, _DONE, self.stages["fetch"])
+
+    def _parse(self, fetched: queue.Queue, parsed: queue.Queue, pool: Optional[ProcessPoolExecutor]) -> None:
+        """Etapa parse: decodifica y extrae los trabajos en orden (o los envía a los procesos de parseo)."""
+        stage = self.stages["parse"]
+        try:
+            while True:
+                item = self._get(fetched, stage)
+                if item is _DONE:
+                    return
+
+                user, future = item
+                start = time.perf_counter()
+                try:
+                    payload, error, fetch_seconds = future.result()
+                except CancelledError:
+                    return
+                stage.add(starved=time.perf_counter() - start)
+
+                summary: Any = None
+                if error is None and payload is not None:
+                    if pool is not None:
+                        summary = pool.submit(_timed_summary, payload)
+                    else:
+                        start = time.perf_counter()
+                        try:
+                            summary = summarize_works(payload)
+                        except Exception as e:
+                            error = e
+                        stage.add(busy=time.perf_counter() - start, items=1)
+
+                if not self._put(parsed, (user, summary, error, fetch_seconds), stage):
+                    return
+        finally:
+            self._put(parsed, _DONE, stage)
+
+    def _records(self, user: Dict, summary: Any, error: Optional[Exception], fetch_seconds: float) -> List[Dict]:
+        """Etapa write: registros de un investigador, igual que get_records."""
+        orcid = user.get("orcid")
+        if not orcid:
+            logging.error(f"ORCID vacío para usuario: {user.get('nombre', 'Desconocido')}")
+            return []
+
+        researcher = Researcher.from_user(user)
+        records: List[Dict] = []
+
+        def log_fields(status: str, **fields) -> Dict:
+            return {"orcid": orcid, "phase": "fetch", "status": status, "latency_ms": round(fetch_seconds * 1000, 1), **fields}
+
+        try:
+            if error is not None:
+                raise error
+            last_modified, group_count, works, errors = summary
+            added = build_user_records(researcher, last_modified, group_count, lambda: (works, errors), records, self.console, self.store, self.metrics, log_fields("ok"))
+            if added is not None and self.store is not None:
+                self.store.update(orcid, last_modified, [record for _, record in added])
+        except Exception as e:
+            records.append(fetch_error_record(researcher, e, self.console, log_fields))
+        return records
+
+    def run(self, users: Iterator[Dict]) -> Iterator[Tuple[Dict, Optional[List[Dict]], Optional[Exception]]]:
+        """
+        Procesa los investigadores y entrega sus registros en el orden del listado.
+
+        El tiempo que el consumidor tarda entre un resultado y el siguiente se
+        cuenta como trabajo de la etapa write.
+
+        Args:
+            users: Iterador de diccionarios de usuario
+
+        Yields:
+            Tuplas (usuario, registros, None), como _iter_user_results
+        """
+        fetched: queue.Queue = queue.Queue(self.queue_size)
+        parsed: queue.Queue = queue.Queue(self.queue_size)
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="orcid-fetch")
+        pool = ProcessPoolExecutor(max_workers=self.processes) if self.processes else None
+        threads = [
+            threading.Thread(target=self._dispatch, args=(users, executor, fetched), name="orcid-dispatch", daemon=True),
+            threading.Thread(target=self._parse, args=(fetched, parsed, pool), name="orcid-parse", daemon=True),
+        ]
+        write = self.stages["write"]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(parsed, write)
+                if item is _DONE:
+                    break
+
+                user, summary, error, fetch_seconds = item
+                if isinstance(summary, Future):
+                    wait = time.perf_counter()
+                    try:
+                        summary, seconds = summary.result()
+                        self.stages["parse"].add(busy=seconds, items=1)
+                    except Exception as e:
+                        summary, error = None, e
+                    write.add(starved=time.perf_counter() - wait)
+
+                busy = time.perf_counter()
+                records = self._records(user, summary, error, fetch_seconds)
+                yield user, records, None
+                write.add(busy=time.perf_counter() - busy, items=1)
+        finally:
+            self._stop.set()
+            # Ante una interrupción, no iniciar las descargas ni los parseos pendientes
+            while True:
+                try:
+                    item = fetched.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _DONE:
+                    item[1].cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+            for thread in threads:
+                thread.join()
+            self.elapsed = time.perf_counter() - start
+
+    def stats(self) -> Dict:
+        """
+        Utilización de cada etapa; la de mayor utilización es el cuello de botella.
+
+        Returns:
+            Diccionario con la duración, el tamaño de las colas, las etapas y el cuello de botella
+        """
+        stages = {name: self.stages[name].to_dict(self.elapsed) for name in STAGES}
+        return {
+            "elapsed_s": round(self.elapsed, 3),
+            "queue_size": self.queue_size,
+            "parse_processes": self.processes,
+            "stages": stages,
+            "bottleneck": max(STAGES, key=lambda name: stages[name]["utilization"]),
+        }
@@ -0,0 +1,249 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Limitador de tasa tipo token bucket, seguro para múltiples hilos.
+
+    Todos los workers comparten la misma instancia, de modo que la tasa
+    total de peticiones se mantiene bajo la cuota de la API de ORCID
+    sin importar cuántos hilos estén activos.
+
+    Args:
+        rate: Tokens (peticiones) por segundo. Un valor <= 0 desactiva el límite
+        capacity: Máximo de tokens acumulables (ráfaga). Por defecto igual a ``rate``
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(self.rate, 1.0)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Reserva tokens, esperando lo necesario si el balance es insuficiente.
+
+        La reserva se hace bajo el lock y la espera fuera de él, así los hilos
+        se atienden en orden de llegada sin bloquearse mutuamente.
+
+        Args:
+            tokens: Cantidad de tokens a consumir
+
+        Returns:
+            Segundos esperados antes de poder continuar
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket cuya tasa se ajusta con AIMD (aumento aditivo, reducción multiplicativa).
+
+    Cada respuesta correcta sube la tasa en ``increase / rate``, es decir, unas
+    ``increase`` peticiones/s más por cada segundo de tráfico sin errores, hasta
+    la tasa configurada. Cada 429 la multiplica por ``decrease`` (como mucho una
+    vez por ``cooldown`` segundos, para que varios 429 simultáneos de distintos
+    hilos no la hundan hasta el mínimo) y, si la respuesta trae Retry-After,
+    pausa a todos los hilos hasta ese momento.
+
+    Args:
+        rate: Tasa máxima en peticiones por segundo (<= 0: sin límite, solo se respeta Retry-After)
+        min_rate: Tasa mínima tras reducciones
+        increase: Peticiones/s que se recuperan por segundo de tráfico correcto
+        decrease: Factor de reducción ante un 429
+        cooldown: Segundos mínimos entre dos reducciones
+    """
+
+    def __init__(self, rate: float, min_rate: float = 1.0, increase: float = 1.0, decrease: float = 0.5, cooldown: float = 1.0):
+        super().__init__(rate)
+        self.max_rate = self.rate
+        self.min_rate = min(min_rate, self.max_rate) if self.max_rate > 0 else 0.0
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.throttled = 0
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            pause = self._paused_until - time.monotonic()
+
+        waited = 0.0
+        if pause > 0:
+            time.sleep(pause)
+            waited = pause
+        return waited + super().acquire(tokens)
+
+    def on_success(self) -> None:
+        """Aumento aditivo tras una respuesta correcta."""
+        if self.max_rate <= 0 or self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+            self.capacity = max(self.rate, 1.0)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Reducción multiplicativa tras un 429.
+
+        Args:
+            retry_after: Segundos indicados por el servidor en Retry-After (opcional)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            if self.max_rate > 0 and now - self._last_decrease >= self.cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.capacity = max(self.rate, 1.0)
+                self._tokens = min(self._tokens, 0.0)  # Sin ráfaga acumulada al reanudar
+                self._last_decrease = now
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """
+    Interpreta el encabezado Retry-After (segundos o fecha HTTP).
+
+    Args:
+        value: Valor del encabezado
+
+    Returns:
+        Segundos a esperar, o None si no hay encabezado o no es válido
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Espera exponencial con jitter completo: uniforme entre 0 y min(cap, base * 2^intento).
+
+    El jitter evita que todos los hilos reintenten al mismo tiempo.
+
+    Args:
+        attempt: Número de reintento (0 = primero)
+        base: Espera base en segundos
+        cap: Espera máxima en segundos
+
+    Returns:
+        Segundos a esperar
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Interruptor que pausa todas las peticiones durante una caída del servicio.
+
+    Tras ``threshold`` fallos consecutivos (5xx, timeouts, errores de conexión)
+    se abre: ningún hilo hace peticiones durante ``cooldown`` segundos. Luego
+    deja pasar una sola petición de prueba; si responde se cierra, y si falla
+    vuelve a abrirse con el doble de espera (hasta ``max_cooldown``). Los hilos
+    esperan en lugar de fallar, así una caída no se convierte en cientos de
+    investigadores con error.
+
+    Args:
+        threshold: Fallos consecutivos para abrir el interruptor
+        cooldown: Segundos de pausa iniciales
+        max_cooldown: Pausa máxima entre pruebas
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, max_cooldown: float = 300.0):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = self.CLOSED
+        self.opened = 0
+        self._failures = 0
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._probing = False
+        self._cond = threading.Condition()
+
+    def before_request(self) -> float:
+        """
+        Espera mientras el interruptor esté abierto o haya una prueba en curso.
+
+        Returns:
+            Segundos esperados
+        """
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                if self.state == self.CLOSED:
+                    break
+                now = time.monotonic()
+                if self.state == self.OPEN:
+                    if now < self._open_until:
+                        self._cond.wait(self._open_until - now)
+                        continue
+                    self.state = self.HALF_OPEN
+                if not self._probing:
+                    self._probing = True
+                    break
+                self._cond.wait()
+        return time.monotonic() - start
+
+    def record_success(self) -> None:
+        """El servicio respondió (aunque sea con 4xx): cierra el interruptor."""
+        with self._cond:
+            self._failures = 0
+            if self.state != self.CLOSED:
+                logging.info("Servicio ORCID recuperado: se reanudan las peticiones")
+                self.state = self.CLOSED
+                self._cooldown = self.base_cooldown
+                self._probing = False
+                self._cond.notify_all()
+
+    def record_failure(self) -> None:
+        """Fallo del servicio: abre el interruptor al alcanzar el umbral o si falló la prueba."""
+        with self._cond:
+            self._failures += 1
+            if self.state == self.HALF_OPEN:
+                self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+                self._open()
+            elif self.state == self.CLOSED and self._failures >= self.threshold:
+                self._open()
+
+    def _open(self) -> None:
+        logging.warning(f"{self._failures} fallos consecutivos de ORCID: se pausan las peticiones {self._cooldown:.0f}s")
+        self.state = self.OPEN
+        self.opened += 1
+        self._open_until = time.monotonic() + self._cooldown
+        self._probing = False
+        self._cond.notify_all()
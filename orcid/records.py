@@ -0,0 +1,129 @@
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+# Columnas del archivo de resultados, en orden
+OUTPUT_COLUMNS = ["cedula", "nombre_profesor", "orcid_profesor", "title", "journal", "date", "doi", "source", "note", "url_source", "publication_id"]
+
+# Columnas del modo de detalle (--details): se llenan con el endpoint /works/{put-codes}
+DETAIL_COLUMNS = ["work_type", "contributors", "citation"]
+
+# Todas las columnas de un registro (las de detalle quedan vacías fuera de ese modo)
+RECORD_COLUMNS = OUTPUT_COLUMNS + DETAIL_COLUMNS
+
+# Campos que dependen solo del investigador (compartidos por todos sus registros)
+RESEARCHER_FIELDS = ("cedula", "nombre_profesor", "orcid_profesor", "source")
+
+# Campos propios de cada trabajo
+WORK_FIELDS = ("title", "journal", "date", "doi", "note", "url_source", "publication_id") + tuple(DETAIL_COLUMNS)
+
+_RESEARCHER_KEYS = frozenset(RESEARCHER_FIELDS)
+_WORK_KEYS = frozenset(WORK_FIELDS)
+
+
+class Researcher:
+    """
+    Datos del investigador, creados una sola vez y compartidos por todos sus registros.
+
+    Args:
+        cedula: Cédula del investigador
+        nombre_profesor: Nombre del investigador
+        orcid_profesor: ORCID del investigador
+        source: Fuente de los datos
+    """
+
+    __slots__ = RESEARCHER_FIELDS
+
+    def __init__(self, cedula: Any = "", nombre_profesor: str = "", orcid_profesor: str = "", source: str = "ORCID"):
+        self.cedula = cedula
+        self.nombre_profesor = nombre_profesor
+        self.orcid_profesor = orcid_profesor
+        self.source = source
+
+    @classmethod
+    def from_user(cls, user: Dict) -> "Researcher":
+        """
+        Crea el investigador a partir del diccionario de usuario de la entrada.
+
+        Args:
+            user: Diccionario con orcid, nombre y cedula
+
+        Returns:
+            Instancia de Researcher
+        """
+        return cls(user.get("cedula", ""), user.get("nombre", ""), user.get("orcid", ""))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Campos del investigador como diccionario."""
+        return {field: getattr(self, field) for field in RESEARCHER_FIELDS}
+
+
+class WorkRecord(Mapping):
+    """
+    Registro compacto de una publicación.
+
+    Guarda solo los campos del trabajo en ``__slots__`` y una referencia al
+    ``Researcher`` compartido, en lugar de repetir cédula, nombre, ORCID y
+    fuente en un diccionario de 10 claves por trabajo. Se comporta como un
+    diccionario de solo lectura (``record["title"]``, ``record.get(...)``,
+    ``dict(record)``), así que el código que esperaba diccionarios sigue
+    funcionando; los campos del trabajo pueden reasignarse.
+
+    Args:
+        researcher: Investigador compartido
+        title, journal, date, doi, note, url_source: Campos del trabajo
+        publication_id: Identificador de la publicación asignado por PublicationIndex
+        work_type, contributors, citation: Campos del modo de detalle
+    """
+
+    __slots__ = ("researcher",) + WORK_FIELDS
+
+    def __init__(self, researcher: Researcher, title: str = "", journal: str = "", date: str = "", doi: str = "", note: str = "", url_source: str = "", publication_id: str = "", work_type: str = "", contributors: str = "", citation: str = ""):
+        self.researcher = researcher
+        self.title = title
+        # Las revistas se repiten mucho entre trabajos: una sola copia por nombre
+        self.journal = sys.intern(journal) if journal else journal
+        self.date = date
+        self.doi = doi
+        self.note = note
+        self.url_source = url_source
+        self.publication_id = publication_id
+        self.work_type = sys.intern(work_type) if work_type else work_type
+        self.contributors = contributors
+        self.citation = citation
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _WORK_KEYS:
+            return getattr(self, key)
+        if key in _RESEARCHER_KEYS:
+            return getattr(self.researcher, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _WORK_KEYS:
+            raise KeyError(f"Solo los campos del trabajo pueden modificarse: {key}")
+        setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Evita el try/except de Mapping.get en el camino caliente (deduplicación)
+        if key in _WORK_KEYS:
+            return getattr(self, key)
+        if key in _RESEARCHER_KEYS:
+            return getattr(self.researcher, key)
+        return default
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RECORD_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(RECORD_COLUMNS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _WORK_KEYS or key in _RESEARCHER_KEYS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Registro como diccionario plano, en el orden de RECORD_COLUMNS."""
+        return {column: self[column] for column in RECORD_COLUMNS}
+
+    def __repr__(self) -> str:
+        return f"WorkRecord({self.to_dict()!r})"
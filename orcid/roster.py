@@ -0,0 +1,238 @@
+import os
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Columnas requeridas en el archivo de entrada
+INPUT_COLUMNS = ["orcid", "nombre", "cedula"]
+
+# Filas leídas por bloque: acota la memoria del parseo en listados grandes
+CHUNK_SIZE = 50000
+
+# Valores que significan "sin ORCID" en la columna (ya en mayúsculas)
+MISSING_VALUES = ("", "-", "NAN", "NONE", "NULL")
+
+# Motivos de rechazo
+REASON_MISSING = "sin ORCID"
+REASON_FORMAT = "formato inválido"
+REASON_CHECKSUM = "dígito de control inválido"
+REASON_DUPLICATE = "ORCID duplicado"
+
+# Prefijo de URL con que a veces se copian los ORCID (el texto ya está en mayúsculas)
+_URL_PREFIX = r"^(?:HTTPS?://)?(?:WWW\.)?ORCID\.ORG/"
+
+# Pesos 2^15 ... 2^1 del cálculo ISO 7064 MOD 11-2 sobre los 15 primeros dígitos
+_CHECKSUM_WEIGHTS = 2 ** np.arange(15, 0, -1, dtype=np.int64)
+
+# Valor posicional de los 15 primeros dígitos para la clave entera de cada ORCID
+_KEY_WEIGHTS = 10 ** np.arange(14, -1, -1, dtype=np.int64)
+
+
+def normalize_orcids(series: pd.Series) -> pd.Series:
+    """
+    Normaliza ORCID iDs al formato ``0000-0000-0000-000X`` de forma vectorizada.
+
+    Acepta URLs (``https://orcid.org/...``), espacios, guiones faltantes y el
+    dígito de control ``x`` en minúscula. Los valores que no tienen 16
+    caracteres válidos tras limpiar se devuelven sin guiones para reportarlos.
+
+    Args:
+        series: Columna orcid tal como viene del archivo
+
+    Returns:
+        Serie de texto con los ORCID normalizados
+    """
+    compact = series.astype("string").fillna("").str.strip().str.upper()
+    compact = compact.str.replace(_URL_PREFIX, "", regex=True).str.replace(r"[\s\-]", "", regex=True)
+    well_formed = compact.str.fullmatch(r"\d{15}[\dX]").fillna(False)
+    formatted = compact.str[0:4] + "-" + compact.str[4:8] + "-" + compact.str[8:12] + "-" + compact.str[12:16]
+    return formatted.where(well_formed, compact)
+
+
+def _orcid_digits(orcids: pd.Series) -> np.ndarray:
+    """Matriz (n, 16) con el valor de cada carácter de ORCID normalizados (X = 10)."""
+    codes = np.frombuffer("".join(orcids.str.replace("-", "", regex=False)).encode("ascii"), dtype=np.uint8).reshape(-1, 16)
+    return np.where(codes == ord("X"), 10, codes.astype(np.int64) - ord("0"))
+
+
+def _checksums_match(digits: np.ndarray) -> np.ndarray:
+    expected = (12 - (digits[:, :15] @ _CHECKSUM_WEIGHTS) % 11) % 11
+    return expected == digits[:, 15]
+
+
+def _keys(digits: np.ndarray) -> np.ndarray:
+    """Clave entera única de cada ORCID: los 15 dígitos y el dígito de control (0-10)."""
+    return (digits[:, :15] @ _KEY_WEIGHTS) * 11 + digits[:, 15]
+
+
+def orcid_keys(orcids: pd.Series) -> np.ndarray:
+    """
+    Reduce ORCID ya normalizados y válidos a enteros de 64 bits (uno a uno).
+
+    Args:
+        orcids: ORCID con formato ``0000-0000-0000-000X``
+
+    Returns:
+        Arreglo int64 con la clave de cada ORCID
+    """
+    if orcids.empty:
+        return np.zeros(0, dtype=np.int64)
+    return _keys(_orcid_digits(orcids))
+
+
+def valid_checksums(orcids: pd.Series) -> np.ndarray:
+    """
+    Valida el dígito de control ISO 7064 MOD 11-2 de ORCID ya normalizados.
+
+    Args:
+        orcids: ORCID con formato ``0000-0000-0000-000X``
+
+    Returns:
+        Arreglo booleano, True donde el dígito de control es correcto
+    """
+    if orcids.empty:
+        return np.zeros(0, dtype=bool)
+    return _checksums_match(_orcid_digits(orcids))
+
+
+def resolve_input_file(root: str) -> str:
+    """
+    Ruta del listado de investigadores: ORCID_INPUT_FILE, input.csv o, si no existe, input.xlsx.
+
+    Args:
+        root: Carpeta raíz del proyecto
+
+    Returns:
+        Ruta del archivo de entrada
+    """
+    configured = os.getenv("ORCID_INPUT_FILE")
+    if configured:
+        return configured if os.path.isabs(configured) else os.path.join(root, configured)
+    csv_file = os.path.join(root, "input.csv")
+    xlsx_file = os.path.join(root, "input.xlsx")
+    return xlsx_file if not os.path.exists(csv_file) and os.path.exists(xlsx_file) else csv_file
+
+
+def _read_chunks(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Lee el listado por bloques, todo como texto (CSV o XLSX)."""
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        yield from _read_xlsx_chunks(path, chunksize)
+        return
+    yield from pd.read_csv(path, usecols=INPUT_COLUMNS, dtype=str, keep_default_na=False, chunksize=chunksize)
+
+
+def _read_xlsx_chunks(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Lee la primera hoja de un XLSX en modo read_only, fila a fila, sin cargar el libro completo."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(value).strip().lower() if value is not None else "" for value in next(rows, ())]
+        missing = [column for column in INPUT_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"Faltan columnas en {path}: {', '.join(missing)}")
+        positions = [header.index(column) for column in INPUT_COLUMNS]
+
+        batch: List[Tuple] = []
+        for row in rows:
+            batch.append(tuple("" if i >= len(row) or row[i] is None else str(row[i]) for i in positions))
+            if len(batch) >= chunksize:
+                yield pd.DataFrame(batch, columns=INPUT_COLUMNS)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=INPUT_COLUMNS)
+    finally:
+        workbook.close()
+
+
+def _restore_numeric(series: pd.Series) -> pd.Series:
+    """Convierte a número una columna leída como texto si todos sus valores lo son (como haría read_csv)."""
+    try:
+        return pd.to_numeric(series.replace("", np.nan))
+    except (ValueError, TypeError):
+        return series
+
+
+def load_roster(path: str, chunksize: int = CHUNK_SIZE) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
+    """
+    Carga el listado de investigadores validando y deduplicando los ORCID antes de cualquier petición.
+
+    El archivo se lee por bloques de ``chunksize`` filas. En cada bloque los
+    ORCID se normalizan y validan de forma vectorizada, y los repetidos se
+    descartan conservando la primera aparición (también entre bloques). Para
+    detectar repetidos cada ORCID se reduce a un entero de 64 bits, de modo
+    que los ya vistos ocupan un arreglo numérico y no un conjunto de textos.
+
+    Args:
+        path: Archivo CSV o XLSX con las columnas orcid, nombre y cedula
+        chunksize: Filas por bloque
+
+    Returns:
+        Tupla (usuarios válidos, filas rechazadas con su motivo, conteos por categoría)
+    """
+    seen = np.zeros(0, dtype=np.int64)
+    valid_chunks: List[pd.DataFrame] = []
+    rejected_chunks: List[pd.DataFrame] = []
+    counts = {"total": 0, "valid": 0, REASON_MISSING: 0, REASON_FORMAT: 0, REASON_CHECKSUM: 0, REASON_DUPLICATE: 0}
+
+    for chunk in _read_chunks(path, chunksize):
+        # Fila del archivo (1 = encabezado) para que el reporte de rechazos sea fácil de ubicar
+        chunk.index = pd.RangeIndex(counts["total"] + 2, counts["total"] + 2 + len(chunk))
+        counts["total"] += len(chunk)
+
+        raw = chunk["orcid"].astype("string").fillna("").str.strip()
+        orcids = normalize_orcids(raw)
+        reason = pd.Series("", index=chunk.index, dtype=object)
+
+        missing = raw.str.upper().isin(MISSING_VALUES)
+        reason[missing] = REASON_MISSING
+        well_formed = orcids.str.fullmatch(r"\d{4}-\d{4}-\d{4}-\d{3}[\dX]").fillna(False)
+        reason[~missing & ~well_formed] = REASON_FORMAT
+        digits = _orcid_digits(orcids[well_formed]) if well_formed.any() else np.zeros((0, 16), dtype=np.int64)
+        checksum_ok = pd.Series(False, index=chunk.index)
+        checksum_ok[well_formed] = _checksums_match(digits)
+        reason[well_formed & ~checksum_ok] = REASON_CHECKSUM
+
+        # Duplicados dentro del bloque y contra los bloques anteriores, comparando claves enteras
+        keys = pd.Series(-1, index=chunk.index, dtype=np.int64)
+        keys[well_formed] = _keys(digits)
+        candidates = reason == ""
+        candidate_keys = keys[candidates]
+        duplicated = candidate_keys.duplicated().to_numpy() | np.isin(candidate_keys.to_numpy(), seen)
+        reason[candidate_keys.index[duplicated]] = REASON_DUPLICATE
+        accepted = reason == ""
+        seen = np.concatenate([seen, keys[accepted].to_numpy()])
+
+        valid = chunk[accepted].copy()
+        valid["orcid"] = orcids[accepted].astype(object)
+        valid_chunks.append(valid)
+
+        rejected = chunk[~accepted].copy()
+        rejected["motivo"] = reason[~accepted]
+        rejected_chunks.append(rejected)
+
+        for label, count in reason[~accepted].value_counts().items():
+            counts[label] += int(count)
+
+    users = pd.concat(valid_chunks) if valid_chunks else pd.DataFrame(columns=INPUT_COLUMNS)
+    users["cedula"] = _restore_numeric(users["cedula"])
+    users = users.reset_index(drop=True)[INPUT_COLUMNS]
+    counts["valid"] = len(users)
+
+    rejects = pd.concat(rejected_chunks) if rejected_chunks else pd.DataFrame(columns=INPUT_COLUMNS + ["motivo"])
+    rejects = rejects.rename_axis("fila").reset_index()[["fila"] + INPUT_COLUMNS + ["motivo"]]
+    return users, rejects, counts
+
+
+def save_rejects(rejects: pd.DataFrame, path: str) -> None:
+    """
+    Guarda las filas rechazadas en CSV (fila original, datos y motivo).
+
+    Args:
+        rejects: Filas rechazadas devueltas por load_roster
+        path: Ruta del archivo CSV
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    rejects.to_csv(path, index=False, encoding="utf-8-sig")
@@ -0,0 +1,96 @@
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Columnas derivadas de date, en este orden, a continuación de date en todos los formatos
+DATE_COLUMNS = ["year", "month", "day", "date_normalized", "date_precision"]
+
+# Precisión de la fecha de ORCID: solo año, año y mes, o fecha completa (de menor a mayor)
+DATE_PRECISIONS = ["year", "month", "day"]
+
+# Columnas con pocos valores distintos: categóricas en pandas y con codificación de diccionario en Parquet
+CATEGORICAL_COLUMNS = ["cedula", "nombre_profesor", "journal", "source", "note", "date_precision"]
+
+# Tipo de cada columna numérica o de fecha (el resto son texto); enteros con nulos de pandas
+COLUMN_TYPES = {"year": "Int16", "month": "Int8", "day": "Int8", "date_normalized": "datetime64[s]"}
+
+# Fechas de ORCID: "2019", "2019-05" o "2019-05-12" (mes y día con uno o dos dígitos)
+_DATE_PATTERN = r"^\s*(\d{4})(?:-(\d{1,2}))?(?:-(\d{1,2}))?"
+
+
+def typed_columns(columns: Sequence[str]) -> List[str]:
+    """
+    Columnas de salida del esquema tipado: las del registro con DATE_COLUMNS después de date.
+
+    Args:
+        columns: Columnas del registro (OUTPUT_COLUMNS o RECORD_COLUMNS)
+
+    Returns:
+        Lista de columnas de salida (sin cambios si no incluye date)
+    """
+    columns = list(columns)
+    if "date" not in columns:
+        return columns
+    position = columns.index("date") + 1
+    return columns[:position] + DATE_COLUMNS + columns[position:]
+
+
+def _integers(values: pd.Series, low: int, high: int, dtype: str) -> pd.Series:
+    """Texto a entero con nulos; fuera de [low, high] queda nulo."""
+    numbers = pd.to_numeric(values, errors="coerce")
+    return numbers.where(numbers.between(low, high)).astype(dtype)
+
+
+def _to_datetime(year: pd.Series, month: pd.Series, day: pd.Series) -> pd.Series:
+    """Fecha desde sus partes (mes y día ausentes = 1); nula si no existe o está fuera de rango."""
+    parts = pd.DataFrame({"year": year.astype("float64"), "month": month.fillna(1).astype("float64"), "day": day.fillna(1).astype("float64")})
+    return pd.to_datetime(parts, errors="coerce")
+
+
+def apply_schema(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica el esquema tipado de salida a un lote de registros, de forma vectorizada.
+
+    - year, month, day: enteros con nulos, extraídos de date (un mes o día inválido queda nulo)
+    - date_normalized: fecha completa; el mes y el día ausentes se toman como 1
+    - date_precision: ``year``, ``month`` o ``day`` según lo que traía ORCID (nulo sin fecha)
+    - CATEGORICAL_COLUMNS: categóricas, en lugar de texto repetido en cada fila
+
+    La columna date original se conserva tal cual para no perder el formato de ORCID.
+
+    Args:
+        frame: Registros con las columnas de OUTPUT_COLUMNS o RECORD_COLUMNS
+
+    Returns:
+        Nuevo DataFrame con las columnas de typed_columns y sus tipos
+    """
+    frame = frame.copy()
+    if "date" in frame.columns:
+        parts = frame["date"].astype("string").str.extract(_DATE_PATTERN)
+        year = _integers(parts[0], 1, 9999, "Int16")
+        month = _integers(parts[1], 1, 12, "Int8").where(year.notna())
+        day = _integers(parts[2], 1, 31, "Int8").where(month.notna())
+
+        normalized = _to_datetime(year, month, day)
+        # Día que no existe en el mes (31 de abril, 29 de febrero en año no bisiesto): se conserva año y mes
+        invalid_day = normalized.isna() & day.notna()
+        if invalid_day.any():
+            day = day.mask(invalid_day)
+            normalized = normalized.fillna(_to_datetime(year, month, day))
+
+        precision = np.select([day.notna().to_numpy(), month.notna().to_numpy(), year.notna().to_numpy()], DATE_PRECISIONS[::-1], default=None)
+        derived = {
+            "year": year,
+            "month": month,
+            "day": day,
+            "date_normalized": normalized.astype(COLUMN_TYPES["date_normalized"]),
+            "date_precision": pd.Categorical(precision, categories=DATE_PRECISIONS, ordered=True),
+        }
+        for column, values in derived.items():
+            frame[column] = values
+
+    for column in CATEGORICAL_COLUMNS:
+        if column in frame.columns and column not in DATE_COLUMNS:
+            frame[column] = frame[column].astype("category")
+    return frame[typed_columns([column for column in frame.columns if column not in DATE_COLUMNS])]
@@ -0,0 +1,418 @@
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from orcid.cache import WorksCache
+from orcid.client import DEFAULT_MAX_RETRIES, OrcidClient
+from orcid.dedup import PublicationIndex, dedupe_records
+from orcid.metrics import Metrics
+from orcid.records import DETAIL_COLUMNS, WORK_FIELDS
+from orcid.utils import REQUEST_TIMEOUT, get_credentials, get_records
+
+# Interfaz y puerto por defecto del servicio (solo accesible desde la máquina local)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+# Perfiles guardados en memoria y segundos que se sirven sin volver a consultar ORCID
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 3600
+
+# Máximo de ORCID por petición masiva (POST /researchers/works)
+MAX_BULK_ORCIDS = 1000
+
+# ORCID tal como puede venir de otra herramienta: con o sin URL, guiones o x minúscula
+# (versión escalar de roster.normalize_orcids, sin cargar pandas)
+_ORCID_RE = re.compile(r"^(?:https?://)?(?:www\.)?(?:orcid\.org/)?(\d{4})-?(\d{4})-?(\d{4})-?(\d{3}[\dX])$", re.IGNORECASE)
+
+_WORKS_PATH_RE = re.compile(r"^/researchers/([^/]+)/works/?$")
+
+
+def normalize_orcid(value: Any) -> Optional[str]:
+    """
+    Normaliza un ORCID al formato ``0000-0000-0000-000X`` y valida su dígito de control.
+
+    Args:
+        value: ORCID recibido en la petición
+
+    Returns:
+        ORCID normalizado, o None si no tiene formato válido o el dígito de control no coincide
+    """
+    match = _ORCID_RE.match(str(value).strip()) if value else None
+    if not match:
+        return None
+    digits = "".join(match.groups()).upper()
+    total = 0
+    for digit in digits[:15]:
+        total = (total + int(digit)) * 2
+    check = (12 - total % 11) % 11
+    if digits[15] != ("X" if check == 10 else str(check)):
+        return None
+    return "-".join(match.groups()).upper()
+
+
+class LRUCache:
+    """
+    Caché en memoria de tamaño acotado con expiración (LRU + TTL), segura para múltiples hilos.
+
+    Al superar ``maxsize`` se desaloja la entrada usada hace más tiempo; una
+    entrada con más de ``ttl`` segundos se descarta al leerla. Con maxsize=0
+    no guarda nada.
+
+    Args:
+        maxsize: Entradas máximas
+        ttl: Segundos de vigencia de cada entrada (<= 0 = sin expiración)
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Valor vigente de una clave (la marca como usada recientemente).
+
+        Args:
+            key: Clave
+
+        Returns:
+            Valor guardado, o None si no existe o expiró
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            stored, value = entry
+            if self.ttl > 0 and time.monotonic() - stored > self.ttl:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Guarda un valor, desalojando los menos usados si se supera el tamaño.
+
+        Args:
+            key: Clave
+            value: Valor
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats["evicted"] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Agrupa las llamadas concurrentes con la misma clave en una sola ejecución.
+
+    El primer hilo que pide una clave ejecuta la función; los que llegan
+    mientras tanto esperan su resultado (o su excepción) en lugar de repetir
+    la consulta a ORCID. Cuando la llamada termina la clave se libera: el
+    resultado no se guarda aquí sino en la LRUCache.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, function: Callable[[], Any]) -> Any:
+        """
+        Ejecuta ``function`` una sola vez para todas las llamadas simultáneas con ``key``.
+
+        Args:
+            key: Clave de la llamada
+            function: Función sin argumentos a ejecutar
+
+        Returns:
+            Resultado de la función
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(function())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+
+class LookupService:
+    """
+    Consultas de publicaciones por investigador, como get_records pero bajo demanda.
+
+    Cada consulta pasa primero por la LRUCache en memoria; si no está, se
+    descarga con ``get_records`` a través de SingleFlight, de modo que varias
+    peticiones simultáneas por el mismo ORCID generan una sola descarga. Todas
+    las descargas comparten el OrcidClient (pool keep-alive, limitador de tasa
+    adaptativo y circuit breaker) y, si se provee, la caché en disco de /works
+    para revalidar con peticiones condicionales. Los errores no se guardan en
+    la caché en memoria.
+
+    Args:
+        client: Cliente HTTP compartido
+        access_token: Token de acceso ORCID
+        cache: Caché en memoria de resultados
+        works_cache: Caché en disco de respuestas /works (opcional)
+        details: Completar los trabajos con tipo, contribuidores y cita
+        workers: Hilos para resolver las peticiones masivas
+    """
+
+    def __init__(self, client: OrcidClient, access_token: str, cache: Optional[LRUCache] = None, works_cache: Optional[WorksCache] = None, details: bool = False, workers: int = 8):
+        self.client = client
+        self.access_token = access_token
+        self.cache = cache if cache is not None else LRUCache()
+        self.works_cache = works_cache
+        self.details = details
+        self.fields = WORK_FIELDS if details else tuple(field for field in WORK_FIELDS if field not in DETAIL_COLUMNS)
+        self.flights = SingleFlight()
+        self.started = time.time()
+        self.stats = {"lookups": 0, "fetched": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="lookup")
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _fetch(self, orcid: str) -> Dict:
+        """Descarga y procesa los trabajos de un ORCID (equivalente a una fila del listado)."""
+        records: List[Dict] = []
+        get_records({"orcid": orcid}, self.access_token, records, client=self.client, cache=self.works_cache, details=self.details)
+        self._count("fetched")
+
+        errors = [record["note"] for record in records if record["note"].startswith("ERROR")]
+        if errors:
+            self._count("errors")
+            return {"orcid": orcid, "error": errors[0][len("ERROR: "):]}
+
+        # Identificadores de publicación y duplicados dentro del perfil, como en el procesamiento por lotes
+        works = dedupe_records([record for record in records if record["note"] != "NO WORKS FOUND"], PublicationIndex(), set())
+        result = {"orcid": orcid, "count": len(works), "works": [{field: record[field] for field in self.fields} for record in works], "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        self.cache.put(orcid, result)
+        return result
+
+    def lookup(self, orcid: str) -> Dict:
+        """
+        Trabajos de un investigador.
+
+        Args:
+            orcid: ORCID ya normalizado
+
+        Returns:
+            Diccionario con orcid, count, works y fetched_at, o con orcid y error si ORCID no respondió
+        """
+        self._count("lookups")
+        result = self.cache.get(orcid)
+        if result is None:
+            result = self.flights.do(orcid, lambda: self._fetch(orcid))
+        return result
+
+    def lookup_many(self, orcids: List[str]) -> List[Dict]:
+        """
+        Trabajos de varios investigadores, resueltos en paralelo y devueltos en el mismo orden.
+
+        Args:
+            orcids: ORCID ya normalizados
+
+        Returns:
+            Un resultado de lookup() por ORCID
+        """
+        return list(self._executor.map(self.lookup, orcids))
+
+    def status(self) -> Dict:
+        """Contadores del servicio, de la caché, de SingleFlight y del cliente HTTP."""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        metrics = self.client.metrics
+        upstream = {"requests": metrics.requests, "latency_p50_ms": round(metrics.latency_quantile(0.5) * 1000, 1), "latency_p95_ms": round(metrics.latency_quantile(0.95) * 1000, 1)} if metrics.enabled else {}
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            **stats,
+            "coalesced": self.flights.coalesced,
+            "cache": dict(self.cache.stats, size=len(self.cache), maxsize=self.cache.maxsize, ttl_s=self.cache.ttl),
+            "works_cache": dict(self.works_cache.stats) if self.works_cache else None,
+            "client": self.client.stats(),
+            "upstream": upstream,
+        }
+
+    def close(self) -> None:
+        """Detiene los hilos de las peticiones masivas y cierra el cliente."""
+        self._executor.shutdown(wait=False)
+        self.client.close()
+
+
+class LookupServer:
+    """
+    Servidor HTTP local del servicio de consultas (un hilo por conexión, keep-alive).
+
+    Rutas:
+        GET  /researchers/{orcid}/works   Trabajos de un investigador
+        POST /researchers/works           Varios a la vez: ``{"orcids": [...]}``
+        GET  /health                      200 si el servicio responde
+        GET  /stats                       Contadores de LookupService.status()
+
+    Args:
+        service: Servicio de consultas
+        host: Interfaz de escucha
+        port: Puerto (0 = uno libre)
+    """
+
+    def __init__(self, service: LookupService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.service = service
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        service = self.service
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Any) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/health":
+                    self._send_json(200, {"status": "ok"})
+                    return
+                if path == "/stats":
+                    self._send_json(200, service.status())
+                    return
+
+                match = _WORKS_PATH_RE.match(path)
+                if not match:
+                    self._send_json(404, {"error": f"Ruta no encontrada: {path}"})
+                    return
+                orcid = normalize_orcid(match.group(1))
+                if orcid is None:
+                    self._send_json(400, {"error": f"ORCID inválido: {match.group(1)}"})
+                    return
+
+                result = service.lookup(orcid)
+                self._send_json(502 if "error" in result else 200, result)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                if self.path.split("?", 1)[0].rstrip("/") != "/researchers/works":
+                    self._send_json(404, {"error": f"Ruta no encontrada: {self.path}"})
+                    return
+
+                try:
+                    orcids = json.loads(body or b"null").get("orcids")
+                except (ValueError, AttributeError):
+                    orcids = None
+                if not isinstance(orcids, list):
+                    self._send_json(400, {"error": 'Se esperaba un JSON {"orcids": [...]}'})
+                    return
+                if len(orcids) > MAX_BULK_ORCIDS:
+                    self._send_json(413, {"error": f"Máximo {MAX_BULK_ORCIDS} ORCID por petición"})
+                    return
+
+                normalized = [normalize_orcid(orcid) for orcid in orcids]
+                invalid = [orcid for orcid, valid in zip(orcids, normalized) if valid is None]
+                if invalid:
+                    self._send_json(400, {"error": "ORCID inválidos", "invalid": invalid})
+                    return
+
+                # Los ORCID repetidos en la misma petición se consultan una vez
+                unique = list(dict.fromkeys(normalized))
+                found = dict(zip(unique, service.lookup_many(unique)))
+                self._send_json(200, {"results": [found[orcid] for orcid in normalized]})
+
+        return Handler
+
+    def start(self) -> "LookupServer":
+        """Atiende peticiones en un hilo de fondo."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="lookup-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Atiende peticiones en el hilo actual hasta que se llame a stop() o se interrumpa."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Detiene el servidor."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "LookupServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def create_service(workers: int = 8, rate_limit: float = 24, max_retries: int = DEFAULT_MAX_RETRIES, cache_size: int = DEFAULT_CACHE_SIZE, cache_ttl: float = DEFAULT_CACHE_TTL, works_cache: Optional[WorksCache] = None, details: bool = False) -> LookupService:
+    """
+    Crea el servicio de consultas: cliente compartido, token de acceso y cachés.
+
+    Args:
+        workers: Conexiones simultáneas a ORCID e hilos de las peticiones masivas
+        rate_limit: Peticiones por segundo a ORCID compartidas por todas las consultas
+        max_retries: Reintentos por petición ante 429, 5xx o errores de red
+        cache_size: Perfiles en la caché en memoria (0 = sin caché)
+        cache_ttl: Segundos de vigencia de cada perfil en memoria
+        works_cache: Caché en disco de respuestas /works (opcional)
+        details: Completar los trabajos con tipo, contribuidores y cita
+
+    Returns:
+        LookupService listo para usar
+
+    Raises:
+        ValueError: Si las credenciales no están configuradas
+        requests.RequestException: Si falla la autenticación
+    """
+    client = OrcidClient(pool_size=workers * 2 if details else workers, rate_limit=rate_limit, timeout=REQUEST_TIMEOUT, max_retries=max_retries, metrics=Metrics())
+    token = get_credentials(client)
+    logging.info(f"Servicio de consultas: {workers} workers, {rate_limit} peticiones/s, caché de {cache_size} perfiles por {cache_ttl:g} s", extra={"phase": "service"})
+    return LookupService(client, token, LRUCache(cache_size, cache_ttl), works_cache, details, workers)
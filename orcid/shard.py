@@ -0,0 +1,181 @@
+import heapq
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from orcid.dedup import PublicationIndex, dedupe_records
+from orcid.jsonlib import loads as json_loads
+from orcid.roster import orcid_keys
+from orcid.writers import ResultWriter
+
+# Multiplicador de Fibonacci (2^64 / razón áurea): mezcla los bits de la clave del ORCID
+# para que ORCID consecutivos caigan en fragmentos distintos
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+# Extensiones del resultado parcial de un fragmento y de su resumen
+PARTIAL_EXTENSION = ".jsonl"
+STATS_EXTENSION = ".stats.json"
+
+# Contadores del resumen y estadísticas HTTP que se suman al combinar (las tasas no se suman)
+SUMMED_FIELDS = ("total_users", "index", "errors")
+SUMMED_HTTP = ("retries", "throttled", "breaker_opened", "requests", "connections", "reused")
+
+
+def shard_name(shard: Tuple[int, int]) -> str:
+    """Nombre del fragmento para los archivos de salida (``shard-2-of-4``)."""
+    return f"shard-{shard[0]}-of-{shard[1]}"
+
+
+def assign_shards(orcids: pd.Series, count: int) -> np.ndarray:
+    """
+    Asigna cada ORCID a un fragmento de forma determinista.
+
+    El fragmento depende solo del ORCID (no de su posición en el archivo), así
+    que todas las máquinas calculan la misma partición a partir del mismo
+    listado, y un investigador cae siempre en el mismo fragmento.
+
+    Args:
+        orcids: ORCID ya normalizados y válidos (salida de load_roster)
+        count: Número de fragmentos
+
+    Returns:
+        Arreglo con el número de fragmento (1..count) de cada ORCID
+    """
+    keys = orcid_keys(orcids).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        mixed = keys * _HASH_MULTIPLIER
+    return ((mixed >> np.uint64(32)) % np.uint64(count)).astype(np.int64) + 1
+
+
+def stats_path(partial: str) -> str:
+    """Ruta del resumen que acompaña a un resultado parcial."""
+    base = partial[:-len(PARTIAL_EXTENSION)] if partial.endswith(PARTIAL_EXTENSION) else partial
+    return base + STATS_EXTENSION
+
+
+def load_shard_stats(partial: str) -> Dict:
+    """
+    Lee el resumen de un fragmento; solo existe si el fragmento terminó.
+
+    Args:
+        partial: Ruta del resultado parcial (.jsonl)
+
+    Returns:
+        Resumen del fragmento
+
+    Raises:
+        ValueError: Si el fragmento no terminó (no hay resumen)
+    """
+    path = stats_path(partial)
+    if not os.path.exists(path):
+        raise ValueError(f"El fragmento {partial} no terminó: falta {os.path.basename(path)}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_partial(path: str) -> Iterator[Dict]:
+    """Entradas de un resultado parcial, en orden."""
+    with open(path, "rb") as f:
+        for line in f:
+            yield json_loads(line)
+
+
+def _check_shards(partials: List[str], stats: List[Dict]) -> None:
+    """Verifica que los fragmentos sean del mismo listado y estén todos, sin repetir."""
+    counts = {entry["shard"]["count"] for entry in stats}
+    rosters = {entry["shard"]["roster"] for entry in stats}
+    if len(counts) != 1 or len(rosters) != 1:
+        raise ValueError("Los fragmentos no pertenecen a la misma ejecución (distinto N o distinto listado)")
+
+    count = counts.pop()
+    seen: Set[int] = set()
+    for partial, entry in zip(partials, stats):
+        index = entry["shard"]["index"]
+        if index in seen:
+            raise ValueError(f"Fragmento {index}/{count} repetido: {partial}")
+        seen.add(index)
+    missing = sorted(set(range(1, count + 1)) - seen)
+    if missing:
+        raise ValueError(f"Faltan fragmentos: {', '.join(f'{i}/{count}' for i in missing)}")
+
+
+def validate_partials(partials: List[str]) -> List[Dict]:
+    """
+    Verifica los resultados parciales antes de combinarlos, sin escribir nada.
+
+    Comprueba que haya al menos uno, que todos los fragmentos hayan terminado,
+    que sean del mismo listado y estén todos, y que cada parcial tenga tantos
+    investigadores como indica su resumen.
+
+    Args:
+        partials: Rutas de los resultados parciales (.jsonl), uno por fragmento
+
+    Returns:
+        Resumen de cada fragmento, en el orden de ``partials``
+
+    Raises:
+        ValueError: Si la lista está vacía, falta algún fragmento, no terminó o no coincide con su resumen
+    """
+    if not partials:
+        raise ValueError("No se indicó ningún resultado parcial (revisa la ruta o el comodín)")
+    stats = [load_shard_stats(partial) for partial in partials]
+    _check_shards(partials, stats)
+    for partial, entry in zip(partials, stats):
+        with open(partial, "rb") as f:
+            read = sum(1 for _ in f)
+        if read != entry["summary"]["index"]:
+            raise ValueError(f"El fragmento {partial} tiene {read} investigadores y su resumen indica {entry['summary']['index']}")
+    return stats
+
+
+def merge_partials(partials: List[str], writer: ResultWriter, publications: Optional[PublicationIndex] = None, stats: Optional[List[Dict]] = None) -> Dict:
+    """
+    Combina los resultados parciales de todos los fragmentos en la salida final.
+
+    Cada parcial guarda los registros de cada investigador antes de deduplicar,
+    junto con su posición en el listado completo. Aquí se intercalan los
+    parciales por esa posición (``heapq.merge``, leyendo cada archivo en
+    streaming) y se repite la deduplicación de ``process_users`` en el orden
+    del listado, de modo que los ``publication_id`` y las filas resultantes son
+    idénticos a los de una ejecución en un solo proceso.
+
+    Args:
+        partials: Rutas de los resultados parciales (.jsonl), uno por fragmento
+        writer: Escritor de la salida final
+        publications: Índice de publicaciones (si no se provee se crea uno)
+        stats: Resúmenes ya verificados con validate_partials (si no se proveen se verifican aquí)
+
+    Returns:
+        Resumen combinado, con los contadores y estadísticas HTTP sumados
+
+    Raises:
+        ValueError: Si falta algún fragmento, no terminó o no coincide con su resumen
+    """
+    if stats is None:
+        stats = validate_partials(partials)
+    if publications is None:
+        publications = PublicationIndex()
+
+    seen: Set[Tuple[str, int]] = set()
+    processed_records = 0
+    entries = heapq.merge(*(_read_partial(partial) for partial in partials), key=lambda entry: entry["index"])
+    for entry in entries:
+        if entry["error"] is None:
+            for record in dedupe_records(entry["records"], publications, seen):
+                writer.write(record)
+                processed_records += 1
+
+    summary = {field: sum(entry["summary"][field] for entry in stats) for field in SUMMED_FIELDS}
+    summary.update({
+        "complete": True,
+        "processed_records": processed_records,
+        "publications": len(publications),
+        "shards": len(stats),
+        "http": {field: sum((entry.get("http") or {}).get(field, 0) for entry in stats) for field in SUMMED_HTTP},
+        "elapsed_s": max(entry["elapsed_s"] for entry in stats),
+        "details": any(entry.get("details") for entry in stats),
+    })
+    return summary
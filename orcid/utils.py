@@ -1,30 +1,42 @@
 import logging
 import os
+import re
 import sys
+import threading
 import time
 import traceback
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import requests
 from rich.console import Console
 
-# Configuración de logging
-log_file = os.path.join(os.path.dirname(__file__), "orcid.log")
-log_folder = os.path.join(os.path.dirname(__file__), "logs")
-
-# Rotar logs antiguos
-if os.path.exists(log_file):
-    if not os.path.exists(log_folder):
-        os.makedirs(log_folder)
-    os.rename(log_file, f"{log_folder}/orcid_{time.strftime('%Y%m%d_%H%M%S')}.log")
-
-# Configurar el logger
-logging.basicConfig(filename=log_file, filemode="w", format="[%(asctime)s - %(levelname)s] %(message)s", level=logging.INFO)
+from orcid.cache import CacheMissError, WorksCache
+from orcid.client import OrcidClient
+from orcid.incremental import IncrementalStore
+from orcid.jsonlib import loads as json_loads
+from orcid.logger import SAMPLED
+from orcid.metrics import DISABLED, Metrics
+from orcid.records import Researcher, WorkRecord
 
 # Constantes
-ORCID_API_BASE_URL = "https://pub.orcid.org/v3.0"
-ORCID_TOKEN_URL = "https://orcid.org/oauth/token"
+# Sobrescribibles por entorno para apuntar a un servidor local (benchmarks/mock_orcid.py)
+ORCID_API_BASE_URL = os.getenv("ORCID_API_BASE_URL", "https://pub.orcid.org/v3.0")
+ORCID_TOKEN_URL = os.getenv("ORCID_TOKEN_URL", "https://orcid.org/oauth/token")
 REQUEST_TIMEOUT = 30
+ORCID_RATE_LIMIT = 24  # Peticiones por segundo permitidas por la API pública
+DEFAULT_WORKERS = 1
+WORKS_BULK_SIZE = 100  # Put-codes por petición a /works/{put-codes} (máximo que admite la API)
+
+# Caracteres de control ilegales en Excel (ASCII 0-31 y 127), excepto \t, \n y \r
+ILLEGAL_CHARACTERS_PATTERN = r"[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F]"
+ILLEGAL_CHARACTERS_RE = re.compile(ILLEGAL_CHARACTERS_PATTERN)
+
+_EMPTY: Dict = {}
+
+# Cliente HTTP compartido (se crea bajo demanda si el llamador no provee uno)
+_default_client: Optional[OrcidClient] = None
+_default_client_lock = threading.Lock()
 
 
 def safe_get(data: Any, *keys: str, default: str = "") -> str:
@@ -53,9 +65,9 @@ def safe_get(data: Any, *keys: str, default: str = "") -> str:
                 return default
             result = result.get(key, {}) if isinstance(result, dict) else default
 
-        # Limpiar el resultado si es string
+        # Limpiar el resultado si es string (los registros quedan listos para exportar)
         if isinstance(result, str):
-            return result.replace("\n", " ").strip()
+            return ILLEGAL_CHARACTERS_RE.sub("", result.replace("\n", " ")).strip()
 
         return result if result != {} else default
 
@@ -63,10 +75,44 @@ def safe_get(data: Any, *keys: str, default: str = "") -> str:
         return default
 
 
-def get_credentials() -> str:
+def clean_illegal_characters(value):
+    """
+    Elimina caracteres ilegales para Excel (caracteres de control ASCII 0-31 y 127).
+    
+    Args:
+        value: Valor a limpiar
+        
+    Returns:
+        String limpio o el valor original si no es string
+    """
+    if isinstance(value, str):
+        # Eliminar caracteres de control (ASCII 0-31 y 127)
+        # Excepto \t (tab=9), \n (newline=10), \r (carriage return=13)
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    return value
+
+
+def get_client() -> OrcidClient:
+    """
+    Devuelve el cliente HTTP compartido por defecto, creándolo la primera vez.
+
+    Returns:
+        Instancia compartida de OrcidClient
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = OrcidClient(pool_size=DEFAULT_WORKERS, rate_limit=ORCID_RATE_LIMIT, timeout=REQUEST_TIMEOUT)
+        return _default_client
+
+
+def get_credentials(client: Optional[OrcidClient] = None) -> str:
     """
     Obtiene el token de acceso de ORCID usando credenciales de variables de entorno.
 
+    Args:
+        client: Cliente HTTP compartido (opcional)
+
     Returns:
         Token de acceso de ORCID
 
@@ -85,16 +131,15 @@ def get_credentials() -> str:
     try:
         data = {"client_id": client_id, "client_secret": client_secret, "grant_type": "client_credentials", "scope": "/read-public"}
 
-        headers = {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"}
-
-        response = requests.post(ORCID_TOKEN_URL, data=data, headers=headers, timeout=REQUEST_TIMEOUT)
+        client = client or get_client()
+        response = client.post(ORCID_TOKEN_URL, data=data)
         response.raise_for_status()
 
         token = response.json().get("access_token")
         if not token:
             raise ValueError("No se recibió token de acceso en la respuesta")
 
-        logging.info("Token de acceso ORCID obtenido exitosamente")
+        logging.info("Token de acceso ORCID obtenido exitosamente", extra={"phase": "auth"})
         return token
 
     except requests.RequestException as e:
@@ -103,6 +148,61 @@ def get_credentials() -> str:
         raise
 
 
+def fetch_works(orcid: str, access_token: str, client: OrcidClient, cache: Optional[WorksCache] = None, offline: bool = False, decode: bool = True) -> Union[Dict, bytes]:
+    """
+    Descarga la respuesta de /works de un ORCID, revalidando contra la caché en disco.
+
+    Si existe una entrada en caché se envía una petición condicional
+    (If-None-Match / If-Modified-Since); un 304 se sirve desde la caché.
+
+    Args:
+        orcid: Identificador ORCID
+        access_token: Token de acceso ORCID
+        client: Cliente HTTP compartido
+        cache: Caché de respuestas (opcional)
+        offline: Usar solo la caché, sin peticiones de red
+        decode: Decodificar la respuesta; con False se devuelve el cuerpo tal cual llegó
+            (lo decodifica otra etapa, ver orcid.pipeline) y se guarda así en la caché
+
+    Returns:
+        Respuesta JSON decodificada (o sus bytes si decode=False y vino de la red)
+
+    Raises:
+        CacheMissError: Si en modo offline no hay datos en caché
+        requests.RequestException: Si falla la petición
+    """
+    entry = cache.get(orcid) if cache else None
+
+    if offline:
+        if entry is None:
+            raise CacheMissError(f"Sin datos en caché para {orcid}")
+        cache.record("hits")
+        return entry["data"]
+
+    works_url = f"{ORCID_API_BASE_URL}/{orcid}/works"
+    response = client.get(works_url, access_token, headers=cache.conditional_headers(entry) if entry else None)
+
+    if response.status_code == 304 and entry is not None:
+        cache.touch(orcid)
+        cache.record("hits")
+        return entry["data"]
+
+    response.raise_for_status()
+    if not decode:
+        if cache:
+            cache.put_raw(orcid, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            cache.record("misses")
+        return response.content
+
+    data = json_loads(response.content)
+
+    if cache:
+        cache.put(orcid, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        cache.record("misses")
+
+    return data
+
+
 def get_title(work_summary: List[Dict]) -> str:
     """
     Extrae el título de la publicación del work summary.
@@ -118,7 +218,7 @@ def get_title(work_summary: List[Dict]) -> str:
             return ""
         return safe_get(work_summary[0], "title", "title", "value")
     except Exception as e:
-        logging.error(f"Error extrayendo título: {e}")
+        logging.error(f"Error extrayendo título: {e}", extra=SAMPLED)
         return ""
 
 
@@ -137,7 +237,7 @@ def get_journal(work_summary: List[Dict]) -> str:
             return ""
         return safe_get(work_summary[0], "journal-title", "value")
     except Exception as e:
-        logging.error(f"Error extrayendo revista: {e}")
+        logging.error(f"Error extrayendo revista: {e}", extra=SAMPLED)
         return ""
 
 
@@ -175,7 +275,7 @@ def get_date(work_summary: List[Dict]) -> str:
             return year
 
     except Exception as e:
-        logging.error(f"Error extrayendo fecha: {e}")
+        logging.error(f"Error extrayendo fecha: {e}", extra=SAMPLED)
         return ""
 
 
@@ -202,7 +302,7 @@ def get_doi(work_summary: List[Dict]) -> str:
         return safe_get(external_ids[0], "external-id-value")
 
     except Exception as e:
-        logging.error(f"Error extrayendo DOI: {e}")
+        logging.error(f"Error extrayendo DOI: {e}", extra=SAMPLED)
         return ""
 
 
@@ -221,133 +321,453 @@ def get_url_source(work_summary: List[Dict]) -> str:
             return ""
         return safe_get(work_summary[0], "url", "value")
     except Exception as e:
-        logging.error(f"Error extrayendo URL: {e}")
+        logging.error(f"Error extrayendo URL: {e}", extra=SAMPLED)
         return ""
 
 
-def _create_error_record(user: Dict, error_msg: str) -> Dict:
+def _clean_text(value: Any) -> str:
     """
-    Crea un registro de error estandarizado.
+    Limpia un valor de texto igual que ``safe_get``.
 
     Args:
-        user: Diccionario con datos del usuario
-        error_msg: Mensaje de error
+        value: Valor extraído del JSON
+
+    Returns:
+        Texto limpio o cadena vacía si no es texto
+    """
+    if not isinstance(value, str):
+        return ""
+    # Camino rápido: sin saltos de línea ni caracteres de control no hay nada que reemplazar
+    if value.isprintable():
+        return value.strip()
+    return ILLEGAL_CHARACTERS_RE.sub("", value.replace("\n", " ")).strip()
+
+
+def parse_work_summary(work_summary: List[Dict]) -> Dict[str, str]:
+    """
+    Extrae todos los campos de un grupo de trabajos en una sola pasada.
+
+    Reemplaza a get_title/get_journal/get_date/get_doi/get_url_source en el
+    camino principal: recorre los resúmenes del grupo una vez, sin un
+    try/except por campo, toma cada campo del primer resumen que lo tenga (no
+    solo del primero) y, para el identificador, prefiere un DOI en cualquiera
+    de los resúmenes antes de recurrir al primer identificador externo de otro
+    tipo (ISSN, etc.). Los textos se limpian una sola vez, al final.
+
+    Args:
+        work_summary: Lista con los resúmenes del trabajo desde ORCID
 
     Returns:
-        Diccionario con registro de error
+        Diccionario con title, journal, date, doi y url_source
     """
+    title = journal = url = doi = other_id = None
+    date = ""
+
+    # Los nodos ausentes llegan como null en la API: "or _EMPTY" evita un if por nivel
+    for summary in work_summary or ():
+        if not isinstance(summary, dict):
+            continue
+
+        if not title:
+            title = ((summary.get("title") or _EMPTY).get("title") or _EMPTY).get("value")
+        if not journal:
+            journal = (summary.get("journal-title") or _EMPTY).get("value")
+        if not url:
+            url = (summary.get("url") or _EMPTY).get("value")
+
+        if not date:
+            pub_date = summary.get("publication-date") or _EMPTY
+            year = _clean_text((pub_date.get("year") or _EMPTY).get("value"))
+            if year:
+                month = _clean_text((pub_date.get("month") or _EMPTY).get("value"))
+                day = _clean_text((pub_date.get("day") or _EMPTY).get("value"))
+                if month and day:
+                    date = f"{year}-{month}-{day}"
+                elif month:
+                    date = f"{year}-{month}"
+                else:
+                    date = year
+
+        if not doi:
+            for external_id in (summary.get("external-ids") or _EMPTY).get("external-id") or ():
+                value = external_id.get("external-id-value")
+                if not value:
+                    continue
+                if external_id.get("external-id-type") == "doi":
+                    doi = value
+                    break
+                if not other_id:
+                    other_id = value
+
+        if title and journal and url and date and doi:
+            break
+
     return {
-        "cedula": user.get("cedula", ""),
-        "nombre_profesor": user.get("nombre", ""),
-        "orcid_profesor": user.get("orcid", ""),
-        "title": "",
-        "journal": "",
-        "date": "",
-        "doi": "",
-        "source": "ORCID",
-        "note": error_msg[:100],  # Limitar longitud
-        "url_source": "",
+        "title": _clean_text(title),
+        "journal": _clean_text(journal),
+        "date": date,
+        "doi": _clean_text(doi or other_id),
+        "url_source": _clean_text(url),
     }
 
 
-def _create_work_record(user: Dict, work_summary: List[Dict]) -> Dict:
+def parse_work_detail(work: Dict) -> Dict[str, str]:
     """
-    Crea un registro de publicación desde el work summary.
+    Extrae los campos del modo de detalle de un trabajo completo (respuesta de /works/{put-codes}).
 
     Args:
-        user: Diccionario con datos del usuario
-        work_summary: Lista con el resumen del trabajo desde ORCID
+        work: Trabajo completo desde ORCID
 
     Returns:
-        Diccionario con registro de publicación
+        Diccionario con work_type, contributors, citation y journal
     """
+    contributors = []
+    for contributor in (work.get("contributors") or _EMPTY).get("contributor") or ():
+        name = _clean_text(((contributor or _EMPTY).get("credit-name") or _EMPTY).get("value"))
+        if name:
+            contributors.append(name)
+
     return {
-        "cedula": user.get("cedula", ""),
-        "nombre_profesor": user.get("nombre", ""),
-        "orcid_profesor": user.get("orcid", ""),
-        "title": get_title(work_summary),
-        "journal": get_journal(work_summary),
-        "date": get_date(work_summary),
-        "doi": get_doi(work_summary),
-        "source": "ORCID",
-        "note": "",
-        "url_source": get_url_source(work_summary),
+        "work_type": _clean_text(work.get("type")),
+        "contributors": "; ".join(contributors),
+        "citation": _clean_text((work.get("citation") or _EMPTY).get("citation-value")),
+        "journal": _clean_text((work.get("journal-title") or _EMPTY).get("value")),
     }
 
 
-def get_records(user: Dict, access_token: str, file_output: List[Dict], console: Optional[Console] = None) -> None:
+def fetch_work_details(orcid: str, put_codes: List[str], access_token: str, client: OrcidClient, executor: Optional[Executor] = None) -> Dict[str, Dict[str, str]]:
     """
-    Obtiene registros de publicaciones para un usuario ORCID.
+    Descarga los trabajos completos de un ORCID en lotes de hasta WORKS_BULK_SIZE put-codes por petición.
+
+    Usa el endpoint masivo ``/{orcid}/works/{put-code,put-code,...}``: un perfil
+    de N trabajos cuesta ceil(N / 100) peticiones en lugar de N. Si se provee un
+    executor, los lotes de un mismo perfil se descargan en paralelo (todas las
+    peticiones pasan por el limitador de tasa del cliente).
 
     Args:
-        user: Diccionario con datos del usuario (orcid, nombre, cedula)
+        orcid: Identificador ORCID
+        put_codes: Put-codes de los trabajos
         access_token: Token de acceso ORCID
-        file_output: Lista donde se agregan los registros obtenidos
-        console: Rich Console para output (opcional)
+        client: Cliente HTTP compartido
+        executor: Executor para descargar los lotes en paralelo (opcional)
+
+    Returns:
+        Campos de detalle por put-code (los trabajos que ORCID no devolvió no aparecen)
+
+    Raises:
+        requests.RequestException: Si falla la petición de algún lote
     """
-    orcid = user.get("orcid")
-    nombre = user.get("nombre", "Desconocido")
+    batches = [put_codes[i:i + WORKS_BULK_SIZE] for i in range(0, len(put_codes), WORKS_BULK_SIZE)]
+
+    def fetch_batch(batch: List[str]) -> List[Dict]:
+        response = client.get(f"{ORCID_API_BASE_URL}/{orcid}/works/{','.join(batch)}", access_token)
+        response.raise_for_status()
+        return json_loads(response.content).get("bulk") or []
+
+    results = executor.map(fetch_batch, batches) if executor is not None and len(batches) > 1 else map(fetch_batch, batches)
+
+    details = {}
+    for bulk in results:
+        for item in bulk:
+            # Cada elemento trae "work" o "error" (put-code inexistente o privado)
+            work = (item or _EMPTY).get("work")
+            if work:
+                details[str(work.get("put-code"))] = parse_work_detail(work)
+    return details
 
-    if not orcid:
-        logging.error(f"ORCID vacío para usuario: {nombre}")
-        return
 
+def _add_work_details(orcid: str, detailed: List[Tuple[str, Dict]], access_token: str, client: OrcidClient, executor: Optional[Executor], metrics: Metrics) -> None:
+    """
+    Completa los registros con los campos de detalle; si la descarga falla quedan solo con el resumen.
+
+    Args:
+        orcid: Identificador ORCID
+        detailed: Pares (put-code, registro) de los trabajos del perfil
+        access_token: Token de acceso ORCID
+        client: Cliente HTTP compartido
+        executor: Executor para los lotes (opcional)
+        metrics: Métricas de la ejecución
+    """
     try:
-        # Configurar headers para la API
-        headers = {"Content-Type": "application/json", "Accept": "application/json", "Authorization": f"Bearer {access_token}"}
+        with metrics.phase("fetch"):
+            found = fetch_work_details(orcid, [put_code for put_code, _ in detailed], access_token, client, executor)
+    except requests.RequestException as e:
+        logging.warning(f"No se pudo obtener el detalle de los trabajos de {orcid}: {e}", extra={"orcid": orcid, "phase": "details", "status": "error"})
+        return
 
-        # Obtener trabajos del usuario
-        works_url = f"{ORCID_API_BASE_URL}/{orcid}/works"
-        response = requests.get(works_url, headers=headers, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
+    for put_code, record in detailed:
+        detail = found.get(put_code)
+        if detail is None:
+            continue
+        record["work_type"] = detail["work_type"]
+        record["contributors"] = detail["contributors"]
+        record["citation"] = detail["citation"]
+        if not record["journal"]:
+            record["journal"] = detail["journal"]
 
-        # Procesar trabajos
-        data = response.json()
-        works = data.get("group", [])
 
-        if console:
-            console.print(f"  [dim]→ {nombre} ([cyan]{orcid}[/]): [green]{len(works)}[/] trabajos[/]")
-        
-        logging.info(f"ORCID {orcid}: {len(works)} trabajos encontrados")
+def _create_error_record(user: Union[Dict, Researcher], error_msg: str) -> WorkRecord:
+    """
+    Crea un registro de error estandarizado.
 
-        if not works:
-            logging.info(f"No se encontraron trabajos para ORCID: {orcid}")
-            file_output.append(_create_error_record(user, "NO WORKS FOUND"))
-            return
+    Args:
+        user: Diccionario con datos del usuario o Researcher ya creado
+        error_msg: Mensaje de error
+
+    Returns:
+        Registro de error (se comporta como diccionario)
+    """
+    researcher = user if isinstance(user, Researcher) else Researcher.from_user(user)
+    return WorkRecord(researcher, note=clean_illegal_characters(error_msg[:100]))  # Limitar longitud
 
-        # Procesar cada trabajo
-        for work in works:
-            try:
-                work_summary = work.get("work-summary", [])
-                if not work_summary:
-                    continue
 
-                record = _create_work_record(user, work_summary)
-                file_output.append(record)
+def _create_work_record(user: Union[Dict, Researcher], work_summary: List[Dict]) -> WorkRecord:
+    """
+    Crea un registro de publicación desde el work summary.
+
+    Args:
+        user: Diccionario con datos del usuario o Researcher compartido
+        work_summary: Lista con el resumen del trabajo desde ORCID
+
+    Returns:
+        Registro de publicación (se comporta como diccionario)
+    """
+    researcher = user if isinstance(user, Researcher) else Researcher.from_user(user)
+    return WorkRecord(researcher, **parse_work_summary(work_summary))
+
+
+def parse_works(works: List[Dict]) -> Tuple[List[Tuple[Optional[str], Dict[str, str]]], List[str]]:
+    """
+    Extrae los campos de cada grupo de trabajos de la respuesta /works.
 
-            except Exception as work_error:
-                logging.error(f"Error procesando trabajo para ORCID {orcid}: {work_error}")
+    No usa el estado del proceso (ni registra en el log), así que puede
+    ejecutarse en otro proceso (ver summarize_works).
+
+    Args:
+        works: Grupos de trabajos (``group`` de la respuesta)
+
+    Returns:
+        Tupla con los pares (put-code, campos) de los grupos con resumen, en orden,
+        y los mensajes de error de los grupos que no se pudieron procesar
+    """
+    parsed: List[Tuple[Optional[str], Dict[str, str]]] = []
+    errors: List[str] = []
+    for work in works:
+        try:
+            work_summary = work.get("work-summary", [])
+            if not work_summary:
                 continue
 
-    except requests.Timeout:
+            first = work_summary[0]
+            put_code = first.get("put-code") if isinstance(first, dict) else None
+            parsed.append((str(put_code) if put_code is not None else None, parse_work_summary(work_summary)))
+
+        except Exception as work_error:
+            errors.append(str(work_error))
+    return parsed, errors
+
+
+def summarize_works(payload: Union[bytes, Dict]) -> Tuple[Any, int, List[Tuple[Optional[str], Dict[str, str]]], List[str]]:
+    """
+    Decodifica una respuesta /works y extrae sus trabajos (unidad de la etapa de parseo del pipeline).
+
+    Es una función de módulo sin estado: puede enviarse a un ProcessPoolExecutor
+    para decodificar y parsear perfiles grandes fuera del GIL del proceso principal.
+
+    Args:
+        payload: Cuerpo de la respuesta (bytes) o respuesta ya decodificada (desde la caché)
+
+    Returns:
+        Tupla (last-modified-date, cantidad de grupos, trabajos y errores de parse_works)
+    """
+    data = json_loads(payload) if isinstance(payload, (bytes, bytearray)) else payload
+    works = data.get("group", [])
+    parsed, errors = parse_works(works)
+    return safe_get(data, "last-modified-date", "value", default=None), len(works), parsed, errors
+
+
+def build_user_records(
+    researcher: Researcher,
+    last_modified: Any,
+    group_count: int,
+    parse: Callable[[], Tuple[List[Tuple[Optional[str], Dict[str, str]]], List[str]]],
+    file_output: List[Dict],
+    console: Optional[Console] = None,
+    store: Optional[IncrementalStore] = None,
+    metrics: Metrics = DISABLED,
+    fetch_fields: Optional[Dict] = None,
+) -> Optional[List[Tuple[Optional[str], WorkRecord]]]:
+    """
+    Agrega los registros de un perfil ya descargado a ``file_output``.
+
+    En modo incremental, si el perfil no cambió se agregan los registros
+    guardados y ``parse`` no se llama.
+
+    Args:
+        researcher: Investigador compartido por sus registros
+        last_modified: ``last-modified-date`` de la respuesta
+        group_count: Grupos de trabajos de la respuesta
+        parse: Devuelve el resultado de parse_works (se llama solo si hace falta)
+        file_output: Lista donde se agregan los registros
+        console: Rich Console para output (opcional)
+        store: Estado del modo incremental (opcional)
+        metrics: Métricas de la ejecución; mide la fase parse
+        fetch_fields: Campos estructurados del log de la descarga
+
+    Returns:
+        Pares (put-code, registro) de los registros agregados (incluido el de perfil sin
+        trabajos, con put-code None), o None si el perfil no cambió
+    """
+    orcid = researcher.orcid_profesor
+    nombre = researcher.nombre_profesor or "Desconocido"
+    fetch_fields = fetch_fields or {"orcid": orcid, "phase": "fetch", "status": "ok"}
+
+    # Modo incremental: si el perfil no cambió se reutilizan los registros anteriores
+    if store is not None:
+        stored_records = store.lookup(orcid, last_modified, researcher)
+        if stored_records is not None:
+            if console:
+                console.print(f"  [dim]→ {nombre} ([cyan]{orcid}[/]): sin cambios, {len(stored_records)} registros[/]")
+            logging.info(f"ORCID {orcid}: sin cambios desde la última ejecución", extra=dict(fetch_fields, status="unchanged", records=len(stored_records)))
+            file_output.extend(stored_records)
+            return None
+
+    if console:
+        console.print(f"  [dim]→ {nombre} ([cyan]{orcid}[/]): [green]{group_count}[/] trabajos[/]")
+    
+    logging.info(f"ORCID {orcid}: {group_count} trabajos encontrados", extra=dict(fetch_fields, status="ok" if group_count else "no_works", works=group_count))
+
+    added: List[Tuple[Optional[str], WorkRecord]] = []
+    if not group_count:
+        error_record = _create_error_record(researcher, "NO WORKS FOUND")
+        file_output.append(error_record)
+        added.append((None, error_record))
+
+    # Procesar cada trabajo
+    with metrics.phase("parse"):
+        parsed, errors = parse()
+        for put_code, fields in parsed:
+            record = WorkRecord(researcher, **fields)
+            file_output.append(record)
+            added.append((put_code, record))
+
+    for work_error in errors:
+        logging.error(f"Error procesando trabajo para ORCID {orcid}: {work_error}", extra=dict(SAMPLED, orcid=orcid, phase="parse"))
+    return added
+
+
+def fetch_error_record(researcher: Researcher, error: Exception, console: Optional[Console] = None, log_fields: Optional[Callable[..., Dict]] = None) -> WorkRecord:
+    """
+    Registra el error de descarga o procesamiento de un perfil y crea su registro de error.
+
+    Args:
+        researcher: Investigador
+        error: Excepción capturada
+        console: Rich Console para output (opcional)
+        log_fields: Arma los campos estructurados del log a partir del status (opcional)
+
+    Returns:
+        Registro de error del investigador
+    """
+    orcid = researcher.orcid_profesor
+    nombre = researcher.nombre_profesor or "Desconocido"
+    log_fields = log_fields or (lambda status, **fields: {"orcid": orcid, "phase": "fetch", "status": status, **fields})
+
+    if isinstance(error, CacheMissError):
+        if console:
+            console.print(f"  [yellow]📦 Sin caché: {nombre}[/]")
+        logging.error(str(error), extra=log_fields("cache_miss"))
+        return _create_error_record(researcher, f"ERROR: {error}")
+
+    if isinstance(error, requests.Timeout):
         error_msg = f"Timeout conectando a ORCID para {orcid}"
         if console:
             console.print(f"  [yellow]⏱️  Timeout: {nombre}[/]")
-        logging.error(error_msg)
-        file_output.append(_create_error_record(user, f"ERROR: {error_msg}"))
+        logging.error(error_msg, extra=log_fields("timeout"))
+        return _create_error_record(researcher, f"ERROR: {error_msg}")
 
-    except requests.RequestException as e:
-        error_msg = f"Error de red para ORCID {orcid}: {e}"
+    if isinstance(error, requests.RequestException):
+        error_msg = f"Error de red para ORCID {orcid}: {error}"
         if console:
             console.print(f"  [red]🌐 Error de red: {nombre}[/]")
-        logging.error(error_msg)
-        file_output.append(_create_error_record(user, f"ERROR: {str(e)}"))
+        logging.error(error_msg, extra=log_fields("network_error", http_status=error.response.status_code if error.response is not None else None))
+        return _create_error_record(researcher, f"ERROR: {str(error)}")
+
+    error_msg = f"Error inesperado para ORCID {orcid}: {error}"
+    if console:
+        console.print(f"  [red]❌ Error: {nombre}[/]")
+    logging.error(error_msg, extra=log_fields("error", error_type=type(error).__name__))
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        traceback.print_exception(type(error), error, error.__traceback__)
+    return _create_error_record(researcher, f"ERROR: {str(error)}")
+
+
+def get_records(
+    user: Dict,
+    access_token: str,
+    file_output: List[Dict],
+    console: Optional[Console] = None,
+    client: Optional[OrcidClient] = None,
+    cache: Optional[WorksCache] = None,
+    offline: bool = False,
+    store: Optional[IncrementalStore] = None,
+    metrics: Optional[Metrics] = None,
+    details: bool = False,
+    detail_executor: Optional[Executor] = None,
+) -> None:
+    """
+    Obtiene registros de publicaciones para un usuario ORCID.
+
+    Args:
+        user: Diccionario con datos del usuario (orcid, nombre, cedula)
+        access_token: Token de acceso ORCID
+        file_output: Lista donde se agregan los registros obtenidos
+        console: Rich Console para output (opcional)
+        client: Cliente HTTP compartido entre workers (opcional)
+        cache: Caché en disco de respuestas /works (opcional)
+        offline: Construir los registros solo desde la caché
+        store: Estado del modo incremental; reutiliza los registros de perfiles sin cambios (opcional)
+        metrics: Métricas de la ejecución; mide las fases fetch y parse (opcional)
+        details: Completar los registros con tipo, contribuidores y cita desde /works/{put-codes}
+        detail_executor: Executor compartido para descargar los lotes de detalle en paralelo (opcional)
+    """
+    orcid = user.get("orcid")
+    nombre = user.get("nombre", "Desconocido")
+
+    if not orcid:
+        logging.error(f"ORCID vacío para usuario: {nombre}")
+        return
+
+    # Un único objeto con los datos del investigador, compartido por todos sus registros
+    researcher = Researcher.from_user(user)
+    metrics = metrics or DISABLED
+
+    started = time.perf_counter()
+
+    def log_fields(status: str, **fields) -> Dict:
+        """Campos estructurados del log de este investigador (latencia desde el inicio de la descarga)."""
+        return {"orcid": orcid, "phase": "fetch", "status": status, "latency_ms": round((time.perf_counter() - started) * 1000, 1), **fields}
+
+    try:
+        # Obtener trabajos del usuario (sesión keep-alive compartida)
+        with metrics.phase("fetch"):
+            data = fetch_works(orcid, access_token, client or get_client(), cache, offline)
+        fetch_fields = log_fields("ok")
+
+        # Procesar trabajos
+        works = data.get("group", [])
+        last_modified = safe_get(data, "last-modified-date", "value", default=None)
+        added = build_user_records(researcher, last_modified, len(works), lambda: parse_works(works), file_output, console, store, metrics, fetch_fields)
+        if added is None:
+            return
+
+        # En modo offline no hay red: los registros quedan solo con los datos del resumen
+        detailed = [(put_code, record) for put_code, record in added if put_code is not None] if details else []
+        if detailed and not offline:
+            _add_work_details(orcid, detailed, access_token, client or get_client(), detail_executor, metrics)
+
+        if store is not None:
+            store.update(orcid, last_modified, [record for _, record in added])
 
     except Exception as e:
-        error_msg = f"Error inesperado para ORCID {orcid}: {e}"
-        if console:
-            console.print(f"  [red]❌ Error: {nombre}[/]")
-        logging.error(error_msg)
-        if logging.getLogger().isEnabledFor(logging.DEBUG):
-            traceback.print_exc()
-        file_output.append(_create_error_record(user, f"ERROR: {str(e)}"))
+        file_output.append(fetch_error_record(researcher, e, console, log_fields))
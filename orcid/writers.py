@@ -0,0 +1,427 @@
+import json
+import math
+from abc import ABC, abstractmethod
+import os
+import sqlite3
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+from orcid.records import OUTPUT_COLUMNS
+from orcid.schema import CATEGORICAL_COLUMNS, DATE_COLUMNS, apply_schema, typed_columns
+from orcid.utils import clean_illegal_characters
+
+# Tipo SQLite de las columnas tipadas (el resto son TEXT; cedula sin tipo)
+SQLITE_TYPES = {"year": "INTEGER", "month": "INTEGER", "day": "INTEGER"}
+
+# Filas acumuladas por lote en los formatos columnares
+BATCH_SIZE = 10000
+
+
+def plain_value(value):
+    """
+    Convierte un valor a un tipo nativo de Python apto para cualquier formato.
+
+    Args:
+        value: Valor del registro
+
+    Returns:
+        None para NaN/None/NA, la fecha ISO de date_normalized, escalares de numpy convertidos,
+        o el valor original
+    """
+    if value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if hasattr(value, "item"):
+        # Escalares de numpy/pandas que llegan desde el DataFrame de entrada
+        return value.item()
+    return value
+
+
+def plain_rows(frame: pd.DataFrame, text_dates: bool = True) -> Iterator[tuple]:
+    """
+    Filas de un lote tipado con valores nativos de Python, convertidos columna por columna.
+
+    Args:
+        frame: Lote con el esquema de orcid.schema.apply_schema
+        text_dates: Fechas como texto ISO (True) o como ``datetime.date`` (False, para Excel)
+
+    Returns:
+        Iterador de tuplas en el orden de las columnas del lote (None para los nulos)
+    """
+    columns = []
+    for column in frame.columns:
+        series = frame[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            series = series.dt.strftime("%Y-%m-%d") if text_dates else series.dt.date
+        values = series.astype(object)
+        columns.append(values.where(series.notna(), None).tolist())
+    return zip(*columns)
+
+
+class ResultWriter(ABC):
+    """
+    Interfaz de los escritores de resultados en streaming.
+
+    Los registros llegan uno a uno, ya deduplicados, y cada escritor los
+    serializa en su formato sin reconstruir el conjunto completo de datos.
+
+    Args:
+        path: Ruta del archivo de salida
+        columns: Columnas a escribir (por defecto OUTPUT_COLUMNS)
+    """
+
+    extension = ""
+
+    def __init__(self, path: str, columns: Optional[Sequence[str]] = None):
+        self.path = path
+        self.columns = list(columns or OUTPUT_COLUMNS)
+        self.rows = 0
+
+    @abstractmethod
+    def write(self, record: Dict) -> None:
+        """
+        Agrega un registro.
+
+        Args:
+            record: Diccionario con los campos del registro
+        """
+
+    def write_batch(self, frame: pd.DataFrame) -> None:
+        """
+        Agrega un lote de registros ya tipados (ver TypedWriter); por defecto, fila por fila.
+
+        Args:
+            frame: Lote con el esquema de orcid.schema.apply_schema
+        """
+        columns = list(frame.columns)
+        for values in plain_rows(frame):
+            self.write(dict(zip(columns, values)))
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finaliza y guarda el archivo."""
+
+
+class StreamingXlsxWriter(ResultWriter):
+    """
+    Escritor XLSX de memoria constante.
+
+    Usa el modo ``write_only`` de openpyxl: cada fila se serializa al archivo
+    temporal del libro en cuanto se agrega, sin mantener el conjunto de datos
+    (ni un DataFrame) en memoria. Las filas deben llegar ya deduplicadas; en el
+    flujo principal ``process_users`` se encarga de ello con ``processed_pairs``.
+    """
+
+    extension = "xlsx"
+
+    def __init__(self, path: str, columns: Optional[Sequence[str]] = None):
+        super().__init__(path, columns)
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet("Sheet1")
+        self._sheet.append(self._header_cells())
+
+    def _header_cells(self) -> List[WriteOnlyCell]:
+        """Encabezado con el mismo estilo que aplica ``DataFrame.to_excel``."""
+        thin = Side(style="thin")
+        cells = []
+        for column in self.columns:
+            cell = WriteOnlyCell(self._sheet, value=column)
+            cell.font = Font(bold=True)
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = Alignment(horizontal="center", vertical="top")
+            cells.append(cell)
+        return cells
+
+    @staticmethod
+    def _cell_value(value):
+        """Normaliza un valor para la celda: limpia caracteres ilegales, convierte NaN en vacío y deja las fechas como fecha de Excel."""
+        if isinstance(value, str):
+            return clean_illegal_characters(value)
+        if isinstance(value, date):
+            return value
+        return plain_value(value)
+
+    def write(self, record: Dict) -> None:
+        self._sheet.append([self._cell_value(record.get(column, "")) for column in self.columns])
+        self.rows += 1
+
+    def write_batch(self, frame: pd.DataFrame) -> None:
+        for values in plain_rows(frame[self.columns], text_dates=False):
+            self._sheet.append([self._cell_value(value) for value in values])
+        self.rows += len(frame)
+
+    def close(self) -> None:
+        self._workbook.save(self.path)
+
+
+class JsonlWriter(ResultWriter):
+    """Escritor JSON delimitado por líneas (un registro por línea)."""
+
+    extension = "jsonl"
+
+    def __init__(self, path: str, columns: Optional[Sequence[str]] = None):
+        super().__init__(path, columns)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, record: Dict) -> None:
+        row = {column: plain_value(record.get(column, "")) for column in self.columns}
+        self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.rows += 1
+
+    def write_batch(self, frame: pd.DataFrame) -> None:
+        self._file.writelines(json.dumps(dict(zip(self.columns, values)), ensure_ascii=False) + "\n" for values in plain_rows(frame[self.columns]))
+        self.rows += len(frame)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SqliteWriter(ResultWriter):
+    """
+    Escritor a una base SQLite (tabla ``publicaciones``).
+
+    Inserta por lotes dentro de una única transacción y crea los índices al
+    final, que es bastante más rápido que mantenerlos durante la carga.
+    """
+
+    extension = "sqlite"
+    table = "publicaciones"
+
+    def __init__(self, path: str, columns: Optional[Sequence[str]] = None):
+        super().__init__(path, columns)
+        if os.path.exists(path):
+            os.remove(path)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode = OFF")
+        self._conn.execute("PRAGMA synchronous = OFF")
+        # cedula sin tipo declarado: conserva números como números y textos como textos
+        column_defs = ", ".join(column if column == "cedula" else f"{column} {SQLITE_TYPES.get(column, 'TEXT')}" for column in self.columns)
+        self._conn.execute(f"CREATE TABLE {self.table} ({column_defs})")
+        self._insert = f"INSERT INTO {self.table} ({', '.join(self.columns)}) VALUES ({', '.join('?' for _ in self.columns)})"
+        self._batch: List[tuple] = []
+
+    def write(self, record: Dict) -> None:
+        self._batch.append(tuple(plain_value(record.get(column, "")) for column in self.columns))
+        self.rows += 1
+        if len(self._batch) >= BATCH_SIZE:
+            self._flush()
+
+    def write_batch(self, frame: pd.DataFrame) -> None:
+        self._flush()
+        self._conn.executemany(self._insert, plain_rows(frame[self.columns]))
+        self.rows += len(frame)
+
+    def _flush(self) -> None:
+        self._conn.executemany(self._insert, self._batch)
+        self._batch = []
+
+    def close(self) -> None:
+        self._flush()
+        if "orcid_profesor" in self.columns:
+            self._conn.execute(f"CREATE INDEX idx_{self.table}_orcid ON {self.table} (orcid_profesor)")
+        if "doi" in self.columns:
+            self._conn.execute(f"CREATE INDEX idx_{self.table}_doi ON {self.table} (doi)")
+        if "year" in self.columns:
+            self._conn.execute(f"CREATE INDEX idx_{self.table}_year ON {self.table} (year)")
+        self._conn.commit()
+        self._conn.close()
+
+
+class _ArrowWriter(ResultWriter):
+    """
+    Base de los escritores basados en pyarrow (dependencia opcional).
+
+    Cada lote tipado (write_batch) se convierte columna a columna en un
+    RecordBatch: year/month/day como enteros, date_normalized como fecha y
+    las columnas categóricas con diccionario donde el formato lo admite. Los
+    registros sueltos (write) se acumulan hasta BATCH_SIZE y se tipan juntos,
+    de modo que la memoria se mantiene acotada al tamaño del lote.
+    """
+
+    dictionary_columns: Sequence[str] = ()
+
+    def __init__(self, path: str, columns: Optional[Sequence[str]] = None):
+        super().__init__(path, columns)
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError(f"El formato '{self.extension}' requiere pyarrow: pip install pyarrow") from e
+
+        self._pa = pa
+        types = {"year": pa.int16(), "month": pa.int8(), "day": pa.int8(), "date_normalized": pa.date32()}
+        self.schema = pa.schema([pa.field(column, pa.dictionary(pa.int32(), pa.string()) if column in self.dictionary_columns else types.get(column, pa.string())) for column in self.columns])
+        self._pending: List[Dict] = []
+        self._writer = self._open_writer()
+
+    @abstractmethod
+    def _open_writer(self):
+        """Abre el escritor de pyarrow del formato con self.schema."""
+
+    def _array(self, series: pd.Series, field):
+        """Columna de pandas a arreglo de Arrow con el tipo del esquema."""
+        pa = self._pa
+        if pa.types.is_dictionary(field.type):
+            series = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+            codes = series.cat.codes.to_numpy()
+            dictionary = pa.array([str(value) for value in series.cat.categories], type=pa.string())
+            return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0, type=pa.int32()), dictionary)
+        if pa.types.is_date32(field.type):
+            return pa.array(series, from_pandas=True).cast(field.type)
+        if pa.types.is_integer(field.type):
+            return pa.array(series, type=field.type, from_pandas=True)
+        return pa.array(series.astype("string"), type=field.type, from_pandas=True)
+
+    def write(self, record: Dict) -> None:
+        self._pending.append(record)
+        self.rows += 1
+        if len(self._pending) >= BATCH_SIZE:
+            self._flush()
+
+    def write_batch(self, frame: pd.DataFrame) -> None:
+        self._flush()
+        self._write_frame(frame)
+        self.rows += len(frame)
+
+    def _write_frame(self, frame: pd.DataFrame) -> None:
+        arrays = [self._array(frame[field.name], field) for field in self.schema]
+        self._writer.write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        base = [column for column in self.columns if column not in DATE_COLUMNS]
+        frame = apply_schema(pd.DataFrame.from_records([[record.get(column, "") for column in base] for record in self._pending], columns=base))
+        self._pending = []
+        self._write_frame(frame)
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+class ParquetWriter(_ArrowWriter):
+    """Escritor Parquet con codificación de diccionario en las columnas repetitivas."""
+
+    extension = "parquet"
+    dictionary_columns = CATEGORICAL_COLUMNS
+
+    def _open_writer(self):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(self.path, self.schema, compression="zstd", use_dictionary=True)
+
+
+class ArrowIpcWriter(_ArrowWriter):
+    """
+    Escritor Arrow IPC (formato de archivo / Feather v2).
+
+    El formato de archivo no admite reemplazar diccionarios entre lotes, por eso
+    aquí las columnas categóricas se guardan como texto plano.
+    """
+
+    extension = "arrow"
+
+    def _open_writer(self):
+        return self._pa.ipc.new_file(self.path, self.schema)
+
+
+class MultiWriter(ResultWriter):
+    """
+    Reparte cada registro entre varios escritores en una sola pasada.
+
+    Args:
+        writers: Escritores de cada formato
+    """
+
+    def __init__(self, writers: Sequence[ResultWriter]):
+        super().__init__(writers[0].path if writers else "", writers[0].columns if writers else None)
+        self.writers = list(writers)
+
+    def write(self, record: Dict) -> None:
+        for writer in self.writers:
+            writer.write(record)
+        self.rows += 1
+
+    def close(self) -> None:
+        for writer in self.writers:
+            writer.close()
+
+
+class TypedWriter(ResultWriter):
+    """
+    Aplica el esquema tipado de salida y reparte cada lote entre los escritores de cada formato.
+
+    Acumula BATCH_SIZE registros, les aplica ``orcid.schema.apply_schema`` una
+    sola vez (vectorizado) y pasa el lote ya tipado a cada formato, de modo que
+    todos tienen las mismas columnas derivadas y los mismos valores.
+
+    Args:
+        writers: Escritores de cada formato (con las columnas de typed_columns)
+        columns: Columnas de los registros recibidos (OUTPUT_COLUMNS o RECORD_COLUMNS)
+    """
+
+    def __init__(self, writers: Sequence[ResultWriter], columns: Optional[Sequence[str]] = None):
+        super().__init__(writers[0].path if writers else "", columns)
+        self.writers = list(writers)
+        self._batch: List[List] = []
+
+    def write(self, record: Dict) -> None:
+        self._batch.append([record.get(column, "") for column in self.columns])
+        self.rows += 1
+        if len(self._batch) >= BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._batch:
+            return
+        frame = apply_schema(pd.DataFrame.from_records(self._batch, columns=self.columns))
+        self._batch = []
+        for writer in self.writers:
+            writer.write_batch(frame)
+
+    def close(self) -> None:
+        self._flush()
+        for writer in self.writers:
+            writer.close()
+
+
+# Formatos de salida disponibles
+WRITERS = {
+    StreamingXlsxWriter.extension: StreamingXlsxWriter,
+    ParquetWriter.extension: ParquetWriter,
+    ArrowIpcWriter.extension: ArrowIpcWriter,
+    JsonlWriter.extension: JsonlWriter,
+    SqliteWriter.extension: SqliteWriter,
+}
+
+
+def create_writer(formats: Sequence[str], base_path: str, columns: Optional[Sequence[str]] = None) -> TypedWriter:
+    """
+    Crea un escritor que genera todos los formatos pedidos en la misma pasada, con el esquema tipado.
+
+    Args:
+        formats: Nombres de formato (claves de WRITERS)
+        base_path: Ruta de salida sin extensión
+        columns: Columnas de los registros (por defecto OUTPUT_COLUMNS); cada archivo lleva
+            además las columnas derivadas de la fecha (ver orcid.schema.typed_columns)
+
+    Returns:
+        TypedWriter con un escritor por formato
+
+    Raises:
+        ValueError: Si algún formato no existe
+    """
+    unknown = [fmt for fmt in formats if fmt not in WRITERS]
+    if unknown:
+        raise ValueError(f"Formato(s) de salida no soportado(s): {', '.join(unknown)}. Opciones: {', '.join(WRITERS)}")
+
+    columns = list(columns or OUTPUT_COLUMNS)
+    # dict.fromkeys conserva el orden y elimina formatos repetidos
+    formats = list(dict.fromkeys(formats))
+    return TypedWriter([WRITERS[fmt](f"{base_path}.{fmt}", typed_columns(columns)) for fmt in formats], columns)